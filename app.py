@@ -0,0 +1,18 @@
+from contextlib import asynccontextmanager
+
+import streamlit as st
+
+from utils import telemetry, warmup
+
+
+# Al arrancar el proceso, antes de la primera sesión: endpoint /metrics y precalentamiento de las cachés
+@asynccontextmanager
+async def lifespan(app):
+    telemetry.start_metrics_server()
+    warmup.start_warmup()
+    yield
+
+
+# Punto de entrada del servidor (`streamlit run app.py` o `uvicorn app:app`): sirve main.py con el
+# precalentamiento lanzado al iniciar el proceso y no con la primera visita
+app = st.App("main.py", lifespan=lifespan)
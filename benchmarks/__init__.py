@@ -0,0 +1 @@
+# Benchmark de los dashboards con datos sintéticos
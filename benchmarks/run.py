@@ -0,0 +1,235 @@
+"""Benchmark de los dashboards con datos sintéticos de distintos tamaños.
+
+Cada página se ejecuta sin navegador con `AppTest`, en un proceso nuevo por página y
+tamaño, y se mide la carga en frío, la latencia de cada interacción y el pico de RSS
+(solo en POSIX; en Windows se informa vacío).
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.run --sizes 10k 1M 10M --output benchmarks/results
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from benchmarks import synthetic
+
+# `resource` solo existe en POSIX; sin él no se mide el pico de RSS
+try:
+    import resource
+except ImportError:
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_ROOT = os.path.join(ROOT, "benchmarks", ".data")
+
+PAGES = {
+    "dashboard01": "dashboards_pages/dashboard01.py",
+    "dashboard02": "dashboards_pages/dashboard02.py",
+    "dashboard03": "dashboards_pages/dashboard03.py",
+}
+
+
+# --- Interacciones de cada página: (nombre, función que modifica el AppTest antes de volver a ejecutarlo) ---
+
+def _by_label(elements, label):
+    for element in elements:
+        if element.label == label:
+            return element
+    raise LookupError(f"No se encontró el widget '{label}'")
+
+
+def _open_section(key):
+    def interact(at):
+        at.session_state[key] = True
+    return interact
+
+
+def _narrow_years(at):
+    slider = _by_label(at.sidebar.select_slider, "Seleccione el rango de años de fundación")
+    years = [int(year) for year in slider.options]
+    slider.set_value((years[len(years) // 4], years[3 * len(years) // 4]))
+
+
+def _first_options(label, count):
+    def interact(at):
+        widget = _by_label(at.sidebar.multiselect, label)
+        widget.set_value(widget.options[:count])
+    return interact
+
+
+def _select_last(label):
+    def interact(at):
+        widget = _by_label(at.selectbox, label)
+        widget.select(widget.options[-1])
+    return interact
+
+
+def _toggle(label):
+    def interact(at):
+        widget = _by_label(at.toggle, label)
+        widget.set_value(not widget.value)
+    return interact
+
+
+def _check(label):
+    def interact(at):
+        _by_label(at.checkbox, label).check()
+    return interact
+
+
+INTERACTIONS = {
+    "dashboard01": [
+        ("filtro_continentes", _first_options("Seleccione Continentes", 2)),
+        ("filtro_años", _narrow_years),
+        ("abrir_top5", _open_section("top5_section")),
+        ("empresa_top5", _select_last("Seleccione una empresa para ver más detalles")),
+        ("abrir_mapa", _open_section("map_section")),
+        ("agrupar_mapa", _toggle("Agrupar empresas por zona")),
+    ],
+    "dashboard02": [
+        ("filtro_paises", _first_options("Seleccione País(es)", 2)),
+        ("abrir_distribuciones", _open_section("distribution_section")),
+        ("tipos_por_pais", _check("Mostrar solo tipos de puertos específicos")),
+        ("abrir_multivariado", _open_section("multivariate_section")),
+        ("puerto_seleccionado", _select_last("Seleccione un puerto para ver detalles adicionales:")),
+        ("criterio_resaltado", _select_last("Seleccione criterio para resaltar:")),
+    ],
+    "dashboard03": [
+        ("filtro_sucursal", _first_options("Selecciona la Sucursal:", 1)),
+        ("filtro_pago", _first_options("Selecciona Método de Pago:", 2)),
+        ("abrir_correlaciones", _open_section("correlation_section")),
+        ("cmap", _select_last("Seleccione el estilo de cmap para la tabla de correlación:")),
+    ],
+}
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa en KiB y macOS en bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _timed_run(at):
+    start = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - start
+    errors = [str(exception.value) for exception in at.exception]
+    return elapsed, errors
+
+
+def run_page(page, timeout):
+    """Ejecuta `page` en este proceso y devuelve sus tiempos (los datos salen de DASHBOARD_DATA_DIR)."""
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    from streamlit.testing.v1 import AppTest
+
+    steps = []
+    at = AppTest.from_file(os.path.join(ROOT, PAGES[page]), default_timeout=timeout)
+    elapsed, errors = _timed_run(at)
+    steps.append({"step": "carga_en_frio", "seconds": elapsed, "errors": errors})
+
+    # Nueva sesión con las cachés del proceso ya calientes
+    at = AppTest.from_file(os.path.join(ROOT, PAGES[page]), default_timeout=timeout)
+    elapsed, errors = _timed_run(at)
+    steps.append({"step": "carga_en_caliente", "seconds": elapsed, "errors": errors})
+
+    for name, interact in INTERACTIONS[page]:
+        try:
+            interact(at)
+        except (LookupError, IndexError) as error:
+            steps.append({"step": name, "seconds": None, "errors": [str(error)]})
+            continue
+        elapsed, errors = _timed_run(at)
+        steps.append({"step": name, "seconds": elapsed, "errors": errors})
+
+    return {"page": page, "steps": steps, "peak_rss_mb": _peak_rss_mb()}
+
+
+def _run_page_subprocess(page, data_dir, timeout):
+    env = dict(os.environ, DASHBOARD_DATA_DIR=data_dir, DASHBOARD_CACHE_DIR=os.path.join(data_dir, ".cache"))
+    # Sin copia Arrow previa: la carga en frío incluye leer el CSV y construir la caché en disco
+    shutil.rmtree(env["DASHBOARD_CACHE_DIR"], ignore_errors=True)
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.run", "--worker", page, "--timeout", str(timeout)],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        return {"page": page, "steps": [], "peak_rss_mb": None, "error": completed.stderr[-2000:]}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_report(report, output_dir):
+    """Guarda el informe como JSON (completo) y CSV (una fila por página, tamaño y paso)."""
+    os.makedirs(output_dir, exist_ok=True)
+    base = os.path.join(output_dir, f"bench-{report['commit'] or 'sin-commit'}-{report['started_at'].replace(':', '')}")
+    with open(base + ".json", "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2, ensure_ascii=False)
+    with open(base + ".csv", "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["commit", "size", "rows", "page", "step", "seconds", "peak_rss_mb", "errors"])
+        for result in report["results"]:
+            for step in result["steps"] or [{"step": "error", "seconds": None, "errors": [result.get("error")]}]:
+                writer.writerow([
+                    report["commit"], result["size"], result["rows"], result["page"], step["step"],
+                    step["seconds"], result["peak_rss_mb"], " | ".join(map(str, step["errors"]))
+                ])
+    return base + ".json", base + ".csv"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de los dashboards con datos sintéticos")
+    parser.add_argument("--sizes", nargs="+", default=["10k"], help="Tamaños: 10k, 1M, 10M o un número de filas")
+    parser.add_argument("--pages", nargs="+", default=list(PAGES), choices=list(PAGES))
+    parser.add_argument("--output", default=os.path.join(ROOT, "benchmarks", "results"))
+    parser.add_argument("--timeout", type=float, default=600, help="Tiempo máximo por ejecución de la página (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--worker", choices=list(PAGES), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_page(args.worker, args.timeout)))
+        return
+
+    report = {
+        "commit": _git_commit(),
+        "started_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": [],
+    }
+    for size in args.sizes:
+        rows = synthetic.parse_size(size)
+        data_dir = os.path.join(DATA_ROOT, size)
+        synthetic.generate_all(rows, data_dir, seed=args.seed)
+        for page in args.pages:
+            result = _run_page_subprocess(page, data_dir, args.timeout)
+            result.update(size=size, rows=rows)
+            report["results"].append(result)
+            cold = next((step["seconds"] for step in result["steps"] if step["step"] == "carga_en_frio"), None)
+            print(f"{size:>6} {page}: carga en frío {cold if cold is None else round(cold, 2)} s, "
+                  f"pico RSS {result['peak_rss_mb'] and round(result['peak_rss_mb'])} MB")
+
+    json_path, csv_path = write_report(report, args.output)
+    print(f"Informe: {json_path}\n         {csv_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Los CSV incluidos en el repositorio sirven de semilla: los datos sintéticos remuestrean sus filas
+SOURCE_DIR = "./dashboards_pages/data"
+FILE_NAMES = {
+    "unicorns": "UnicornCompanies_2.csv",
+    "ports": "Port_Data_pre.csv",
+    "sales": "supermarket_sales.csv",
+}
+
+# Tamaños de referencia del benchmark
+SIZES = {"10k": 10_000, "1M": 1_000_000, "10M": 10_000_000}
+
+# Las filas se generan y escriben por bloques para no tener el CSV completo en memoria
+CHUNK_ROWS = 500_000
+
+
+def parse_size(label):
+    """Número de filas de `label` ("10k", "1M", "10M" o un entero)."""
+    return SIZES[label] if label in SIZES else int(label)
+
+
+def _sample_rows(seed_data, n_rows, rng):
+    # Remuestrear filas completas mantiene coherentes las columnas relacionadas (país/continente, sucursal/ciudad...)
+    return seed_data.iloc[rng.integers(0, len(seed_data), n_rows)].reset_index(drop=True)
+
+
+def _jitter(values, rng, scale=0.1, decimals=2):
+    # Variación multiplicativa alrededor del valor original (los nulos se mantienen)
+    return (values * rng.lognormal(0, scale, len(values))).round(decimals)
+
+
+def _poisson_counts(values, rng):
+    # Conteos enteros con la misma media por fila que el original; los nulos quedan vacíos en el CSV
+    counts = pd.array(rng.poisson(values.fillna(0).clip(lower=0).to_numpy()), dtype="Int64")
+    counts[values.isna().to_numpy()] = pd.NA
+    return counts
+
+
+def unicorns_chunk(seed_data, start, n_rows, rng):
+    data = _sample_rows(seed_data, n_rows, rng)
+    data["Company"] = data["Company"] + " #" + pd.Series(np.arange(start, start + n_rows)).astype(str)
+    data["Valuation"] = _jitter(data["Valuation"], rng)
+    data["Funding"] = _jitter(data["Funding"], rng)
+    return data
+
+
+def ports_chunk(seed_data, start, n_rows, rng):
+    data = _sample_rows(seed_data, n_rows, rng)
+    data["Port Name"] = data["Port Name"] + " " + pd.Series(np.arange(start, start + n_rows)).astype(str)
+    for column in ["Vessels in Port", "Departures(Last 24 Hours)", "Arrivals(Last 24 Hours)", "Expected Arrivals"]:
+        data[column] = _poisson_counts(data[column], rng)
+    return data
+
+
+def sales_chunk(seed_data, start, n_rows, rng):
+    data = _sample_rows(seed_data, n_rows, rng)
+    ids = pd.Series(np.arange(start, start + n_rows)).map("{:09d}".format)
+    data["Invoice ID"] = ids.str[:3] + "-" + ids.str[3:5] + "-" + ids.str[5:]
+
+    # Importes recalculados con las mismas relaciones que el original (impuesto del 5 %, margen bruto fijo)
+    unit_price = rng.uniform(10, 100, n_rows).round(2)
+    quantity = rng.integers(1, 11, n_rows)
+    cogs = unit_price * quantity
+    tax = cogs * 0.05
+    data["Unit price"] = unit_price
+    data["Quantity"] = quantity
+    data["Tax 5%"] = tax.round(4)
+    data["Total"] = (cogs + tax).round(4)
+    data["cogs"] = cogs.round(2)
+    data["gross income"] = tax.round(4)
+    data["Rating"] = rng.uniform(4, 10, n_rows).round(1)
+
+    # Fechas del primer trimestre de 2019 en el formato m/d/aaaa del CSV original
+    dates = pd.Series(pd.Timestamp("2019-01-01") + pd.to_timedelta(rng.integers(0, 90, n_rows), unit="D"))
+    data["Date"] = dates.dt.month.astype(str) + "/" + dates.dt.day.astype(str) + "/" + dates.dt.year.astype(str)
+    hours = pd.Series(rng.integers(10, 21, n_rows)).map("{:02d}".format)
+    minutes = pd.Series(rng.integers(0, 60, n_rows)).map("{:02d}".format)
+    data["Time"] = hours + ":" + minutes
+    return data
+
+
+CHUNK_BUILDERS = {
+    "unicorns": unicorns_chunk,
+    "ports": ports_chunk,
+    "sales": sales_chunk,
+}
+
+
+def generate(name, n_rows, out_dir, seed=0, overwrite=False):
+    """Escribe en `out_dir` una versión de `n_rows` filas del CSV `name` con el mismo esquema que el original."""
+    path = os.path.join(out_dir, FILE_NAMES[name])
+    if os.path.exists(path) and not overwrite:
+        return path
+    os.makedirs(out_dir, exist_ok=True)
+    seed_data = pd.read_csv(os.path.join(SOURCE_DIR, FILE_NAMES[name]))
+    rng = np.random.default_rng(seed)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    for start in range(0, n_rows, CHUNK_ROWS):
+        chunk = CHUNK_BUILDERS[name](seed_data, start, min(CHUNK_ROWS, n_rows - start), rng)
+        chunk[seed_data.columns].to_csv(tmp_path, mode="w" if start == 0 else "a", header=start == 0, index=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+def generate_all(n_rows, out_dir, seed=0, overwrite=False):
+    """Genera los tres datasets con `n_rows` filas cada uno."""
+    return {name: generate(name, n_rows, out_dir, seed, overwrite) for name in FILE_NAMES}
@@ -0,0 +1 @@
+# Raíz del repositorio para pytest: así los tests importan `utils` y `benchmarks` como lo hacen las páginas
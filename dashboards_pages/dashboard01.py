@@ -1,61 +1,307 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import base64
-
-# Cargar el dataset
-@st.cache_data
-def load_data():
-    data = pd.read_csv("./dashboards_pages/data/UnicornCompanies_2.csv")
-    # Convertir 'Date Joined' a datetime y calcular 'Years to Unicorn'
-    data['Date Joined'] = pd.to_datetime(data['Date Joined'], errors='coerce')
-    data['Years to Unicorn'] = (data['Date Joined'].dt.year - data['Year Founded']).fillna(0).astype(int)
-    return data
-
-# Calcular el porcentaje de compañías por encima y por debajo de la media
-def calculate_percentage_above_below(df, column):
-    mean_value = df[column].mean()
-    above_mean = (df[column] > mean_value).sum()
-    below_mean = (df[column] < mean_value).sum()
-    total = len(df)
-    
-    above_percentage = (above_mean / total) * 100 if total > 0 else 0
-    below_percentage = (below_mean / total) * 100 if total > 0 else 0
-    
-    return mean_value, above_percentage, below_percentage
+
+from utils import datasets, export, filters, page_metrics, resources, styling, telemetry
+from utils.figure_cache import cached_figure
+from utils.lazy_module import LazyModule
+from utils.olap_cube import OlapCube
+from utils.paginated_table import paginated_table
+
+# plotly.express solo se importa cuando hay que construir un gráfico que no está en la caché
+px = LazyModule("plotly.express")
+
+# Número máximo de marcadores que se envían al mapa
+MAX_MAP_MARKERS = 2000
+
+# Modos del filtro geográfico (resueltos con el índice espacial)
+GEO_NONE = "Sin filtro"
+GEO_RADIUS = "Radio alrededor de un punto"
+GEO_BBOX = "Recuadro (latitud/longitud)"
+GEO_NEAREST = "Compañías más cercanas a un punto"
+
+# Tiempos por sección y filas por etapa de filtrado de esta página
+tracer = telemetry.PageTracer("dashboard01")
+
+# Datos de un gráfico: del snapshot precalculado si la selección tiene uno; si no, agregados desde el cubo
+def chart_data(chart_frames, chart_id, cube):
+    if chart_frames is not None:
+        return chart_frames[chart_id]
+    return page_metrics.UNICORN_CHARTS[chart_id](cube)
+
+# Gráfico de barras para la métrica con las sumas agrupadas por año
+def build_metric_chart(year_totals, title, column, color):
+    df_grouped = year_totals[["Year Founded", column]]
+    fig = px.bar(df_grouped, x='Year Founded', y=column, title=f"Suma de {title} por Año de Fundación", color_discrete_sequence=[color])
+    fig.update_layout(height=300, xaxis_title="Año de Fundación", yaxis_title=title)
+    return fig
 
 
 # Función para mostrar métricas, porcentaje de compañías y gráfico
-def display_metric_container(col, title, df, column, color):
+# `metric_kpis` trae el total (desde el cubo) y los porcentajes de empresas por encima y por debajo de la media
+def display_metric_container(col, title, metric_kpis, column, color):
     with col:
         with st.container():
-            # Calcular el valor total y los porcentajes de empresas por encima y por debajo de la media
-            total_value = df[column].sum()
-            _, above_percentage, below_percentage = calculate_percentage_above_below(df, column)
-            
             # Mostrar el valor total como métrica principal
-            st.metric(label=title, value=f"${total_value:,.2f}B")
+            st.metric(label=title, value=f"${metric_kpis['total']:,.2f}B")
             
             # Simular el `delta` usando HTML para un estilo más prominente
             st.markdown(
                 f"<p style='font-size: 16px; font-weight: bold; text-align: left;'>"
-                f"<span style='color: red;'>↓ {below_percentage:.2f}%</span> | "
-                f"<span style='color: green;'>↑ {above_percentage:.2f}%</span>"
+                f"<span style='color: red;'>↓ {metric_kpis['below_pct']:.2f}%</span> | "
+                f"<span style='color: green;'>↑ {metric_kpis['above_pct']:.2f}%</span>"
                 f"</p>", 
                 unsafe_allow_html=True
             )
 
-            # Agrupar los datos por 'Year Founded' y calcular la suma de la columna seleccionada
-            df_grouped = df.groupby("Year Founded")[column].sum().reset_index()
+            # Gráfico de sumas por año, reutilizado de la caché de figuras si los filtros no cambiaron
+            fig = cached_chart(
+                f"metric_{column}",
+                lambda: build_metric_chart(chart_data(chart_frames, "by_year", filtered_cube), title, column, color),
+                filters=filter_state
+            )
+            tracer.plotly_chart(f"metric_{column}", fig, use_container_width=True)
+
+# Gráfico de barras de industria sin "Otros"
+def build_industry_chart(industry_counts):
+    industry_counts = industry_counts.sort_values("Count", ascending=False, kind="stable")
+
+    fig_industry = px.bar(
+        industry_counts, 
+        x="Industry", 
+        y="Count", 
+        title="Distribución de Compañías por Industria",
+        color_discrete_sequence=["#636EFA"]
+    )
+    fig_industry.update_layout(xaxis_title="Industria", yaxis_title="Cantidad", height=250)
+    return fig_industry
+
+# Gráfico circular con "Otros" en los países
+def build_country_chart(top_country_counts):
+    fig_country = px.pie(
+        top_country_counts, 
+        values="Count", 
+        names="Country", 
+        title="Distribución de Compañías por País (Top 5 + Otros)",
+        color_discrete_sequence=px.colors.sequential.RdBu
+    )
+    fig_country.update_traces(textinfo="percent+label")
+    fig_country.update_layout(height=250)
+    return fig_country
 
-            # Crear gráfico de barras para la métrica con las sumas agrupadas por año
-            fig = px.bar(df_grouped, x='Year Founded', y=column, title=f"Suma de {title} por Año de Fundación", color_discrete_sequence=[color])
+# Gráfico de barras apiladas para mostrar la distribución de empresas por industria y país, con "Otros" en los países
+def build_industry_country_chart(cube):
+    industry_country_counts = cube.rollup(["Industry", "Country"])[["Industry", "Country", "Count"]]
+
+    # Filtrar solo los 5 principales países y agrupar el resto como "Otros"
+    top_countries_list = page_metrics.top_country_counts(cube)["Country"].tolist()
+    industry_country_filtered = industry_country_counts.copy()
+    industry_country_filtered["Country"] = industry_country_filtered["Country"].apply(lambda x: x if x in top_countries_list else "Otros")
+
+    # Volver a agrupar los datos después de agregar "Otros"
+    industry_country_aggregated = industry_country_filtered.groupby(["Industry", "Country"], observed=True).sum().reset_index()
+
+    fig_industry_country = px.bar(
+        industry_country_aggregated,
+        x="Industry",
+        y="Count",
+        color="Country",
+        title="Distribución de Empresas por Industria y País (Top 5 Países + Otros)",
+        barmode="stack",
+        color_discrete_sequence=px.colors.qualitative.Set3
+    )
+    fig_industry_country.update_layout(xaxis_title="Industria", yaxis_title="Cantidad de Empresas", height=400)
+    return fig_industry_country
+
+# Gráfico del Top 5 de empresas que más rápido se convirtieron en unicornio
+def build_top5_chart(top_5_unicorns):
+    # Verificar si todos los valores de 'Years to Unicorn' son menores a 1 año
+    if (top_5_unicorns['Years to Unicorn'] == "Menos de 1 año").all():
+        # Mostrar un gráfico de puntos para diferenciar las empresas por financiamiento en billones
+        fig_top5 = px.scatter(
+            top_5_unicorns,
+            y="Company",
+            x="Funding",
+            size="Funding",
+            labels={"Funding": "Financiamiento (billones de USD)"},
+            color="Company",
+        )
+        fig_top5.update_layout(
+            height=350,
+            xaxis_title="Financiamiento (billones de USD)",
+            yaxis_title="",
+            showlegend=False
+        )
+    else:
+        # Configuración del gráfico de barras en caso de que haya empresas con más de 1 año
+        fig_top5 = px.bar(
+            top_5_unicorns,
+            y="Company",
+            x="Years to Unicorn",
+            color="Funding",
+            color_continuous_scale=px.colors.sequential.Blues,
+            labels={"Years to Unicorn": "Años para Unicornio", "Funding": "Financiamiento (billones de USD)"},
+            orientation="h"
+        )
+        fig_top5.update_layout(
+            height=350,
+            xaxis_title="Años para convertirse en Unicornio",
+            yaxis_title="",
+            margin=dict(l=0, r=0, t=30, b=0)
+        )
+    return fig_top5
+
+# Mapa con un marcador por cluster: tamaño por Valuation total y color por país dominante
+def build_cluster_map(clusters, map_zoom):
+    fig = px.scatter_mapbox(
+        clusters,
+        lat="latitude",
+        lon="longitude",
+        size="Valuation",
+        color="Country",
+        hover_name="Country",
+        hover_data={"Count": True, "Valuation": ":,.2f"},
+        labels={"Count": "Compañías", "Valuation": "Valuation total"},
+        size_max=30,
+        zoom=map_zoom,
+        height=500
+    )
+    fig.update_layout(mapbox_style="carto-positron")
+    fig.update_layout(margin={"r":0,"t":0,"l":0,"b":0})
+    return fig
+
+# Mapa con un marcador por compañía
+def build_company_map(map_data):
+    # Crear un gráfico de dispersión en el mapa usando Plotly Express
+    fig = px.scatter_mapbox(
+        map_data,
+        lat="latitude",
+        lon="longitude",
+        size="Valuation",  # Tamaño de los puntos basado en Valuation
+        color="Country",  # Color de los puntos basado en Country
+        hover_name="Company",  # Nombre de la empresa al pasar el cursor
+        hover_data={"Valuation": True, "Country": True},  # Datos adicionales en el hover
+        color_continuous_scale=px.colors.cyclical.IceFire,
+        size_max=20,  # Tamaño máximo de los puntos
+        zoom=1,
+        height=500
+    )
+
+    # Configurar el estilo del mapa
+    fig.update_layout(mapbox_style="carto-positron")
+    fig.update_layout(margin={"r":0,"t":0,"l":0,"b":0})  # Sin márgenes alrededor del mapa
+    return fig
+
+# Inversionistas con mayor valoración sumada de sus compañías (filtradas)
+def build_top_investors_chart(top_investors):
+    fig = px.bar(
+        top_investors.sort_values("Portfolio Valuation"),
+        x="Portfolio Valuation", y="Investor", orientation="h",
+        hover_data={"Companies": True},
+        labels={"Portfolio Valuation": "Valoración del portafolio (billones de USD)", "Companies": "Compañías"},
+        color_discrete_sequence=["#2E86C1"]
+    )
+    fig.update_layout(height=400, yaxis_title="", margin=dict(l=0, r=0, t=30, b=0))
+    return fig
+
+# Sección de inversionistas como fragmento: cambiar el número de resultados solo vuelve a ejecutar esta sección
+@st.fragment
+def render_investor_section(filter_mask):
+    top_n = st.select_slider("Número de resultados", options=[5, 10, 15, 20], value=10)
+
+    # Valor de los portafolios y coinversiones como productos de la matriz inversionista × compañía
+    with tracer.span("aggregate:investors"):
+        top_investors = investor_index.top_by_valuation(data['Valuation'], filter_mask, top_n)
+        co_investments = investor_index.co_investment_pairs(filter_mask, top_n)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**Top inversionistas por valoración del portafolio**")
+        if top_investors.empty:
+            st.info("No hay inversionistas para los filtros aplicados.")
+        else:
+            # La clave es el ranking mismo: otros filtros con el mismo resultado reutilizan la figura
+            fig = cached_chart("top_investors", lambda: build_top_investors_chart(top_investors), data=top_investors)
+            tracer.plotly_chart("top_investors", fig, use_container_width=True)
+    with col2:
+        st.markdown("**Pares de inversionistas con más compañías en común**")
+        st.dataframe(
+            co_investments, hide_index=True,
+            column_config={
+                "Investor A": "Inversionista A",
+                "Investor B": "Inversionista B",
+                "Shared Companies": st.column_config.NumberColumn("Compañías en común"),
+            }
+        )
+
+# Sección del Top 5 como fragmento: cambiar la empresa seleccionada solo vuelve a ejecutar esta sección
+@st.fragment
+def render_top5_section(top_5_unicorns):
+    fig_top5 = cached_chart("top5", lambda: build_top5_chart(top_5_unicorns), data=top_5_unicorns)
+
+    # Título estilizado del header con Markdown y HTML
+    st.markdown(
+        "<div style='padding:10px; border-left: 4px solid #636EFA; background-color: #333333; color: #ffffff;'>"
+        "Top 5 Empresas que más rápido se convirtieron en Unicornio"
+        "</div>", unsafe_allow_html=True
+    )
+
+    # Mostrar el gráfico y la información de las empresas en dos columnas
+    col1, col2 = st.columns(2)
 
-            fig.update_layout(height=300, xaxis_title="Año de Fundación", yaxis_title=title)
-            st.plotly_chart(fig, use_container_width=True)
+    # Gráfico en la primera columna
+    with col2:
+        tracer.plotly_chart("top5", fig_top5, use_container_width=True)
 
-# Función para aplicar el estilo seleccionado
-def highlight_top_countries(row, top_countries, style_choice):
+    # Información detallada de cada empresa en la segunda columna
+    with col1:
+        st.subheader("Detalles de la Empresa")
+
+        company_selected = st.selectbox(
+            "Seleccione una empresa para ver más detalles",
+            options=top_5_unicorns["Company"].tolist()
+        )
+
+        selected_info = top_5_unicorns[top_5_unicorns["Company"] == company_selected].iloc[0]
+
+        st.markdown(f"### {selected_info['Company']}")
+        st.markdown(f"- **Años para convertirse en Unicornio**: {selected_info['Years to Unicorn']}")
+        st.markdown(f"- **Financiamiento**: ${selected_info['Funding']:,.2f}B")
+        st.markdown(f"- **Industria**: {selected_info['Industry']}")
+        st.markdown(f"- **País**: {selected_info['Country']}")
+
+# Sección del mapa como fragmento: el agrupamiento y el zoom solo vuelven a ejecutar esta sección
+@st.fragment
+def render_map_section(map_data, filter_mask):
+    # Con muchas compañías se agrupan por zona para no enviar un marcador por empresa
+    group_points = st.toggle(
+        "Agrupar empresas por zona",
+        value=len(map_data) > MAX_MAP_MARKERS,
+        help=f"Agrupa las compañías en celdas según el nivel de zoom (máximo {MAX_MAP_MARKERS:,} marcadores)."
+    )
+
+    if group_points:
+        with tracer.span("load_data"):
+            geo_clusters = resources.load_unicorn_geo_clusters()
+        # Solo se ofrecen los niveles de zoom cuyo número de clusters cabe en el límite de marcadores
+        zoom_options = [zoom for zoom, n_cells in geo_clusters.n_cells.items() if n_cells <= MAX_MAP_MARKERS]
+        map_zoom = st.select_slider(
+            "Nivel de zoom del mapa",
+            options=zoom_options or [geo_clusters.zoom_for_budget(MAX_MAP_MARKERS)],
+            value=geo_clusters.zoom_for_budget(MAX_MAP_MARKERS)
+        )
+        fig = cached_chart(
+            "map", lambda: build_cluster_map(geo_clusters.clusters_for(map_zoom, filter_mask), map_zoom),
+            filters=filter_state, group_points=True, map_zoom=map_zoom
+        )
+    else:
+        fig = cached_chart("map", lambda: build_company_map(map_data), filters=filter_state, group_points=False)
+
+    # Mostrar el gráfico en Streamlit
+    tracer.plotly_chart("map", fig, use_container_width=True)
+
+
+# Función para aplicar el estilo seleccionado (a toda la tabla de una vez, sin recorrer fila por fila)
+def highlight_top_countries(df, top_countries, style_choice):
     # Definir esquemas de color para tres estilos diferentes
     styles = {
         "Estilo 1": [
@@ -76,15 +322,16 @@ def highlight_top_countries(row, top_countries, style_choice):
     }
 
     selected_styles = styles.get(style_choice, styles["Estilo 1"])  # Escoger el estilo según selección
-    country = row["Country"]
-    # Si el país está en los tres principales, aplicar el estilo correspondiente
-    if country in top_countries:
-        style_index = top_countries.index(country)
-        return [selected_styles[style_index]] * len(row)
-    return [""] * len(row)
+    # Las filas cuyo país está en los tres principales reciben el estilo de su posición
+    return styling.rank_styles(df, "Country", top_countries, selected_styles)
 
 # Cargar datos y configuración inicial
-data = load_data()
+with tracer.span("load_data"):
+    data = resources.load_unicorns()
+    filter_index = resources.load_unicorn_filter_index()
+    cube = resources.load_unicorn_cube()
+    investor_index = resources.load_unicorn_investor_index()
+    spatial_index = resources.load_unicorn_spatial_index()
 
 
 
@@ -111,7 +358,7 @@ start_year, end_year = st.sidebar.select_slider(
 )
 
 # Filtramos los datos por continente usando st.multiselect para permitir múltiples selecciones
-continents = sorted(data['Continent'].unique())  # Listar continentes únicos
+continents = filters.category_options(data['Continent'])  # Listar continentes únicos
 selected_continents = st.sidebar.multiselect(
     "Seleccione Continentes",
     options=continents,
@@ -120,7 +367,7 @@ selected_continents = st.sidebar.multiselect(
 )
 
 # Filtrar por Industry con un expander para ahorrar espacio
-industries = sorted(data['Industry'].unique())
+industries = filters.category_options(data['Industry'])
 
 with st.sidebar.expander("Seleccione Industrias"):
     selected_industries = st.multiselect(
@@ -130,13 +377,89 @@ with st.sidebar.expander("Seleccione Industrias"):
         placeholder="Buscar industria..."
     )
 
-# Aplicar el filtro de año, continente y industria seleccionados
-filtered_data = data[
-    (data['Year Founded'] >= start_year) & 
-    (data['Year Founded'] <= end_year) & 
-    (data['Continent'].isin(selected_continents)) &
-    (data['Industry'].isin(selected_industries))
-]
+# Filtrar por inversionista: compañías con al menos uno de los inversionistas seleccionados
+selected_investors = st.sidebar.multiselect(
+    "Seleccione Inversionistas",
+    options=investor_index.options(),
+    default=[],
+    placeholder="Todos los inversionistas"
+)
+
+# Filtro geográfico: radio, recuadro o vecinos más cercanos a un punto
+st.sidebar.header("Filtro Geográfico")
+geo_mode = st.sidebar.radio("Tipo de filtro geográfico", [GEO_NONE, GEO_RADIUS, GEO_BBOX, GEO_NEAREST])
+geo_params = {}
+if geo_mode in (GEO_RADIUS, GEO_NEAREST):
+    geo_params["latitude"] = st.sidebar.number_input("Latitud del punto", -90.0, 90.0, 40.0, format="%.4f")
+    geo_params["longitude"] = st.sidebar.number_input("Longitud del punto", -180.0, 180.0, -100.0, format="%.4f")
+    if geo_mode == GEO_RADIUS:
+        geo_params["radius_km"] = st.sidebar.number_input("Radio (km)", min_value=1, max_value=20000, value=1000, step=100)
+    else:
+        geo_params["k"] = st.sidebar.number_input("Número de compañías", min_value=1, max_value=1000, value=20, step=5)
+elif geo_mode == GEO_BBOX:
+    lat_col1, lat_col2 = st.sidebar.columns(2)
+    geo_params["lat_min"] = lat_col1.number_input("Latitud mín.", -90.0, 90.0, 25.0)
+    geo_params["lat_max"] = lat_col2.number_input("Latitud máx.", -90.0, 90.0, 50.0)
+    lon_col1, lon_col2 = st.sidebar.columns(2)
+    geo_params["lon_min"] = lon_col1.number_input("Longitud mín.", -180.0, 180.0, -125.0)
+    geo_params["lon_max"] = lon_col2.number_input("Longitud máx.", -180.0, 180.0, -65.0)
+
+# Aplicar el filtro de año, continente y industria seleccionados a partir del índice de bitmaps
+selection = page_metrics.unicorn_selection(filter_index, start_year, end_year, selected_continents, selected_industries)
+with tracer.span("filter"):
+    filter_mask = filter_index.select(selection)
+    rows_bitmap = int(filter_mask.sum())
+    if selected_investors:
+        filter_mask = filter_mask & investor_index.companies_mask(selected_investors)
+    rows_investors = int(filter_mask.sum())
+    # Los vecinos más cercanos se buscan entre las compañías que ya cumplen los demás filtros
+    if geo_mode == GEO_RADIUS:
+        filter_mask = filter_mask & spatial_index.within_radius(**geo_params)
+    elif geo_mode == GEO_BBOX:
+        filter_mask = filter_mask & spatial_index.within_bbox(**geo_params)
+    elif geo_mode == GEO_NEAREST:
+        filter_mask = spatial_index.nearest_mask(mask=filter_mask, **geo_params)
+    filtered_data = data[filter_mask]
+tracer.rows("bitmap_index", len(data), rows_bitmap)
+if selected_investors:
+    tracer.rows("investor_index", rows_bitmap, rows_investors)
+if geo_mode != GEO_NONE:
+    tracer.rows("spatial_index", rows_investors, len(filtered_data))
+# Los gráficos dependen solo de la versión de los datos y de estos filtros (no del estilo de la tabla)
+data_version = datasets.dataset_version("unicorns")
+filter_state = {
+    "years": [int(start_year), int(end_year)],
+    "continents": sorted(selected_continents),
+    "industries": sorted(selected_industries),
+    "investors": sorted(selected_investors),
+    "geo": [geo_mode, geo_params],
+}
+
+# La misma selección aplicada al cubo sirve para las métricas y gráficos agregados; el cubo no tiene
+# dimensiones de inversionistas ni de coordenadas, así que con esos filtros se agregan directamente
+# las compañías filtradas (el cubo resultante se guarda en la caché de resultados)
+with tracer.span("aggregate:cube_slice"):
+    if selected_investors or geo_mode != GEO_NONE:
+        filtered_cube = resources.cached_result(
+            lambda: OlapCube.build(filtered_data, cube.dimensions, cube.measures[1:]),
+            "dashboard01", "filtered_cube", data_version, filter_state
+        )
+    else:
+        filtered_cube = cube.slice(selection)
+
+# KPIs y datos de gráficos precalculados por `python -m utils.snapshots` si la selección está en su grilla
+# (sin inversionistas ni filtro geográfico)
+snapshot = None
+if not selected_investors and geo_mode == GEO_NONE:
+    snapshot = resources.page_snapshot(
+        "dashboard01", data_version, {key: filter_state[key] for key in ("years", "continents", "industries")}
+    )
+chart_frames = snapshot["charts"] if snapshot is not None else None
+
+# Cada gráfico se guarda en la caché de figuras bajo los valores de los que depende (`inputs`)
+def cached_chart(chart_id, build_fn, **inputs):
+    with tracer.span(f"figure:{chart_id}"):
+        return cached_figure("dashboard01", chart_id, data_version, build_fn, **inputs)
 
 # Selector de estilo en la barra lateral
 st.sidebar.header("Opciones de Estilo en la tabla")
@@ -152,32 +475,41 @@ st.subheader("Estadísticas Generales")
 # Crear columnas para cada métrica
 col_funding, col_valuation = st.columns(2)
 
+kpis = snapshot["kpis"] if snapshot is not None else page_metrics.unicorn_kpis(filtered_data, filtered_cube)
+
 # Mostrar métricas y gráficos para Funding
-display_metric_container(col_funding, "Funding", filtered_data, "Funding", color="#29b5e8")
+display_metric_container(col_funding, "Funding", kpis["Funding"], "Funding", color="#29b5e8")
 
 # Mostrar métricas y gráficos para Valuation
-display_metric_container(col_valuation, "Valuation", filtered_data, "Valuation", color="#FF9F36")
+display_metric_container(col_valuation, "Valuation", kpis["Valuation"], "Valuation", color="#FF9F36")
 
 # filtramos la data filtrada por coluimnas
 filtered_data = filtered_data[["Company","Years to Unicorn","Funding", "Valuation", "Year Founded", "Country","Industry",'Latitude', 'Longitude']]
-sorted_data = filtered_data.sort_values("Year Founded", ascending=False)
-
 # Identificar los tres países con mayor suma de "Valuation"
-valuation_by_country = sorted_data.groupby("Country")["Valuation"].sum().nlargest(3)
+with tracer.span("aggregate:country_rollup"):
+    country_rollup = filtered_cube.rollup(["Country"]).set_index("Country")
+valuation_by_country = country_rollup["Valuation"].nlargest(3)
 top_countries = valuation_by_country.index.tolist()
 
-# Aplicar estilo personalizado al DataFrame filtrado
-styled_data = filtered_data.style.apply(highlight_top_countries, axis=1, top_countries=top_countries, style_choice=style_choice)
+# Aplicar estilo personalizado solo a la ventana visible de la tabla
+def style_table_window(window):
+    return window.style.apply(highlight_top_countries, axis=None, top_countries=top_countries, style_choice=style_choice)
 
 # Mostrar DataFrame filtrado y gráfico de la distribución de "Industry"
 
 # Crear dos columnas dentro del expander
 col1, col2 = st.columns([0.62, 0.38])
 
-# Mostrar el DataFrame estilizado en la primera columna con configuración personalizada de columnas
-with col1:
-    st.dataframe(
-        styled_data,
+# Mostrar el DataFrame estilizado y paginado (ordenado por año de fundación) en la primera columna
+with col1, tracer.span("table"):
+    paginated_table(
+        data,
+        filtered_data,
+        key="unicorn_table",
+        dataset_key=f"unicorns-{data_version}",
+        style_fn=style_table_window,
+        default_sort="Year Founded",
+        default_ascending=False,
         column_config={
             "Company": "Nombre de la Compañía",
             "Funding": st.column_config.NumberColumn(
@@ -198,147 +530,60 @@ with col1:
         height=500  # Ajuste de altura de la tabla
     )
 
+# Exportar las compañías filtradas en bloques (el archivo se genera solo al hacer clic)
+with col1:
+    export.export_controls(
+        "unicorn_export", "unicornios_filtrados", filtered_data.columns, lambda: export.frame_chunks(filtered_data)
+    )
+
 # Gráfico de barras de industria en la parte superior derecha
 if "Industry" in filtered_data.columns:
     with col2:
-        # Gráfico de barras de industria sin "Otros"
-        industry_counts = filtered_data["Industry"].value_counts().reset_index()
-        industry_counts.columns = ["Industry", "Count"]
-        
-        fig_industry = px.bar(
-            industry_counts, 
-            x="Industry", 
-            y="Count", 
-            title="Distribución de Compañías por Industria",
-            color_discrete_sequence=["#636EFA"]
+        fig_industry = cached_chart(
+            "industry", lambda: build_industry_chart(chart_data(chart_frames, "industry", filtered_cube)),
+            filters=filter_state
         )
-        fig_industry.update_layout(xaxis_title="Industria", yaxis_title="Cantidad", height=250)
-        st.plotly_chart(fig_industry, use_container_width=True)
-        
-        # Gráfico circular con "Otros" en los países
-        top_countries_data = filtered_data["Country"].value_counts()
-        top_countries = top_countries_data.nlargest(5)
-        other_countries_count = top_countries_data.iloc[5:].sum()
-        
-        # Crear un DataFrame con los principales países y "Otros"
-        top_countries_df = pd.concat([top_countries, pd.Series(other_countries_count, index=["Otros"])]).reset_index()
-        top_countries_df.columns = ["Country", "Count"]
-        
-        fig_country = px.pie(
-            top_countries_df, 
-            values="Count", 
-            names="Country", 
-            title="Distribución de Compañías por País (Top 5 + Otros)",
-            color_discrete_sequence=px.colors.sequential.RdBu
+        tracer.plotly_chart("industry", fig_industry, use_container_width=True)
+
+        fig_country = cached_chart(
+            "country_pie", lambda: build_country_chart(chart_data(chart_frames, "top_countries", filtered_cube)),
+            filters=filter_state
         )
-        fig_country.update_traces(textinfo="percent+label")
-        fig_country.update_layout(height=250)
-        
-        st.plotly_chart(fig_country, use_container_width=True)
+        tracer.plotly_chart("country_pie", fig_country, use_container_width=True)
 
-# Gráfico de barras apiladas para mostrar la distribución de empresas por industria y país, con "Otros" en los países
-industry_country_counts = filtered_data.groupby(["Industry", "Country"]).size().reset_index(name="Count")
-
-# Filtrar solo los 5 principales países y agrupar el resto como "Otros"
-top_countries_list = top_countries_df["Country"].tolist()
-industry_country_filtered = industry_country_counts.copy()
-industry_country_filtered["Country"] = industry_country_filtered["Country"].apply(lambda x: x if x in top_countries_list else "Otros")
-
-# Volver a agrupar los datos después de agregar "Otros"
-industry_country_aggregated = industry_country_filtered.groupby(["Industry", "Country"]).sum().reset_index()
-
-fig_industry_country = px.bar(
-    industry_country_aggregated,
-    x="Industry",
-    y="Count",
-    color="Country",
-    title="Distribución de Empresas por Industria y País (Top 5 Países + Otros)",
-    barmode="stack",
-    color_discrete_sequence=px.colors.qualitative.Set3
+# Gráfico de barras apiladas por industria y país (Top 5 países + "Otros")
+fig_industry_country = cached_chart(
+    "industry_country", lambda: build_industry_country_chart(filtered_cube), filters=filter_state
 )
-fig_industry_country.update_layout(xaxis_title="Industria", yaxis_title="Cantidad de Empresas", height=400)
 
-st.plotly_chart(fig_industry_country, use_container_width=True)
+tracer.plotly_chart("industry_country", fig_industry_country, use_container_width=True)
+
+# --- Inversionistas ---
+# El contenido solo se calcula mientras el expander está abierto
+investor_section = st.expander("Ver Inversionistas y Coinversiones", key="investor_section", on_change="rerun")
+with investor_section:
+    if investor_section.open:
+        render_investor_section(filter_mask)
 
 
 
 
 
 # Filtrar el Top 5 de empresas que más rápido se convirtieron en unicornio
-top_5_unicorns = filtered_data.nsmallest(5, 'Years to Unicorn')[['Company', 'Years to Unicorn', 'Funding','Industry', 'Country']]
+with tracer.span("aggregate:top5"):
+    top_5_unicorns = filtered_data.nsmallest(5, 'Years to Unicorn')[['Company', 'Years to Unicorn', 'Funding','Industry', 'Country']]
 
 # Convertir 'Years to Unicorn' menor a 1 año a "Menos de 1 año" para claridad en el gráfico
 top_5_unicorns['Years to Unicorn'] = top_5_unicorns['Years to Unicorn'].apply(lambda x: "Menos de 1 año" if x < 1 else x)
 
 # Verificar si hay datos en top_5_unicorns
 if not top_5_unicorns.empty:
-    with st.expander("Ver detalles de las Empresas que más rápido se convirtieron en Unicornio"):
-        # Verificar si todos los valores de 'Years to Unicorn' son menores a 1 año
-        if (top_5_unicorns['Years to Unicorn'] == "Menos de 1 año").all():
-            # Mostrar un gráfico de puntos para diferenciar las empresas por financiamiento en billones
-            fig_top5 = px.scatter(
-                top_5_unicorns,
-                y="Company",
-                x="Funding",
-                size="Funding",
-                labels={"Funding": "Financiamiento (billones de USD)"},
-                color="Company",
-            )
-            fig_top5.update_layout(
-                height=350,
-                xaxis_title="Financiamiento (billones de USD)",
-                yaxis_title="",
-                showlegend=False
-            )
-        else:
-            # Configuración del gráfico de barras en caso de que haya empresas con más de 1 año
-            fig_top5 = px.bar(
-                top_5_unicorns,
-                y="Company",
-                x="Years to Unicorn",
-                color="Funding",
-                color_continuous_scale=px.colors.sequential.Blues,
-                labels={"Years to Unicorn": "Años para Unicornio", "Funding": "Financiamiento (billones de USD)"},
-                orientation="h"
-            )
-            fig_top5.update_layout(
-                height=350,
-                xaxis_title="Años para convertirse en Unicornio",
-                yaxis_title="",
-                margin=dict(l=0, r=0, t=30, b=0)
-            )
-
-        # Título estilizado del header con Markdown y HTML
-        st.markdown(
-            "<div style='padding:10px; border-left: 4px solid #636EFA; background-color: #333333; color: #ffffff;'>"
-            "Top 5 Empresas que más rápido se convirtieron en Unicornio"
-            "</div>", unsafe_allow_html=True
-        )
-
-        # Mostrar el gráfico y la información de las empresas en dos columnas
-        col1, col2 = st.columns(2)
-
-        # Gráfico en la primera columna
-        with col2:
-            st.plotly_chart(fig_top5, use_container_width=True)
+    # El contenido solo se calcula mientras el expander está abierto
+    top5_section = st.expander("Ver detalles de las Empresas que más rápido se convirtieron en Unicornio", key="top5_section", on_change="rerun")
+    with top5_section:
+        if top5_section.open:
+            render_top5_section(top_5_unicorns)
 
-        # Información detallada de cada empresa en la segunda columna
-        with col1:
-            st.subheader("Detalles de la Empresa")
-
-            company_selected = st.selectbox(
-                "Seleccione una empresa para ver más detalles",
-                options=top_5_unicorns["Company"].tolist()
-            )
-
-            selected_info = top_5_unicorns[top_5_unicorns["Company"] == company_selected].iloc[0]
-
-            st.markdown(f"### {selected_info['Company']}")
-            st.markdown(f"- **Años para convertirse en Unicornio**: {selected_info['Years to Unicorn']}")
-            st.markdown(f"- **Financiamiento**: ${selected_info['Funding']:,.2f}B")
-            st.markdown(f"- **Industria**: {selected_info['Industry']}")
-            st.markdown(f"- **País**: {selected_info['Country']}")
-                    
 else:
     st.warning("No hay empresas en el Top 5 debido a los filtros aplicados.")
     
@@ -349,35 +594,10 @@ map_data = map_data.rename(columns={'Latitude': 'latitude', 'Longitude': 'longit
 
 # Verificamos que haya datos para mostrar en el mapa
 if not map_data.empty:
-    with st.expander("Ver Mapa de Empresas Unicornio"):
-        # Crear un gráfico de dispersión en el mapa usando Plotly Express
-        fig = px.scatter_mapbox(
-            map_data,
-            lat="latitude",
-            lon="longitude",
-            size="Valuation",  # Tamaño de los puntos basado en Valuation
-            color="Country",  # Color de los puntos basado en Country
-            hover_name="Company",  # Nombre de la empresa al pasar el cursor
-            hover_data={"Valuation": True, "Country": True},  # Datos adicionales en el hover
-            color_continuous_scale=px.colors.cyclical.IceFire,
-            size_max=20,  # Tamaño máximo de los puntos
-            zoom=1,
-            height=500
-        )
-
-        # Configurar el estilo del mapa
-        fig.update_layout(mapbox_style="carto-positron")
-        fig.update_layout(margin={"r":0,"t":0,"l":0,"b":0})  # Sin márgenes alrededor del mapa
-
-        # Mostrar el gráfico en Streamlit
-        st.plotly_chart(fig, use_container_width=True)
+    map_section = st.expander("Ver Mapa de Empresas Unicornio", key="map_section", on_change="rerun")
+    with map_section:
+        if map_section.open:
+            render_map_section(map_data, filter_mask)
 else:
     st.warning("No hay datos disponibles para mostrar en el mapa.")
 
-
-def get_binary_file_downloader_html(bin_file, file_name, button_text):
-    bin_str = bin_file.read()
-    b64 = base64.b64encode(bin_str).decode()
-    href = f'<a href="data:application/octet-stream;base64,{b64}" download="{file_name}">{button_text}</a>'
-    return href
-
@@ -1,116 +1,122 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import os
 from PIL import Image
 
+from utils import datasets, export, filters, page_metrics, resources, styling, telemetry
+from utils.figure_cache import cached_figure
+from utils.lazy_module import LazyModule
+from utils.paginated_table import paginated_table
+from utils.port_stream import PortEventStream
 
-# Cargar el dataset
-@st.cache_data
-def load_port_data():
-    data = pd.read_csv("./dashboards_pages/data/Port_Data_pre.csv")
-    data['Vessels in Port'] = data['Vessels in Port'].fillna(0).astype(int)
-    data['Departures(Last 24 Hours)'] = data['Departures(Last 24 Hours)'].fillna(0).astype(int)
-    data['Arrivals(Last 24 Hours)'] = data['Arrivals(Last 24 Hours)'].fillna(0).astype(int)
-    data['Expected Arrivals'] = data['Expected Arrivals'].fillna(0).astype(int)
-    return data
-
-# Funciones de estilo
-def apply_country_style(row, top_countries):
-    style = [""] * len(row)
-    if row['Country'] in top_countries:
-        index = top_countries.index(row['Country'])
-        colors = ["#6a0dad", "#9b59b6", "#d2b4de"]  # Tonos de morado desde oscuro a claro
-        style = [f"background-color: {colors[index]}; color: white; font-weight: bold;"] * len(row)
-    return style
-
-def apply_port_type_style(row, top_types):
-    style = [""] * len(row)
-    if row['Type'] in top_types:
-        index = top_types.index(row['Type'])
-        colors = ["#ff5733", "#ffa474", "#ffd2a0"]  # Tonos cálidos en degradado de naranja
-        style = [f"background-color: {colors[index]}; color: white; font-weight: bold;"] * len(row)
-    return style
-
-def apply_total_expected_arrivals_style(row, top_ports):
-    """Estilo para los puertos con mayor total de llegadas potenciales (arribos actuales + llegadas esperadas)."""
-    style = [""] * len(row)
-    if row['Port Name'] in top_ports:
-        style = ["background-color: #4caf50; color: white; font-weight: bold;"] * len(row)  # Verde intenso
-    return style
-
-
-
-# Cargar datos de puertos
-port_data = load_port_data()
+# plotly.express solo se importa cuando hay que construir un gráfico que no está en la caché
+px = LazyModule("plotly.express")
 
-# Título
-st.markdown("<h1 style='text-align: center; color: #003366;'>Dashboard de Análisis de Puertos</h1>", unsafe_allow_html=True)
-st.markdown("<p style='text-align: center;'>Explora el rendimiento y las características de los puertos de todo el mundo.</p>", unsafe_allow_html=True)
-
-# --- Filtros en la barra lateral ---
-st.sidebar.header("Filtros")
-
-# Filtro por tipo de puerto (independiente)
-type_options = sorted(port_data['Type'].unique())
-selected_types = st.sidebar.multiselect("Seleccione Tipo(s) de Puerto", options=type_options, default=type_options)
-
-# Filtro de selección múltiple por país
-selected_countries = st.sidebar.multiselect("Seleccione País(es)", sorted(port_data['Country'].unique()), default=[])
-
-# Filtrar datos en base a selección de países
-if selected_countries:
-    filtered_data_country = port_data[port_data['Country'].isin(selected_countries) & port_data['Type'].isin(selected_types)]
-else:
-    filtered_data_country = port_data
+# Cada cuántos segundos se revisa el log de eventos en modo streaming
+STREAM_REFRESH_SECONDS = 5
 
-# Opciones de Área Global basadas en la selección de países
-area_global_options = sorted(filtered_data_country['Area Global'].unique())
-selected_global_areas = st.sidebar.multiselect("Seleccione Área Global", options=area_global_options, default=[])
+# Tiempos por sección y filas por etapa de filtrado de esta página
+tracer = telemetry.PageTracer("dashboard02")
 
-# Filtrar datos en base a selección de área global
-if selected_global_areas:
-    filtered_data_area_global = filtered_data_country[filtered_data_country['Area Global'].isin(selected_global_areas)]
-else:
-    filtered_data_area_global = filtered_data_country
 
-# Opciones de Área Local basadas en la selección de área global
-area_local_options = sorted(filtered_data_area_global['Area Local'].unique())
-selected_local_areas = st.sidebar.multiselect("Seleccione Área Local", options=area_local_options, default=[])
+# Lector del log de eventos compartido por todas las sesiones (mantiene los contadores en memoria)
+@st.cache_resource
+def get_port_stream():
+    return PortEventStream()
 
-# Filtrar datos en base a selección de área local
-if selected_local_areas:
-    filtered_data_area_local = filtered_data_area_global[filtered_data_area_global['Area Local'].isin(selected_local_areas)]
-else:
-    filtered_data_area_local = filtered_data_area_global
+# Revisa periódicamente el log y solo vuelve a ejecutar la página cuando llegan eventos nuevos
+@st.fragment(run_every=STREAM_REFRESH_SECONDS)
+def watch_port_events(stream):
+    if stream.poll():
+        st.rerun()
+    st.caption(f"Eventos procesados: {stream.events_processed:,}")
+    if stream.invalid_events:
+        st.caption(f"Eventos descartados (inválidos): {stream.invalid_events:,}")
 
+# Funciones de estilo (devuelven la matriz de estilos de toda la tabla para `Styler.apply(axis=None)`)
+def apply_country_style(df, top_countries):
+    colors = ["#6a0dad", "#9b59b6", "#d2b4de"]  # Tonos de morado desde oscuro a claro
+    palette = [f"background-color: {color}; color: white; font-weight: bold;" for color in colors]
+    return styling.rank_styles(df, 'Country', top_countries, palette)
 
+def apply_port_type_style(df, top_types):
+    colors = ["#ff5733", "#ffa474", "#ffd2a0"]  # Tonos cálidos en degradado de naranja
+    palette = [f"background-color: {color}; color: white; font-weight: bold;" for color in colors]
+    return styling.rank_styles(df, 'Type', top_types, palette)
 
-# Aplicar todos los filtros
-filtered_data = filtered_data_area_local[filtered_data_area_local['Type'].isin(selected_types)]
+def apply_total_expected_arrivals_style(df, top_ports):
+    """Estilo para los puertos con mayor total de llegadas potenciales (arribos actuales + llegadas esperadas)."""
+    palette = ["background-color: #4caf50; color: white; font-weight: bold;"] * len(top_ports)  # Verde intenso
+    return styling.rank_styles(df, 'Port Name', top_ports, palette)
+
+# Subconjunto filtrado con el total de llegadas potenciales (arribos actuales + llegadas esperadas)
+def filter_ports(data, rows):
+    filtered = data.iloc[rows]
+    return filtered.assign(**{'Total Expected Arrivals': filtered['Expected Arrivals'] + filtered['Arrivals(Last 24 Hours)']})
+
+# Conteos de un gráfico: del snapshot precalculado si la selección tiene uno; si no, desde los datos filtrados
+def chart_counts(chart_frames, chart_id, data):
+    if chart_frames is not None:
+        return chart_frames[chart_id]
+    return page_metrics.category_counts(data, page_metrics.PORT_CHARTS[chart_id])
+
+# Funciones que construyen los gráficos (solo se llaman si la figura no está en la caché)
+def build_country_chart(counts):
+    port_count_by_country = counts.set_axis(['Country', 'Port Count'], axis=1)
+    fig_country = px.bar(port_count_by_country, x='Country', y='Port Count', title="Cantidad de Puertos por País")
+    fig_country.update_layout(xaxis_title="País", yaxis_title="Cantidad de Puertos", height=350)
+    return fig_country
+
+def build_type_chart(counts):
+    port_count_by_type = counts.set_axis(['Type', 'Port Count'], axis=1)
+    fig_type = px.bar(port_count_by_type, x='Type', y='Port Count', title="Cantidad de Puertos por Tipo")
+    fig_type.update_layout(xaxis_title="Tipo de Puerto", yaxis_title="Cantidad", height=350)
+    return fig_type
+
+def build_area_global_chart(area_global_counts):
+    fig_area_global = px.pie(
+        area_global_counts, values='Count', names='Area Global', title="Distribución por Área Global",
+        color_discrete_sequence=px.colors.sequential.Blues
+    )
+    fig_area_global.update_traces(textinfo="percent+label")
+    return fig_area_global
+
+def build_type_country_chart(data):
+    fig_type_country = px.histogram(
+        data, x='Type', color='Country', barmode='stack',
+        title="Distribución de Tipos de Puerto por País",
+        color_discrete_sequence=px.colors.qualitative.Pastel
+    )
+    fig_type_country.update_layout(xaxis_title="Tipo de Puerto", yaxis_title="Cantidad", height=350)
+    return fig_type_country
 
-# --- Métricas Generales ---
-st.subheader("Métricas Generales")
-col1, col2, col3, col4 = st.columns(4)
-col1.metric("Puertos Totales", len(filtered_data['Port Name'].unique()))
-col2.metric("Total de Buques en Puerto", filtered_data['Vessels in Port'].sum())
-col3.metric("Salidas en las Últ. 24 Hrs", filtered_data['Departures(Last 24 Hours)'].sum())
-col4.metric("Llegadas en las Últ. 24 Hrs", filtered_data['Arrivals(Last 24 Hours)'].sum())
+def build_arrivals_departures_chart(data):
+    # Gráfico de dispersión para visualizar la correlación
+    fig_corr = px.scatter(
+        data,
+        x='Total Expected Arrivals',
+        y='Departures(Last 24 Hours)',
+        size='Vessels in Port',
+        color='Country',
+        hover_name='Port Name',
+        labels={'Total Expected Arrivals': 'Total Llegadas Potenciales', 'Departures(Last 24 Hours)': 'Salidas Últimas 24 Horas'},
+        title="Correlación entre Total de Llegadas Potenciales y Salidas en las Últimas 24 Horas",
+        color_discrete_sequence=px.colors.sequential.Blues
+    )
+    fig_corr.update_layout(
+        height=400,
+        xaxis_title="Total Llegadas Potenciales (Actuales + Esperadas)",
+        yaxis_title="Salidas en las Últimas 24 Horas",
+        title_x=0.5,
+        title_font_size=16,
+        margin=dict(t=50)
+    )
+    return fig_corr
 
-# --- Análisis de Distribución ---
-st.markdown("""
-    <div style="text-align: center; margin-top: 10px; padding: 10px; background-color: #f0f8ff; border-radius: 8px;">
-        <h2 style="color: #003366; font-size: 2em;">Análisis de Distribución de Puertos</h2>
-        <p style="color: #555; font-size: 1em;">
-            Este análisis explora la distribución de puertos por país, tipos de puertos, y otros factores clave. 
-            Utilice los filtros para ajustar la visualización de cada gráfico y obtener una vista detallada de los datos relevantes.
-        </p>
-    </div>
-""", unsafe_allow_html=True)
 
-# --- Expander para Análisis de Distribuciones ---
-with st.expander("Ver Análisis de Distribuciones"):
-    
+# Sección de distribuciones como fragmento: sus filtros internos solo vuelven a ejecutar esta sección.
+# `chart_frames` son los conteos del snapshot de la selección (None si no hay), válidos sin los filtros internos
+@st.fragment
+def render_distribution_section(filtered_data, chart_frames):
     # --- Gráfico de Puertos por País ---
     col1, col2 = st.columns(2)
 
@@ -131,16 +137,21 @@ with st.expander("Ver Análisis de Distribuciones"):
         if selected_types_country:
             type_options_country = sorted(filtered_data['Type'].unique())
             selected_types_country_filter = st.multiselect("Filtrar por Tipo de Puerto", options=type_options_country, default=type_options_country, key="types_country_filter")
-            filtered_data_country = filtered_data[filtered_data['Type'].isin(selected_types_country_filter)].copy()
+            filtered_data_country = filtered_data[filters.isin_codes(filtered_data['Type'], selected_types_country_filter)]
+            tracer.rows("types_country", len(filtered_data), len(filtered_data_country))
+            country_frames = None
         else:
-            filtered_data_country = filtered_data.copy()
+            selected_types_country_filter = None
+            filtered_data_country = filtered_data
+            country_frames = chart_frames
 
         # Gráfico de barras para cantidad de puertos por país
-        port_count_by_country = filtered_data_country['Country'].value_counts().reset_index()
-        port_count_by_country.columns = ['Country', 'Port Count']
-        fig_country = px.bar(port_count_by_country, x='Country', y='Port Count', title="Cantidad de Puertos por País")
-        fig_country.update_layout(xaxis_title="País", yaxis_title="Cantidad de Puertos", height=350)
-        st.plotly_chart(fig_country, use_container_width=True)
+        fig_country = cached_chart(
+            "country", lambda: build_country_chart(chart_counts(country_frames, "country", filtered_data_country)),
+            filters=port_filters,
+            types=sorted(selected_types_country_filter) if selected_types_country_filter is not None else None
+        )
+        tracer.plotly_chart("country", fig_country, use_container_width=True)
 
     # --- Gráfico de Tipos de Puertos ---
     with col2:
@@ -159,21 +170,26 @@ with st.expander("Ver Análisis de Distribuciones"):
         if selected_types_general:
             type_options_general = sorted(filtered_data['Type'].unique())
             selected_types_general_filter = st.multiselect("Filtrar por Tipo de Puerto", options=type_options_general, default=type_options_general, key="types_general_filter")
-            filtered_data_type = filtered_data[filtered_data['Type'].isin(selected_types_general_filter)].copy()
+            filtered_data_type = filtered_data[filters.isin_codes(filtered_data['Type'], selected_types_general_filter)]
+            tracer.rows("types_general", len(filtered_data), len(filtered_data_type))
+            type_frames = None
         else:
-            filtered_data_type = filtered_data.copy()
+            selected_types_general_filter = None
+            filtered_data_type = filtered_data
+            type_frames = chart_frames
 
         # Gráfico de barras por tipos de puerto
-        port_count_by_type = filtered_data_type['Type'].value_counts().reset_index()
-        port_count_by_type.columns = ['Type', 'Port Count']
-        fig_type = px.bar(port_count_by_type, x='Type', y='Port Count', title="Cantidad de Puertos por Tipo")
-        fig_type.update_layout(xaxis_title="Tipo de Puerto", yaxis_title="Cantidad", height=350)
-        st.plotly_chart(fig_type, use_container_width=True)
-
-    
-# --- Análisis Multivariado ---
-with st.expander("Ver Análisis Multivariado"):
+        fig_type = cached_chart(
+            "type", lambda: build_type_chart(chart_counts(type_frames, "type", filtered_data_type)),
+            filters=port_filters,
+            types=sorted(selected_types_general_filter) if selected_types_general_filter is not None else None
+        )
+        tracer.plotly_chart("type", fig_type, use_container_width=True)
 
+# Sección multivariada como fragmento: elegir un puerto solo vuelve a ejecutar esta sección
+@st.fragment
+def render_multivariate_section(filtered_data, chart_frames):
+    # 'Total Expected Arrivals' (llegadas actuales + esperadas) ya viene calculado en el subconjunto filtrado
     # Columnas para el diseño de gráficos y métricas
     col1, col2 = st.columns(2)
 
@@ -189,14 +205,11 @@ with st.expander("Ver Análisis Multivariado"):
             </div>
         """, unsafe_allow_html=True)
 
-        area_global_counts = filtered_data['Area Global'].value_counts().reset_index()
-        area_global_counts.columns = ['Area Global', 'Count']
-        fig_area_global = px.pie(
-            area_global_counts, values='Count', names='Area Global', title="Distribución por Área Global",
-            color_discrete_sequence=px.colors.sequential.Blues
+        fig_area_global = cached_chart(
+            "area_global", lambda: build_area_global_chart(chart_counts(chart_frames, "area_global", filtered_data)),
+            filters=port_filters
         )
-        fig_area_global.update_traces(textinfo="percent+label")
-        st.plotly_chart(fig_area_global, use_container_width=True)
+        tracer.plotly_chart("area_global", fig_area_global, use_container_width=True)
 
     # --- Relación entre Tipo de Puerto y País ---
     with col2:
@@ -210,16 +223,10 @@ with st.expander("Ver Análisis Multivariado"):
             </div>
         """, unsafe_allow_html=True)
 
-        fig_type_country = px.histogram(
-            filtered_data, x='Type', color='Country', barmode='stack',
-            title="Distribución de Tipos de Puerto por País",
-            color_discrete_sequence=px.colors.qualitative.Pastel
+        fig_type_country = cached_chart(
+            "type_country", lambda: build_type_country_chart(filtered_data), filters=port_filters
         )
-        fig_type_country.update_layout(xaxis_title="Tipo de Puerto", yaxis_title="Cantidad", height=350)
-        st.plotly_chart(fig_type_country, use_container_width=True)
-
-    # Calcular la suma de 'Expected Arrivals' y 'Arrivals(Last 24 Hours)' para obtener el total esperado de llegadas
-    filtered_data['Total Expected Arrivals'] = filtered_data['Expected Arrivals'] + filtered_data['Arrivals(Last 24 Hours)']
+        tracer.plotly_chart("type_country", fig_type_country, use_container_width=True)
 
     # --- Gráfico de Correlación entre Total de Llegadas Potenciales y Salidas ---
     st.markdown("""
@@ -232,27 +239,11 @@ with st.expander("Ver Análisis Multivariado"):
         </div>
     """, unsafe_allow_html=True)
 
-    # Gráfico de dispersión para visualizar la correlación
-    fig_corr = px.scatter(
-        filtered_data,
-        x='Total Expected Arrivals',
-        y='Departures(Last 24 Hours)',
-        size='Vessels in Port',
-        color='Country',
-        hover_name='Port Name',
-        labels={'Total Expected Arrivals': 'Total Llegadas Potenciales', 'Departures(Last 24 Hours)': 'Salidas Últimas 24 Horas'},
-        title="Correlación entre Total de Llegadas Potenciales y Salidas en las Últimas 24 Horas",
-        color_discrete_sequence=px.colors.sequential.Blues
+    # Llegadas, salidas y buques en puerto cambian con los eventos en vivo: esta figura sí depende de `stream_version`
+    fig_corr = cached_chart(
+        "arrivals_departures", lambda: build_arrivals_departures_chart(filtered_data), filters=filter_state
     )
-    fig_corr.update_layout(
-        height=400,
-        xaxis_title="Total Llegadas Potenciales (Actuales + Esperadas)",
-        yaxis_title="Salidas en las Últimas 24 Horas",
-        title_x=0.5,
-        title_font_size=16,
-        margin=dict(t=50)
-    )
-    st.plotly_chart(fig_corr, use_container_width=True)
+    tracer.plotly_chart("arrivals_departures", fig_corr, use_container_width=True)
 
     # --- Detalles de Puertos Seleccionados ---
     st.markdown("""
@@ -265,9 +256,10 @@ with st.expander("Ver Análisis Multivariado"):
     """, unsafe_allow_html=True)
 
     # Ordenar por correlación entre Total Expected Arrivals y Departures
-    top_ports_corr = filtered_data.nlargest(5, 'Total Expected Arrivals')[[ 
-        'Port Name', 'Country', 'Total Expected Arrivals', 'Arrivals(Last 24 Hours)', 'Expected Arrivals', 'Departures(Last 24 Hours)', 'Vessels in Port'
-    ]]
+    with tracer.span("aggregate:top_ports_corr"):
+        top_ports_corr = filtered_data.nlargest(5, 'Total Expected Arrivals')[[ 
+            'Port Name', 'Country', 'Total Expected Arrivals', 'Arrivals(Last 24 Hours)', 'Expected Arrivals', 'Departures(Last 24 Hours)', 'Vessels in Port'
+        ]]
 
     # Selector de puerto
     port_selected = st.selectbox(
@@ -295,6 +287,154 @@ with st.expander("Ver Análisis Multivariado"):
         </div>
     """, unsafe_allow_html=True)
 
+
+# Cargar datos de puertos
+with tracer.span("load_data"):
+    port_data = resources.load_ports()
+    area_index = resources.load_port_area_index()
+
+# Título
+st.markdown("<h1 style='text-align: center; color: #003366;'>Dashboard de Análisis de Puertos</h1>", unsafe_allow_html=True)
+st.markdown("<p style='text-align: center;'>Explora el rendimiento y las características de los puertos de todo el mundo.</p>", unsafe_allow_html=True)
+
+# --- Modo streaming: conteos de llegadas/salidas desde el log de eventos en vivo ---
+streaming_mode = st.sidebar.toggle(
+    "Modo streaming (eventos en vivo)",
+    value=False,
+    help="Actualiza los buques en puerto y las llegadas/salidas de las últimas 24 horas a partir del log de eventos."
+)
+if streaming_mode:
+    with tracer.span("stream"):
+        port_stream = get_port_stream()
+        port_stream.poll()
+        port_data = port_stream.apply_to(port_data)
+    with st.sidebar:
+        watch_port_events(port_stream)
+
+# --- Filtros en la barra lateral ---
+st.sidebar.header("Filtros")
+
+# Filtro por tipo de puerto (independiente)
+type_options = filters.category_options(port_data['Type'])
+selected_types = st.sidebar.multiselect("Seleccione Tipo(s) de Puerto", options=type_options, default=type_options)
+
+# Filtro de selección múltiple por país
+selected_countries = st.sidebar.multiselect("Seleccione País(es)", filters.category_options(port_data['Country']), default=[])
+
+# Combinaciones del índice en base a selección de países (con sus tipos de puerto)
+if selected_countries:
+    leaves_country = area_index.restrict(area_index.leaves_for(selected_countries), 'Type', selected_types)
+else:
+    leaves_country = area_index.leaves_for([])
+
+# Opciones de Área Global basadas en la selección de países
+area_global_options = area_index.options(leaves_country, 'Area Global')
+selected_global_areas = st.sidebar.multiselect("Seleccione Área Global", options=area_global_options, default=[])
+
+# Restringir en base a selección de área global
+if selected_global_areas:
+    leaves_area_global = area_index.restrict(leaves_country, 'Area Global', selected_global_areas)
+else:
+    leaves_area_global = leaves_country
+
+# Opciones de Área Local basadas en la selección de área global
+area_local_options = area_index.options(leaves_area_global, 'Area Local')
+selected_local_areas = st.sidebar.multiselect("Seleccione Área Local", options=area_local_options, default=[])
+
+# Restringir en base a selección de área local
+if selected_local_areas:
+    leaves_area_local = area_index.restrict(leaves_area_global, 'Area Local', selected_local_areas)
+else:
+    leaves_area_local = leaves_area_global
+
+
+
+# Los gráficos dependen de la versión de los datos, de los filtros y, en streaming, de los contadores en vivo
+data_version = datasets.dataset_version("ports")
+filter_state = {
+    "types": sorted(selected_types),
+    "countries": sorted(selected_countries),
+    "global_areas": sorted(selected_global_areas),
+    "local_areas": sorted(selected_local_areas),
+    "stream_version": port_stream.version if streaming_mode else None,
+}
+
+# Aplicar todos los filtros: las filas finales son la unión de las hojas seleccionadas.
+# El subconjunto, ya con 'Total Expected Arrivals', se guarda en la caché de resultados por versión y filtros
+with tracer.span("filter"):
+    leaves_selected = area_index.restrict(leaves_area_local, 'Type', selected_types)
+    filtered_data = resources.cached_result(
+        lambda: filter_ports(port_data, area_index.rows(leaves_selected)),
+        "dashboard02", "filtered", data_version, filter_state
+    )
+tracer.rows("area_cascade", len(port_data), len(filtered_data))
+
+# Filtros de la selección de puertos, sin los contadores en vivo: los conteos de puertos no dependen de ellos
+port_filters = {key: filter_state[key] for key in ("types", "countries", "global_areas", "local_areas")}
+
+# Cada gráfico se guarda en la caché de figuras bajo los valores de los que depende (`inputs`)
+def cached_chart(chart_id, build_fn, **inputs):
+    with tracer.span(f"figure:{chart_id}"):
+        return cached_figure("dashboard02", chart_id, data_version, build_fn, **inputs)
+
+# --- Métricas Generales ---
+st.subheader("Métricas Generales")
+col1, col2, col3, col4 = st.columns(4)
+# Métricas y conteos de los gráficos precalculados por `python -m utils.snapshots` si la selección está en su grilla
+# (fuera del modo streaming)
+snapshot = None
+if not streaming_mode:
+    snapshot = resources.page_snapshot("dashboard02", data_version, port_filters)
+kpis = snapshot["kpis"] if snapshot is not None else page_metrics.port_kpis(filtered_data)
+chart_frames = snapshot["charts"] if snapshot is not None else None
+col1.metric("Puertos Totales", kpis["ports"])
+col2.metric("Total de Buques en Puerto", kpis["vessels"])
+col3.metric("Salidas en las Últ. 24 Hrs", kpis["departures"])
+col4.metric("Llegadas en las Últ. 24 Hrs", kpis["arrivals"])
+
+# --- Búsqueda de Puertos ---
+# Búsqueda difusa por nombre, alias o código UN sobre todos los puertos, resuelta con el índice de trigramas
+# (el índice solo se carga cuando hay algo que buscar)
+port_query = st.text_input(
+    "Buscar puerto por nombre, alias o código UN:", key="port_search",
+    placeholder="Ej.: Shanghai, Yangshan, CNSHA..."
+)
+if port_query:
+    with tracer.span("aggregate:port_search"):
+        search_index = resources.load_port_search_index()
+        matches = search_index.search(port_query, limit=10)
+        search_results = port_data.iloc[matches['row']][
+            ['Port Name', 'UN Code', 'Country', 'Type', 'Also known as']
+        ].assign(**{'Coincidencia': matches['match'].to_numpy(), 'Similitud': matches['score'].round(2).to_numpy()})
+    if search_results.empty:
+        st.info("No se encontraron puertos para la búsqueda.")
+    else:
+        st.dataframe(search_results, hide_index=True)
+
+# --- Análisis de Distribución ---
+st.markdown("""
+    <div style="text-align: center; margin-top: 10px; padding: 10px; background-color: #f0f8ff; border-radius: 8px;">
+        <h2 style="color: #003366; font-size: 2em;">Análisis de Distribución de Puertos</h2>
+        <p style="color: #555; font-size: 1em;">
+            Este análisis explora la distribución de puertos por país, tipos de puertos, y otros factores clave. 
+            Utilice los filtros para ajustar la visualización de cada gráfico y obtener una vista detallada de los datos relevantes.
+        </p>
+    </div>
+""", unsafe_allow_html=True)
+
+# --- Expander para Análisis de Distribuciones ---
+# El contenido de cada expander solo se calcula mientras está abierto
+distribution_section = st.expander("Ver Análisis de Distribuciones", key="distribution_section", on_change="rerun")
+with distribution_section:
+    if distribution_section.open:
+        render_distribution_section(filtered_data, chart_frames)
+
+# --- Análisis Multivariado ---
+multivariate_section = st.expander("Ver Análisis Multivariado", key="multivariate_section", on_change="rerun")
+with multivariate_section:
+    if multivariate_section.open:
+        render_multivariate_section(filtered_data, chart_frames)
+
 # Descripción del criterio de resaltado
 highlight_option = st.selectbox(
     "Seleccione criterio para resaltar:",
@@ -324,27 +464,38 @@ else:  # "Puertos con Mayor Total de Llegadas Potenciales"
 
 
 # Calcular los valores para cada criterio
-top_countries = filtered_data['Country'].value_counts().nlargest(3).index.tolist()
-top_port_types = filtered_data['Type'].value_counts().nlargest(2).index.tolist()
-
-# Crear una columna 'Total Expected Arrivals' para representar el total potencial de llegadas (arribos actuales + esperados)
-filtered_data['Total Expected Arrivals'] = filtered_data['Expected Arrivals'] + filtered_data['Arrivals(Last 24 Hours)']
-
-# Seleccionar los puertos con los valores más altos de 'Total Expected Arrivals'
-top_ports_total_expected = filtered_data.nlargest(5, 'Total Expected Arrivals')['Port Name'].tolist()
-
-# Aplicar el estilo personalizado basado en el criterio seleccionado
-if highlight_option == "Top Países con más Puertos":
-    styled_filtered_data = filtered_data.style.apply(lambda row: apply_country_style(row, top_countries), axis=1)
-elif highlight_option == "Tipo de Puerto más Frecuente":
-    styled_filtered_data = filtered_data.style.apply(lambda row: apply_port_type_style(row, top_port_types), axis=1)
-else:  # "Puertos con Mayor Total de Llegadas Potenciales"
-    styled_filtered_data = filtered_data.style.apply(lambda row: apply_total_expected_arrivals_style(row, top_ports_total_expected), axis=1)
+with tracer.span("aggregate:highlight"):
+    top_countries = filters.observed_counts(filtered_data['Country']).nlargest(3).index.tolist()
+    top_port_types = filters.observed_counts(filtered_data['Type']).nlargest(2).index.tolist()
+
+    # Seleccionar los puertos con los valores más altos de 'Total Expected Arrivals'
+    top_ports_total_expected = filtered_data.nlargest(5, 'Total Expected Arrivals')['Port Name'].tolist()
+
+# Aplicar el estilo personalizado basado en el criterio seleccionado (solo a la ventana visible)
+def style_port_window(window):
+    if highlight_option == "Top Países con más Puertos":
+        return window.style.apply(apply_country_style, axis=None, top_countries=top_countries)
+    elif highlight_option == "Tipo de Puerto más Frecuente":
+        return window.style.apply(apply_port_type_style, axis=None, top_types=top_port_types)
+    else:  # "Puertos con Mayor Total de Llegadas Potenciales"
+        return window.style.apply(apply_total_expected_arrivals_style, axis=None, top_ports=top_ports_total_expected)
+
+# Mostrar tabla paginada con estilo aplicado. En streaming los conteos cambian con cada evento,
+# así que la clave de los órdenes globales incluye la versión del stream
+table_key = f"ports-{data_version}-stream{port_stream.version}" if streaming_mode else f"ports-{data_version}"
+with tracer.span("table"):
+    paginated_table(
+        port_data,
+        filtered_data,
+        key="port_table",
+        dataset_key=table_key,
+        style_fn=style_port_window,
+        height=400
+    )
 
-# Mostrar tabla con estilo aplicado
-st.dataframe(
-    styled_filtered_data,
-    height=400
+# Exportar los puertos filtrados (con el total de llegadas potenciales) en bloques
+export.export_controls(
+    "port_export", "puertos_filtrados", filtered_data.columns, lambda: export.frame_chunks(filtered_data)
 )
 
 
@@ -352,15 +503,16 @@ st.dataframe(
 st.markdown("<h4 style='text-align: center;'>Visualización del Dashboard de Power BI</h4>", unsafe_allow_html=True)
 
 # Agregar botón de descarga para el reporte de Power BI
+# El PDF se lee una vez por proceso y se entrega solo al hacer clic (no en cada ejecución de la página)
 pdf_path = "./dashboards_pages/data/dashboard_buques.pdf"
-if os.path.exists(pdf_path):
-    with open(pdf_path, "rb") as file:
-        pdf_data = file.read()  # Leer los datos del PDF
+pdf_data = resources.static_asset(pdf_path)
+if pdf_data is not None:
     st.download_button(
         label="Descargar Dashboard en PDF",
-        data=pdf_data,
+        data=lambda: pdf_data,
         file_name="dashboard_buques.pdf",
-        mime="application/pdf"
+        mime="application/pdf",
+        on_click="ignore"
     )
 else:
     st.warning("No se encontró el archivo PDF. Verifica la ruta del archivo.")
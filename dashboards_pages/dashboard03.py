@@ -1,15 +1,22 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import numpy as np
 
-# Cargar el dataset
-@st.cache_data
-def load_data():
-    data = pd.read_csv("./dashboards_pages/data/supermarket_sales.csv")
-    data['Date'] = pd.to_datetime(data['Date'])
-    data['Income'] = data['Total'] - data['gross income']
-    return data
+from utils import datasets, export, filters, page_metrics, resources, styling, telemetry
+from utils.figure_cache import cached_figure, figure_key
+from utils.lazy_module import LazyModule
+from utils.paginated_table import paginated_table
+from utils.sales_dataset import EXPORT_COLUMNS, TABLE_COLUMNS, filter_expression
+
+# plotly.express (y statsmodels, que usa trendline="ols") solo se importan al construir un gráfico
+px = LazyModule("plotly.express")
+
+# Tiempos por sección y filas por etapa de filtrado de esta página
+tracer = telemetry.PageTracer("dashboard03")
+
+# Con el dataset Parquet, filas de la muestra para los gráficos de dispersión y de la tabla detallada
+SAMPLE_ROWS = 5000
+TABLE_ROWS = 10000
 
 # Función para obtener los pares de correlaciones más altas usando valor absoluto, excluyendo 1 y NaN
 def get_top_correlation_pairs(data_corr, top_n=3):
@@ -25,6 +32,96 @@ def get_top_correlations_for_column(data_corr, column, top_n=3):
     corr = data_corr[column].drop(labels=[column]).sort_values(ascending=False)
     return corr.head(top_n)
 
+# Ventas de `in_range` (las filas del rango de fechas) con la sucursal, el género y el método de pago elegidos
+def filter_sales(in_range, branches, genders, payments):
+    return in_range[
+        filters.isin_codes(in_range['Branch'], branches) &
+        filters.isin_codes(in_range['Gender'], genders) &
+        filters.isin_codes(in_range['Payment'], payments)
+    ]
+
+# Funciones que construyen los gráficos (solo se llaman si la figura no está en la caché)
+def build_correlation_chart(data, var1, var2):
+    return px.scatter(data, x=var1, y=var2, trendline="ols", title=f"Correlación entre {var1} y {var2}")
+
+def build_gender_chart(data):
+    fig_gender = px.pie(
+        data, names='Gender', values='Total',
+        color_discrete_sequence=px.colors.sequential.RdBu
+    )
+    fig_gender.update_traces(textinfo="percent+label")
+    return fig_gender
+
+def build_payment_chart(data):
+    fig_payment = px.bar(
+        data.groupby('Payment', observed=True)['Total'].sum().reset_index(),
+        x='Payment', y='Total', color='Payment',
+        color_discrete_sequence=px.colors.qualitative.Set3
+    )
+    fig_payment.update_layout(xaxis_title="Método de Pago", yaxis_title="Total Ventas", height=350)
+    return fig_payment
+
+def build_multivariate_chart(data):
+    fig_multi = px.scatter(
+        data, x='Unit price', y='Quantity', size='Total',
+        color='Product line', hover_name='Product line',
+        color_discrete_sequence=px.colors.sequential.Viridis
+    )
+    fig_multi.update_layout(xaxis_title="Precio Unitario", yaxis_title="Cantidad", height=400)
+    return fig_multi
+
+# Sección de correlaciones como fragmento: cambiar el cmap o las variables solo vuelve a ejecutar esta sección
+# `compute_correlation()` devuelve la matriz y `scatter_data(var1, var2)` las filas del gráfico de dispersión
+@st.fragment
+def render_correlation_section(compute_correlation, scatter_data):
+    with tracer.span("aggregate:correlation"):
+        data_corr = compute_correlation().fillna(0)
+
+    # Tabla de correlación con estilo
+    st.markdown("""
+        <div style="background-color: #f9f9f9; padding: 15px; border-radius: 8px;">
+            <p style="font-size: 0.9em; color: #333; text-align: center;">
+                <em>Nota:</em> Los valores sombreados en la tabla de correlaciones representan la relación entre variables. 
+                Las correlaciones cercanas a 1 (color más oscuro) indican una relación fuerte entre las variables, 
+                mientras que los valores cercanos a 0 indican poca o ninguna relación.
+            </p>
+        </div>
+    """, unsafe_allow_html=True)
+
+    # Estilos de cmap para la tabla de correlación
+    cmap_styles = ['magma', 'coolwarm', 'viridis', 'inferno', 'plasma', 'cividis', 'Blues', 'Greens', 'Reds', 'Purples']
+
+    # Selección de estilo de cmap
+    selected_cmap = st.selectbox("Seleccione el estilo de cmap para la tabla de correlación:", cmap_styles, index=0)
+
+    with tracer.span("render:correlation_table"):
+        st.dataframe(data_corr.style.background_gradient(cmap=selected_cmap, axis=None).format("{:.2f}"))
+
+    # Selección de columna para encontrar sus top 3 correlaciones más altas
+    selected_column = st.selectbox("Seleccione una columna para encontrar sus top 3 correlaciones más altas:", data_corr.columns)
+    top_corrs_for_column = get_top_correlations_for_column(data_corr, selected_column, top_n=3)
+
+    if not top_corrs_for_column.empty:
+        st.markdown(f"<h4 style='color: #003366;'>Top 3 Correlaciones más Altas para {selected_column}</h4>", unsafe_allow_html=True)
+
+        correlation_options = []
+        for idx, (var, corr_value) in enumerate(top_corrs_for_column.items(), 1):
+            correlation_options.append(f"{selected_column} y {var}")
+            st.markdown(f"<p style='font-size: 1.1em; color: #003366;'><strong>{idx}.</strong> {selected_column} y {var}: <strong>{corr_value:.2f}</p>", unsafe_allow_html=True)
+            st.markdown(f"<p style='font-size: 0.9em; color: #555;'>{column_descriptions.get(selected_column, 'Descripción no disponible')}<br>{column_descriptions.get(var, 'Descripción no disponible')}</p>", unsafe_allow_html=True)
+
+        # Selección de correlación para graficar
+        selected_correlation = st.selectbox("Seleccione una correlación para graficar:", correlation_options)
+        var1, var2 = selected_correlation.split(" y ")
+
+        # Graficar la correlación seleccionada
+        st.markdown(f"<h4 style='color: #003366; text-align: center;'>Gráfico de {var1} vs {var2}</h4>", unsafe_allow_html=True)
+        fig_corr = cached_chart(
+            "correlation", lambda: build_correlation_chart(scatter_data(var1, var2), var1, var2),
+            filters=filter_state, var1=var1, var2=var2
+        )
+        tracer.plotly_chart("correlation", fig_corr, use_container_width=True)
+
 # Descripciones de las columnas
 column_descriptions = {
     "Invoice ID": "Identificador de factura: un identificador único para cada transacción o compra.",
@@ -46,12 +143,14 @@ column_descriptions = {
     "Rating": "Calificación: la calificación que el cliente le da al producto o servicio."
 }
 
-# Cargar datos
-sales = load_data()
-
-# Eliminar la columna 'gross margin percentage' antes de calcular la matriz de correlación
-if 'gross margin percentage' in sales.columns:
-    sales = sales.drop(columns=['gross margin percentage'])
+# Cargar datos: el dataset Parquet fuera de memoria si está configurado, si no la copia en memoria
+with tracer.span("load_data"):
+    sales_parquet = resources.load_sales_dataset()
+    if sales_parquet is None:
+        sales = resources.load_sales()
+        date_index = resources.load_sales_date_index()
+        daily_rollup = resources.load_sales_daily_rollup()
+        correlation_stats = resources.load_sales_correlation_stats()
 
 # Título del Dashboard
 st.markdown("<h1 style='text-align: center; color: #003366;'>Análisis de Ventas en Supermercados</h1>", unsafe_allow_html=True)
@@ -59,76 +158,108 @@ st.write("Dashboard interactivo para analizar las ventas y comportamientos en di
 
 # --- Filtros ---
 st.sidebar.header("Filtros")
-branch_filter = st.sidebar.multiselect("Selecciona la Sucursal:", options=sales['Branch'].unique(), default=sales['Branch'].unique())
-gender_filter = st.sidebar.multiselect("Selecciona Género:", options=sales['Gender'].unique(), default=sales['Gender'].unique())
-payment_filter = st.sidebar.multiselect("Selecciona Método de Pago:", options=sales['Payment'].unique(), default=sales['Payment'].unique())
-date_range = st.sidebar.date_input("Rango de Fechas:", [sales['Date'].min(), sales['Date'].max()])
+if sales_parquet is None:
+    branch_options = sales['Branch'].unique().tolist()
+    gender_options = sales['Gender'].unique().tolist()
+    payment_options = sales['Payment'].unique().tolist()
+    date_bounds = [sales['Date'].min(), sales['Date'].max()]
+else:
+    branch_options = sales_parquet.options['Branch']
+    gender_options = sales_parquet.options['Gender']
+    payment_options = sales_parquet.options['Payment']
+    date_bounds = list(sales_parquet.date_bounds)
+branch_filter = st.sidebar.multiselect("Selecciona la Sucursal:", options=branch_options, default=branch_options)
+gender_filter = st.sidebar.multiselect("Selecciona Género:", options=gender_options, default=gender_options)
+payment_filter = st.sidebar.multiselect("Selecciona Método de Pago:", options=payment_options, default=payment_options)
+date_range = st.sidebar.date_input("Rango de Fechas:", date_bounds)
+
+# Los gráficos dependen solo de la versión de los datos y de estos filtros
+data_version = datasets.dataset_version("sales") if sales_parquet is None else sales_parquet.version
+filter_state = {
+    "branch": sorted(branch_filter),
+    "gender": sorted(gender_filter),
+    "payment": sorted(payment_filter),
+    "date_range": [str(date) for date in date_range],
+}
+
+# Resumen de ventas precalculado por `python -m utils.snapshots` si la selección está en su grilla
+snapshot = resources.page_snapshot("dashboard03", data_version, filter_state)
 
 # Aplicar filtros
-filtered_data = sales[
-    (sales['Branch'].isin(branch_filter)) &
-    (sales['Gender'].isin(gender_filter)) &
-    (sales['Payment'].isin(payment_filter)) &
-    (sales['Date'] >= pd.to_datetime(date_range[0])) &
-    (sales['Date'] <= pd.to_datetime(date_range[1]))
-]
-
-if filtered_data.empty:
+if sales_parquet is None:
+    selection = {"Branch": branch_filter, "Gender": gender_filter, "Payment": payment_filter}
+    date_span = (pd.to_datetime(date_range[0]), pd.to_datetime(date_range[1]))
+    with tracer.span("filter"):
+        # El rango de fechas se resuelve con búsqueda binaria sobre el índice ordenado por fecha y los
+        # demás filtros se evalúan solo sobre esas filas; el subconjunto se guarda en la caché de resultados por versión de los datos y filtros
+        filtered_data = resources.cached_result(
+            lambda: filter_sales(sales.take(date_index.rows(*date_span)), branch_filter, gender_filter, payment_filter),
+            "dashboard03", "filtered", data_version, branch_filter, gender_filter, payment_filter,
+            [str(date) for date in date_span]
+        )
+    n_rows = len(filtered_data)
+    tracer.rows("sidebar_filters", len(sales), n_rows)
+else:
+    # Los filtros se traducen a una expresión de pyarrow: solo se leen las particiones y row groups que cumplen
+    filter_args = (tuple(branch_filter), tuple(gender_filter), tuple(payment_filter), date_range[0], date_range[1])
+    expression = filter_expression(*filter_args)
+    with tracer.span("filter"):
+        if snapshot is not None:
+            summary = page_metrics.sales_summary(snapshot)
+        else:
+            summary = resources.query_sales_dataset(sales_parquet.version, "summary", filter_args)
+    n_rows = summary["rows"]
+    tracer.rows("sidebar_filters", sales_parquet.n_rows, n_rows)
+
+# Cada gráfico se guarda en la caché de figuras bajo los valores de los que depende (`inputs`)
+def cached_chart(chart_id, build_fn, **inputs):
+    with tracer.span(f"figure:{chart_id}"):
+        return cached_figure("dashboard03", chart_id, data_version, build_fn, **inputs)
+
+if n_rows == 0:
     st.warning("No hay datos para los filtros seleccionados. Ajuste los filtros.")
 else:
+    if sales_parquet is None:
+        # Las ventas por género, por método de pago y las métricas salen de los agregados diarios
+        with tracer.span("aggregate:daily_rollup"):
+            if snapshot is not None:
+                summary = page_metrics.sales_summary(snapshot)
+            else:
+                summary = page_metrics.rollup_summary(daily_rollup.slice(selection, {"Date": date_span}))
+        multivariate_data = lambda: filtered_data
+    else:
+        # La dispersión usa una muestra de las filas filtradas
+        multivariate_data = lambda: sales_parquet.sample(
+            expression, ['Unit price', 'Quantity', 'Total', 'Product line'], SAMPLE_ROWS
+        )
+    total_sales = summary["total"]
+    mean_sales = total_sales / n_rows
+
     # --- Métricas Generales ---
     st.subheader("Métricas Generales")
     col1, col2, col3 = st.columns(3)
-    col1.metric("Total Ventas", f"${filtered_data['Total'].sum():,.2f}")
-    col2.metric("Promedio de Ventas", f"${filtered_data['Total'].mean():,.2f}")
-    col3.metric("Número de Transacciones", len(filtered_data))
+    col1.metric("Total Ventas", f"${total_sales:,.2f}")
+    col2.metric("Promedio de Ventas", f"${mean_sales:,.2f}")
+    col3.metric("Número de Transacciones", n_rows)
 
     # --- Análisis de Correlaciones ---
     st.subheader("Análisis de Correlaciones")
-    with st.expander("Correlaciones entre Variables"):
-        # Cálculo de la matriz de correlación
-        data_corr = filtered_data.corr(numeric_only=True).fillna(0)
-
-        # Tabla de correlación con estilo
-        st.markdown("""
-            <div style="background-color: #f9f9f9; padding: 15px; border-radius: 8px;">
-                <p style="font-size: 0.9em; color: #333; text-align: center;">
-                    <em>Nota:</em> Los valores sombreados en la tabla de correlaciones representan la relación entre variables. 
-                    Las correlaciones cercanas a 1 (color más oscuro) indican una relación fuerte entre las variables, 
-                    mientras que los valores cercanos a 0 indican poca o ninguna relación.
-                </p>
-            </div>
-        """, unsafe_allow_html=True)
-        
-        # Estilos de cmap para la tabla de correlación
-        cmap_styles = ['magma', 'coolwarm', 'viridis', 'inferno', 'plasma', 'cividis', 'Blues', 'Greens', 'Reds', 'Purples']
-        
-        # Selección de estilo de cmap
-        selected_cmap = st.selectbox("Seleccione el estilo de cmap para la tabla de correlación:", cmap_styles, index=0)
-        
-        st.dataframe(data_corr.style.background_gradient(cmap=selected_cmap, axis=None).format("{:.2f}"))
-
-        # Selección de columna para encontrar sus top 3 correlaciones más altas
-        selected_column = st.selectbox("Seleccione una columna para encontrar sus top 3 correlaciones más altas:", data_corr.columns)
-        top_corrs_for_column = get_top_correlations_for_column(data_corr, selected_column, top_n=3)
-        
-        if not top_corrs_for_column.empty:
-            st.markdown(f"<h4 style='color: #003366;'>Top 3 Correlaciones más Altas para {selected_column}</h4>", unsafe_allow_html=True)
-            
-            correlation_options = []
-            for idx, (var, corr_value) in enumerate(top_corrs_for_column.items(), 1):
-                correlation_options.append(f"{selected_column} y {var}")
-                st.markdown(f"<p style='font-size: 1.1em; color: #003366;'><strong>{idx}.</strong> {selected_column} y {var}: <strong>{corr_value:.2f}</p>", unsafe_allow_html=True)
-                st.markdown(f"<p style='font-size: 0.9em; color: #555;'>{column_descriptions.get(selected_column, 'Descripción no disponible')}<br>{column_descriptions.get(var, 'Descripción no disponible')}</p>", unsafe_allow_html=True)
-
-            # Selección de correlación para graficar
-            selected_correlation = st.selectbox("Seleccione una correlación para graficar:", correlation_options)
-            var1, var2 = selected_correlation.split(" y ")
-
-            # Graficar la correlación seleccionada
-            st.markdown(f"<h4 style='color: #003366; text-align: center;'>Gráfico de {var1} vs {var2}</h4>", unsafe_allow_html=True)
-            fig_corr = px.scatter(filtered_data, x=var1, y=var2, trendline="ols", title=f"Correlación entre {var1} y {var2}")
-            st.plotly_chart(fig_corr, use_container_width=True)
+    # El contenido solo se calcula mientras el expander está abierto
+    correlation_section = st.expander("Correlaciones entre Variables", key="correlation_section", on_change="rerun")
+    with correlation_section:
+        if correlation_section.open:
+            if sales_parquet is None:
+                # Matriz sumando las particiones de los estadísticos que cumplen los filtros
+                render_correlation_section(
+                    lambda: correlation_stats.correlation(selection, {"Date": date_span}),
+                    lambda var1, var2: filtered_data
+                )
+            else:
+                # Matriz acumulando n, Σx y Σxy lote a lote sobre las filas filtradas del dataset
+                render_correlation_section(
+                    lambda: resources.query_sales_dataset(sales_parquet.version, "correlation", filter_args),
+                    lambda var1, var2: sales_parquet.sample(expression, [var1, var2], SAMPLE_ROWS)
+                )
 
     # --- Análisis de Ventas ---
     st.subheader("Análisis de Ventas")
@@ -138,22 +269,14 @@ else:
 
     with col1:
         st.markdown("<h4 style='color: #003366; text-align: center;'>Ventas por Género</h4>", unsafe_allow_html=True)
-        fig_gender = px.pie(
-            filtered_data, names='Gender', values='Total',
-            color_discrete_sequence=px.colors.sequential.RdBu
-        )
-        fig_gender.update_traces(textinfo="percent+label")
-        st.plotly_chart(fig_gender, use_container_width=True)
+        # Las ventas por género y método de pago ya vienen agregadas en el resumen: la clave es el agregado
+        fig_gender = cached_chart("gender", lambda: build_gender_chart(summary["gender"]), data=summary["gender"])
+        tracer.plotly_chart("gender", fig_gender, use_container_width=True)
 
     with col2:
         st.markdown("<h4 style='color: #003366; text-align: center;'>Ventas por Método de Pago</h4>", unsafe_allow_html=True)
-        fig_payment = px.bar(
-            filtered_data.groupby('Payment')['Total'].sum().reset_index(),
-            x='Payment', y='Total', color='Payment',
-            color_discrete_sequence=px.colors.qualitative.Set3
-        )
-        fig_payment.update_layout(xaxis_title="Método de Pago", yaxis_title="Total Ventas", height=350)
-        st.plotly_chart(fig_payment, use_container_width=True)
+        fig_payment = cached_chart("payment", lambda: build_payment_chart(summary["payment"]), data=summary["payment"])
+        tracer.plotly_chart("payment", fig_payment, use_container_width=True)
 
     # --- Análisis Multivariado ---
     st.subheader("Análisis Multivariado")
@@ -165,13 +288,8 @@ else:
             </p>
         </div>
     """, unsafe_allow_html=True)
-    fig_multi = px.scatter(
-        filtered_data, x='Unit price', y='Quantity', size='Total',
-        color='Product line', hover_name='Product line',
-        color_discrete_sequence=px.colors.sequential.Viridis
-    )
-    fig_multi.update_layout(xaxis_title="Precio Unitario", yaxis_title="Cantidad", height=400)
-    st.plotly_chart(fig_multi, use_container_width=True)
+    fig_multi = cached_chart("multivariate", lambda: build_multivariate_chart(multivariate_data()), filters=filter_state)
+    tracer.plotly_chart("multivariate", fig_multi, use_container_width=True)
 
     # --- Tabla Detallada ---
 
@@ -210,10 +328,45 @@ else:
         </div>
     """, unsafe_allow_html=True)
 
-    st.dataframe(
-        filtered_data[['Date', 'Branch', 'Gender', 'Product line', 'Total', 'Payment']].style.highlight_max(axis=0),
-        height=600
-    )
+    if sales_parquet is None:
+        # Las categorías se guardan en orden alfabético; marcarlas como ordenadas permite obtener su máximo
+        detail_table = filtered_data[TABLE_COLUMNS]
+        with tracer.span("aggregate:column_max"):
+            column_max = {
+                column: (series.cat.as_ordered() if isinstance(series.dtype, pd.CategoricalDtype) else series).max()
+                for column, series in detail_table.items()
+            }
+        table_base, table_key = sales, f"sales-{data_version}"
+    else:
+        # Los máximos se calculan sobre todo el dataset filtrado, pero la tabla solo recibe las primeras filas
+        with tracer.span("aggregate:column_max"):
+            column_max = resources.query_sales_dataset(
+                sales_parquet.version, "column_max", filter_args, tuple(TABLE_COLUMNS)
+            )
+        detail_table = resources.query_sales_dataset(
+            sales_parquet.version, "head", filter_args, tuple(TABLE_COLUMNS), TABLE_ROWS
+        )
+        table_base, table_key = detail_table, f"sales_dataset-{figure_key(data_version, filter_state)}"
+        if len(detail_table) < n_rows:
+            st.caption(f"Se muestran las primeras {len(detail_table):,} de {n_rows:,} ventas filtradas.")
+
+    # Los máximos se calculan sobre todas las filas filtradas y se resaltan en la ventana visible
+    with tracer.span("table"):
+        paginated_table(
+            table_base,
+            detail_table,
+            key="sales_table",
+            dataset_key=table_key,
+            style_fn=lambda window: window.style.apply(styling.highlight_values, axis=None, targets=column_max),
+            height=600
+        )
+
+    # Exportar todas las ventas filtradas en bloques; con el dataset Parquet se exporta lote a lote desde el escaneo
+    if sales_parquet is None:
+        export_chunks = lambda: export.frame_chunks(filtered_data[EXPORT_COLUMNS])
+    else:
+        export_chunks = lambda: sales_parquet.chunks(expression, EXPORT_COLUMNS)
+    export.export_controls("sales_export", "ventas_filtradas", EXPORT_COLUMNS, export_chunks)
 
     # Explicación del criterio de pintado
     st.markdown("""
@@ -1,7 +1,16 @@
 import streamlit as st
 
+from utils import telemetry, warmup
+
 # utilizamos todo el anchura de la página
 st.set_page_config(layout="wide")
+
+# Endpoint /metrics de Prometheus con los tiempos por sección de los dashboards
+telemetry.start_metrics_server()
+
+# Precalentar en segundo plano los datos e índices de todas las páginas (una vez por proceso;
+# servido con app.py ya se lanzó al arrancar el servidor y aquí solo se recupera su estado)
+warmup_status = warmup.start_warmup()
 # --- PAGE SETUP ---
 about_page = st.Page(
     page ="views/about.py",
@@ -43,5 +52,7 @@ pg = st.navigation(
 
 st.logo("assets/logo4.png")
 st.sidebar.title("Navigation")
+if warmup_status.state == "running":
+    st.sidebar.caption("Preparando los datos de los dashboards…")
 
 pg.run()
\ No newline at end of file
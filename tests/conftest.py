@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def unicorns():
+    """Compañías sintéticas con las columnas de dashboard01; "Africa" solo tiene compañías de Fintech."""
+    rng = np.random.default_rng(25)
+    n_rows = 300
+    frame = pd.DataFrame({
+        "Company": [f"Company {i}" for i in range(n_rows)],
+        "Year Founded": rng.integers(2000, 2016, n_rows),
+        "Continent": rng.choice(["Asia", "Europe", "North America"], n_rows),
+        "Industry": rng.choice(["Artificial Intelligence", "Fintech", "Health"], n_rows),
+        "Country": rng.choice(["China", "France", "India", "Spain", "USA", "Canada", "Japan"], n_rows),
+        "Funding": rng.random(n_rows).round(3),
+        "Valuation": (rng.random(n_rows) * 10).round(3),
+    })
+    frame.loc[:9, ["Continent", "Industry", "Country"]] = ["Africa", "Fintech", "Nigeria"]
+    return frame.astype({"Continent": "category", "Industry": "category", "Country": "category"})
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.bitmap_index import BitmapIndex
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(3)
+    n_rows = 1003  # No múltiplo de 8: el último byte del bitmap queda a medias
+    return pd.DataFrame({
+        "Continent": pd.Categorical(rng.choice(["Asia", "Europe", "Oceania", None], n_rows)),
+        "Industry": pd.Categorical(rng.choice(["AI", "Fintech", "Health"], n_rows)),
+        "Year Founded": rng.integers(1990, 2021, n_rows),
+        "Score": rng.choice([1.0, 2.0, np.nan], n_rows),
+    })
+
+
+def _brute_force(frame, selection):
+    mask = np.ones(len(frame), dtype=bool)
+    for column, values in selection.items():
+        mask &= frame[column].isin(list(values)).to_numpy()
+    return mask
+
+
+@pytest.mark.parametrize("selection", [
+    {},
+    {"Continent": ["Asia"]},
+    {"Continent": ["Asia", "Europe"], "Industry": ["AI"]},
+    {"Continent": ["Oceania"], "Industry": ["Health", "Fintech"], "Year Founded": range(2000, 2011)},
+    {"Score": [1.0]},
+    {"Continent": []},
+    {"Industry": ["Unknown"]},
+])
+def test_select_matches_isin(data, selection):
+    index = BitmapIndex(data, ["Continent", "Industry", "Year Founded", "Score"])
+    np.testing.assert_array_equal(index.select(selection), _brute_force(data, selection))
+
+
+def test_rows_with_null_keys_only_match_without_filter(data):
+    index = BitmapIndex(data, ["Continent"])
+    all_continents = index.select({"Continent": index.values("Continent")})
+    np.testing.assert_array_equal(all_continents, data["Continent"].notna().to_numpy())
+    assert index.select({}).all()
+
+
+def test_values_between_and_memo(data):
+    index = BitmapIndex(data, ["Year Founded"], memo_size=1)
+    years = index.values_between("Year Founded", 2000, 2005)
+    assert sorted(years) == sorted(set(data["Year Founded"][data["Year Founded"].between(2000, 2005)]))
+
+    first = index.select({"Year Founded": years})
+    assert index.select({"Year Founded": years}) is first
+    assert not first.flags.writeable
+    index.select({"Year Founded": [2010]})
+    # Con memo_size=1 la selección anterior ya fue expulsada y se vuelve a calcular igual
+    again = index.select({"Year Founded": years})
+    assert again is not first
+    np.testing.assert_array_equal(again, first)
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pandas.testing as tm
+import pytest
+from scipy import stats
+
+from utils import datasets
+from utils.corr_stats import CorrelationStats, correlation_matrix
+
+PARTITIONS = ["Branch", "Gender", "Payment", "Date"]
+
+
+@pytest.fixture(scope="module")
+def sales():
+    return datasets.build_sales(datasets.SALES_CSV)
+
+
+@pytest.fixture(scope="module")
+def numeric(sales):
+    return sales.select_dtypes("number").columns
+
+
+@pytest.fixture(scope="module")
+def correlation_stats(sales, numeric):
+    return CorrelationStats(sales, PARTITIONS, numeric)
+
+
+SELECTIONS = [
+    ({}, {}),
+    ({"Branch": ["A"]}, {}),
+    ({"Gender": ["Female"], "Payment": ["Cash", "Ewallet"]}, {"Date": ("2019-02-01", "2019-02-28")}),
+    ({"Branch": ["B", "C"]}, {"Date": ("2019-03-10", "2019-03-10")}),
+]
+
+
+@pytest.mark.parametrize("selection, ranges", SELECTIONS)
+def test_matches_pandas_corr(sales, numeric, correlation_stats, selection, ranges):
+    mask = np.ones(len(sales), dtype=bool)
+    for column, values in selection.items():
+        mask &= sales[column].isin(values).to_numpy()
+    ranges = {column: (pd.Timestamp(low), pd.Timestamp(high)) for column, (low, high) in ranges.items()}
+    for column, (low, high) in ranges.items():
+        mask &= sales[column].between(low, high).to_numpy()
+
+    got = correlation_stats.correlation(selection, ranges)
+    tm.assert_frame_equal(got, sales.loc[mask, numeric].corr(), check_exact=False, atol=1e-10)
+
+
+def test_pairs_match_scipy_pearsonr(sales, correlation_stats):
+    branch = sales[sales["Branch"] == "C"]
+    got = correlation_stats.correlation({"Branch": ["C"]})
+    for x, y in [("Unit price", "Total"), ("Quantity", "cogs"), ("Rating", "gross income")]:
+        expected = stats.pearsonr(branch[x], branch[y])
+        assert got.loc[x, y] == pytest.approx(expected.statistic, abs=1e-10)
+
+
+def test_empty_selection_is_all_nan(correlation_stats, numeric):
+    got = correlation_stats.correlation({"Branch": ["Z"]})
+    assert got.shape == (len(numeric), len(numeric))
+    assert got.isna().all().all()
+
+
+def test_constant_column_is_nan_like_pandas():
+    frame = pd.DataFrame({"x": [1.0, 2.0, 4.0, 8.0], "y": [3.0, 1.0, 2.0, 0.5], "flat": [5.0] * 4})
+    n = len(frame)
+    values = frame.to_numpy()
+    got = correlation_matrix(n, values.sum(axis=0), values.T @ values, list(frame.columns))
+    tm.assert_frame_equal(got, frame.corr(), check_exact=False, atol=1e-12)
@@ -0,0 +1,66 @@
+import os
+
+import pandas as pd
+import pandas.testing as tm
+
+from utils import data_store
+
+
+def _write_csv(path, frame):
+    frame.to_csv(path, index=False)
+    return str(path)
+
+
+def _counting_builder(calls):
+    def build(path):
+        calls.append(path)
+        return pd.read_csv(path, dtype={"city": "category"})
+    return build
+
+
+def test_load_cached_matches_pandas_and_builds_once(tmp_path):
+    source = _write_csv(tmp_path / "data.csv", pd.DataFrame({"city": ["A", "B", None], "value": [1.5, None, 3.0]}))
+    calls = []
+    cold = data_store.load_cached("data", source, _counting_builder(calls), cache_dir=str(tmp_path / "cache"))
+    warm = data_store.load_cached("data", source, _counting_builder(calls), cache_dir=str(tmp_path / "cache"))
+
+    expected = pd.read_csv(source, dtype={"city": "category"})
+    tm.assert_frame_equal(cold, expected)
+    tm.assert_frame_equal(warm, expected)
+    assert len(calls) == 1
+
+
+def test_load_cached_rebuilds_when_content_or_version_changes(tmp_path):
+    source = _write_csv(tmp_path / "data.csv", pd.DataFrame({"city": ["A"], "value": [1.0]}))
+    cache_dir = str(tmp_path / "cache")
+    calls = []
+    data_store.load_cached("data", source, _counting_builder(calls), cache_dir=cache_dir)
+    first_version = data_store.cache_version("data", cache_dir)
+
+    _write_csv(source, pd.DataFrame({"city": ["A", "B"], "value": [1.0, 2.0]}))
+    changed = data_store.load_cached("data", source, _counting_builder(calls), cache_dir=cache_dir)
+    assert len(calls) == 2
+    assert len(changed) == 2
+    assert data_store.cache_version("data", cache_dir) != first_version
+
+    data_store.load_cached("data", source, _counting_builder(calls), version=2, cache_dir=cache_dir)
+    assert len(calls) == 3
+    assert data_store.cache_version("data", cache_dir).startswith("2-")
+
+
+def test_touch_without_changes_does_not_rebuild(tmp_path):
+    source = _write_csv(tmp_path / "data.csv", pd.DataFrame({"city": ["A"], "value": [1.0]}))
+    cache_dir = str(tmp_path / "cache")
+    calls = []
+    data_store.load_cached("data", source, _counting_builder(calls), cache_dir=cache_dir)
+    version = data_store.cache_version("data", cache_dir)
+
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    data_store.load_cached("data", source, _counting_builder(calls), cache_dir=cache_dir)
+    assert len(calls) == 1
+    assert data_store.cache_version("data", cache_dir) == version
+
+
+def test_cache_version_is_none_without_cache(tmp_path):
+    assert data_store.cache_version("missing", str(tmp_path)) is None
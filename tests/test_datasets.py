@@ -0,0 +1,70 @@
+import pandas as pd
+import pytest
+
+from utils import datasets
+
+PORTS_CSV = """\
+Country,Port Name,UN Code,Vessels in Port,Departures(Last 24 Hours),Arrivals(Last 24 Hours),Expected Arrivals,Type,Area Local,Area Global,Also known as,Unused
+Chile,VALPARAISO,CLVAP,12,3,4,1,Port,Chile,West Coast South America,"['VALPO', ' -']",x
+Chile,SAN ANTONIO,CLSAI,,,,,Port,Chile,West Coast South America,,x
+Spain,PUERTO BANUS,,2,0,1,0,Marina,Spain,West Mediterranean,MARBELLA,x
+"""
+
+SALES_CSV = """\
+Invoice ID,Branch,City,Customer type,Gender,Product line,Unit price,Quantity,Tax 5%,Total,Date,Time,Payment,cogs,gross margin percentage,gross income,Rating
+750-67-8428,A,Yangon,Member,Female,Health and beauty,74.69,7,26.1415,548.9715,1/5/2019,13:08,Ewallet,522.83,4.76,26.1415,9.1
+226-31-3081,C,Naypyitaw,Normal,Female,Electronic accessories,15.28,5,3.82,80.22,2019-03-08,10:29,Cash,76.4,4.76,3.82,9.6
+"""
+
+
+def _write(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content)
+    return str(path)
+
+
+@pytest.fixture
+def ports(tmp_path):
+    return datasets.build_ports(_write(tmp_path, "ports.csv", PORTS_CSV))
+
+
+@pytest.fixture
+def sales(tmp_path):
+    return datasets.build_sales(_write(tmp_path, "sales.csv", SALES_CSV))
+
+
+def test_ports_follow_the_schema(ports):
+    # Solo las columnas declaradas, en su orden, con los tipos de texto y categoría del esquema
+    assert list(ports.columns) == datasets.PORTS_SCHEMA["usecols"]
+    for column in ["Country", "Type", "Area Local", "Area Global"]:
+        assert isinstance(ports[column].dtype, pd.CategoricalDtype)
+    assert ports["Port Name"].dtype == "string"
+    assert ports["Type"].cat.categories.tolist() == ["Marina", "Port"]
+
+
+def test_ports_counts_and_aliases(ports):
+    # Los conteos vacíos se leen como float y quedan en 0 como enteros
+    assert ports["Vessels in Port"].tolist() == [12, 0, 2]
+    assert ports["Arrivals(Last 24 Hours)"].dtype == "int64"
+    assert ports["Also known as"].tolist()[0] == "VALPO"
+    assert pd.isna(ports["UN Code"].iloc[2])
+    # Un valor que no es una lista serializada se toma como un único alias
+    assert ports["Also known as"].iloc[2] == "MARBELLA"
+
+
+def test_sales_dates_use_the_declared_format(sales):
+    assert sales["Date"].iloc[0] == pd.Timestamp("2019-01-05")
+    # Una fecha en otro formato no se adivina: queda como NaT
+    assert pd.isna(sales["Date"].iloc[1])
+    assert sales["Quantity"].dtype == "int64"
+    assert sales["Income"].tolist() == pytest.approx([548.9715 - 26.1415, 80.22 - 3.82])
+
+
+@pytest.mark.parametrize("value, aliases", [
+    ("['SHANG HAI', ' YANGSHAN']", ["SHANG HAI", "YANGSHAN"]),
+    ("['-', ' ']", []),
+    ("['NAN TONG'", ["['NAN TONG'"]),
+    (None, []),
+])
+def test_parse_aliases(value, aliases):
+    assert datasets.parse_aliases(value) == aliases
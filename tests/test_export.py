@@ -0,0 +1,84 @@
+import io
+import os
+
+import numpy as np
+import pandas as pd
+import pandas.testing as tm
+import pytest
+from streamlit.runtime.download_data_util import convert_data_to_bytes_and_infer_mime
+
+from utils import export
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(24)
+    n_rows = 1050
+    return pd.DataFrame({
+        "Port Name": pd.array(rng.choice(["SHANGHAI", "VALPARAISO", None], n_rows), dtype="string"),
+        "Type": pd.Categorical(rng.choice(["Port", "Marina"], n_rows)),
+        "Arrivals": rng.choice([1.0, 2.0, np.nan], n_rows),
+        "Count": rng.integers(0, 100, n_rows),
+    })
+
+
+def test_frame_chunks_cover_every_row_once(frame):
+    chunks = list(export.frame_chunks(frame, chunk_rows=100))
+    assert [len(chunk) for chunk in chunks] == [100] * 10 + [50]
+    tm.assert_frame_equal(pd.concat(chunks), frame)
+    assert list(export.frame_chunks(frame.iloc[:0], chunk_rows=100)) == []
+
+
+def test_csv_export_matches_to_csv(frame):
+    file = export.export_file(export.frame_chunks(frame, chunk_rows=100), "csv", frame.columns)
+    assert file.read().decode() == frame.to_csv(index=False)
+
+
+def test_parquet_export_round_trips(frame):
+    file = export.export_file(export.frame_chunks(frame, chunk_rows=100), "parquet", frame.columns)
+    tm.assert_frame_equal(pd.read_parquet(io.BytesIO(file.read())), frame)
+
+
+@pytest.mark.parametrize("extension", ["csv", "parquet"])
+def test_empty_selection_exports_only_the_columns(frame, extension):
+    file = export.export_file(export.frame_chunks(frame.iloc[:0]), extension, frame.columns)
+    read = pd.read_csv if extension == "csv" else pd.read_parquet
+    result = read(io.BytesIO(file.read()))
+    assert result.empty
+    assert list(result.columns) == list(frame.columns)
+
+
+@pytest.mark.parametrize("export_format", list(export.EXPORT_FORMATS))
+def test_download_button_accepts_the_export(frame, export_format):
+    # Lo mismo que hace st.download_button con el resultado de la función diferida
+    extension, _ = export.EXPORT_FORMATS[export_format]
+    file = export.export_file(export.frame_chunks(frame, chunk_rows=100), extension, frame.columns)
+    data, _ = convert_data_to_bytes_and_infer_mime(file, TypeError("formato no soportado"))
+    read = pd.read_csv if extension == "csv" else pd.read_parquet
+    expected = frame if extension == "parquet" else pd.read_csv(io.StringIO(frame.to_csv(index=False)))
+    tm.assert_frame_equal(read(io.BytesIO(data)), expected)
+
+
+def test_static_asset_is_read_once_per_file_version(tmp_path, monkeypatch):
+    from utils import resources
+
+    opened = []
+
+    def counting_open(path, mode="r"):
+        opened.append(path)
+        return open(path, mode)
+
+    monkeypatch.setattr(resources, "open", counting_open, raising=False)
+    report = tmp_path / "report.pdf"
+    report.write_bytes(b"%PDF-1.4 primera")
+
+    assert resources.static_asset(str(report)) == b"%PDF-1.4 primera"
+    assert resources.static_asset(str(report)) == b"%PDF-1.4 primera"
+    assert len(opened) == 1
+
+    # Un reporte reemplazado (otro mtime) se vuelve a leer
+    report.write_bytes(b"%PDF-1.4 segunda")
+    os.utime(report, ns=(1, 1))
+    assert resources.static_asset(str(report)) == b"%PDF-1.4 segunda"
+    assert len(opened) == 2
+    assert resources.static_asset(str(tmp_path / "missing.pdf")) is None
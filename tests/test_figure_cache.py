@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+
+from utils import figure_cache
+from utils.figure_cache import FigureCache, cached_figure, figure_key
+
+
+@pytest.fixture
+def figures(monkeypatch):
+    # Caché nueva para cada prueba, en lugar de la compartida por el proceso
+    cache = FigureCache()
+    monkeypatch.setattr(figure_cache, "get_figure_cache", lambda: cache)
+    return cache
+
+
+def _counting_builder(builds):
+    def build():
+        builds.append(1)
+        return go.Figure(go.Bar(x=["A", "B"], y=[1, len(builds)]))
+    return build
+
+
+def test_dataframe_key_uses_the_whole_content():
+    frame = pd.DataFrame({"Country": [f"C{i}" for i in range(500)], "Valuation": np.arange(500.0)})
+    changed = frame.copy()
+    changed.loc[250, "Valuation"] = -1.0
+    # El repr de pandas omite las filas del medio: no sirve como clave
+    assert repr(frame) == repr(changed)
+    assert figure_key("top5", frame) == figure_key("top5", frame.copy())
+    assert figure_key("top5", frame) != figure_key("top5", changed)
+
+
+def test_dataframe_key_depends_on_column_names():
+    frame = pd.DataFrame({"a": [1, 2, 3]})
+    assert figure_key(frame) != figure_key(frame.rename(columns={"a": "b"}))
+    assert figure_key(frame["a"]) != figure_key(frame["a"].rename("b"))
+
+
+def test_key_ignores_the_order_of_inputs():
+    assert figure_key({"types": ["Port"], "countries": ["Chile"]}) == figure_key(
+        {"countries": ["Chile"], "types": ["Port"]}
+    )
+
+
+def test_hit_rebuilds_the_figure_from_json(figures):
+    figure = go.Figure(go.Scatter(x=[1, 2, 3], y=[3, 1, 2], name="ventas"))
+    figures.put("k", figure, cost=0.5)
+    got = figures.get("k")
+    assert got is not figure
+    assert got.to_json() == figure.to_json()
+    assert figures.get("missing") is None
+
+
+def test_unrelated_inputs_do_not_rebuild(figures):
+    builds = []
+    build = _counting_builder(builds)
+    filters = {"types": ["Port"], "countries": ["Chile"]}
+    cached_figure("dashboard02", "country", "v1", build, filters=filters)
+    # La misma entrada, aunque la página tenga otros filtros o eventos nuevos fuera de `inputs`
+    cached_figure("dashboard02", "country", "v1", build, filters=dict(filters))
+    assert len(builds) == 1
+    assert (figures.hits, figures.misses) == (1, 1)
+
+
+@pytest.mark.parametrize("change", [
+    {"chart_id": "type"},
+    {"version": "v2"},
+    {"inputs": {"filters": {"types": ["Harbor"], "countries": ["Chile"]}}},
+    {"inputs": {"filters": {"types": ["Port"], "countries": ["Chile"]}, "types": ["Port"]}},
+])
+def test_used_inputs_rebuild(figures, change):
+    builds = []
+    build = _counting_builder(builds)
+    base = {"chart_id": "country", "version": "v1", "inputs": {"filters": {"types": ["Port"], "countries": ["Chile"]}}}
+    changed = {**base, **change}
+    for args in (base, changed):
+        cached_figure("dashboard02", args["chart_id"], args["version"], build, **args["inputs"])
+    assert len(builds) == 2
+
+
+def test_small_frame_as_input(figures):
+    builds = []
+    build = _counting_builder(builds)
+    top = pd.DataFrame({"Company": ["Bytedance", "SpaceX"], "Valuation": [180.0, 100.0]})
+    cached_figure("dashboard01", "top5", "v1", build, data=top)
+    cached_figure("dashboard01", "top5", "v1", build, data=top.copy())
+    cached_figure("dashboard01", "top5", "v1", build, data=top.assign(Valuation=[180.0, 137.0]))
+    assert len(builds) == 2
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.filters import category_options, isin_codes, observed_counts
+
+PAYMENTS = ["Ewallet", "Cash", "Credit card", None, "Cash", "Ewallet", None, "Credit card"]
+
+
+@pytest.fixture(params=["category", "string", "object"])
+def payments(request):
+    return pd.Series(PAYMENTS, dtype=request.param)
+
+
+@pytest.mark.parametrize("selected", [
+    ["Cash"],
+    ["Cash", "Ewallet"],
+    ["Credit card", "Bitcoin"],
+    ["Bitcoin"],
+    [],
+])
+def test_isin_codes_matches_isin(payments, selected):
+    expected = pd.Series(PAYMENTS, dtype="object").isin(selected).to_numpy()
+    np.testing.assert_array_equal(isin_codes(payments, selected), expected)
+
+
+def test_nulls_never_match():
+    # Un nulo tiene código -1: cae en la posición extra de la tabla, que siempre es False
+    payments = pd.Series(PAYMENTS, dtype="category")
+    assert payments.cat.codes.tolist()[3] == -1
+    assert not isin_codes(payments, payments.cat.categories)[[3, 6]].any()
+
+
+def test_accepts_any_iterable_of_values():
+    payments = pd.Series(PAYMENTS, dtype="category")
+    np.testing.assert_array_equal(isin_codes(payments, {"Cash"}), isin_codes(payments, ("Cash",)))
+
+
+def test_options_come_from_the_categories():
+    branches = pd.Series(pd.Categorical(["C", "A", "C"], categories=["A", "B", "C"]))
+    # Las categorías declaradas se listan aunque no haya filas con ellas
+    assert category_options(branches) == ["A", "B", "C"]
+    assert category_options(pd.Series(["C", "A", None, "C"])) == ["A", "C"]
+
+
+def test_observed_counts_drop_empty_categories():
+    types = pd.Series(pd.Categorical(["Port", "Port", "Marina"], categories=["Anchorage", "Marina", "Port"]))
+    assert observed_counts(types).to_dict() == {"Port": 2, "Marina": 1}
+    assert observed_counts(types.iloc[:0]).empty
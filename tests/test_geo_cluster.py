@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pandas.testing as tm
+import pytest
+
+from utils.geo_cluster import CELLS_PER_TILE, GridClusters
+
+
+def _reference_clusters(data, zoom):
+    """Clusters calculados fila a fila con pandas: celda, centroide, conteo, suma y país más frecuente."""
+    cell_size = 360 / 2 ** zoom / CELLS_PER_TILE
+    located = data.dropna(subset=["Latitude", "Longitude"])
+    cells = located.assign(
+        row=np.floor((located["Latitude"] + 90) / cell_size).astype(int),
+        col=np.floor((located["Longitude"] + 180) / cell_size).astype(int),
+    )
+    clusters = []
+    for _, cell in cells.groupby(["row", "col"], sort=True):
+        # Empates: gana el país que va primero alfabéticamente
+        countries = cell["Country"].dropna().value_counts()
+        dominant = sorted(countries[countries == countries.max()].index)[0] if len(countries) else None
+        clusters.append({
+            "latitude": cell["Latitude"].mean(),
+            "longitude": cell["Longitude"].mean(),
+            "Count": len(cell),
+            "Valuation": cell["Valuation"].fillna(0).sum(),
+            "Country": dominant,
+        })
+    return pd.DataFrame(clusters, columns=["latitude", "longitude", "Count", "Valuation", "Country"])
+
+
+@pytest.fixture
+def edges():
+    # Puntos sobre los bordes de las celdas: a zoom 0 cada celda mide 45°, a zoom 1 22.5°
+    return pd.DataFrame({
+        "Latitude": [0.0, 0.0, 0.0, 10.0, -90.0, np.nan],
+        "Longitude": [0.0, 44.9, 45.0, 10.0, -180.0, 5.0],
+        "Valuation": [1.0, 2.0, 4.0, 8.0, 16.0, 32.0],
+        "Country": ["Spain", "France", "France", "Chile", "Chile", "Peru"],
+    })
+
+
+@pytest.mark.parametrize("zoom, counts", [
+    (0, [1, 3, 1]),
+    (1, [1, 2, 1, 1]),
+    # A zoom 2 (11.25°) (0, 0) y (10, 10) siguen juntos; a zoom 3 (5.625°) ya no
+    (2, [1, 2, 1, 1]),
+    (3, [1, 1, 1, 1, 1]),
+])
+def test_cluster_counts_at_cell_edges(edges, zoom, counts):
+    clusters = GridClusters(edges, zoom_levels=[zoom])
+    got = clusters.clusters_for(zoom)
+    assert got["Count"].tolist() == counts
+    assert clusters.n_cells[zoom] == len(counts)
+    # La fila sin coordenadas no se cuenta en ningún cluster
+    assert got["Count"].sum() == 5
+
+
+def test_zoom_0_clusters_by_hand(edges):
+    got = GridClusters(edges, zoom_levels=[0]).clusters_for(0)
+    # (0, 0), (0, 44.9) y (10, 10) comparten la celda [0°, 45°) × [0°, 45°); (0, 45) abre la siguiente
+    middle = got.iloc[1]
+    assert middle["Count"] == 3
+    assert middle["Valuation"] == 11.0
+    assert middle["latitude"] == pytest.approx(10 / 3)
+    assert middle["longitude"] == pytest.approx(54.9 / 3)
+    # Empate 1-1-1: gana el primer país en orden alfabético
+    assert middle["Country"] == "Chile"
+
+
+@pytest.mark.parametrize("zoom", [0, 3, 6, 9, 12])
+def test_clusters_match_reference(unicorn_locations, zoom):
+    clusters = GridClusters(unicorn_locations)
+    tm.assert_frame_equal(clusters.clusters_for(zoom), _reference_clusters(unicorn_locations, zoom),
+                          check_dtype=False)
+
+    mask = (unicorn_locations["Valuation"] > 4).to_numpy()
+    tm.assert_frame_equal(clusters.clusters_for(zoom, mask), _reference_clusters(unicorn_locations[mask], zoom),
+                          check_dtype=False)
+
+
+def test_zoom_for_budget(unicorn_locations):
+    clusters = GridClusters(unicorn_locations)
+    n_cells = clusters.n_cells
+    assert all(n_cells[zoom] <= n_cells[zoom + 1] for zoom in range(12))
+    # Un presupuesto igual al número de celdas de un nivel lo admite; uno menos ya no
+    zoom = clusters.zoom_for_budget(n_cells[5])
+    assert n_cells[zoom] <= n_cells[5] and (zoom == 12 or n_cells[zoom + 1] > n_cells[5])
+    assert clusters.zoom_for_budget(n_cells[0] - 1) == 0
+
+
+@pytest.fixture
+def unicorn_locations(unicorns):
+    rng = np.random.default_rng(7)
+    located = unicorns.assign(
+        # Coordenadas agrupadas en pocas ciudades para que haya celdas con varias compañías
+        Latitude=rng.choice([40.4, 48.85, 35.68, -33.45], len(unicorns)) + rng.normal(0, 0.5, len(unicorns)),
+        Longitude=rng.choice([-3.7, 2.35, 139.7, -70.66], len(unicorns)) + rng.normal(0, 0.5, len(unicorns)),
+    )
+    located.loc[::37, "Latitude"] = np.nan
+    located.loc[::11, "Valuation"] = np.nan
+    return located
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.hierarchy_index import HierarchyIndex
+
+LEVELS = ["Country", "Area Global", "Area Local", "Type"]
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(10)
+    n_rows = 400
+    frame = pd.DataFrame({
+        "Country": rng.choice(["Chile", "China", "Spain", "USA"], n_rows),
+        "Area Global": rng.choice(["North", "South"], n_rows),
+        "Area Local": rng.choice(["Bay", "Gulf", "Strait"], n_rows),
+        "Type": rng.choice(["Port", "Anchorage", "Marina"], n_rows),
+    }).astype("category")
+    # Filas con algún nivel nulo, incluido el país (quedan en las hojas del final)
+    for column in LEVELS:
+        frame.loc[rng.choice(n_rows, 12, replace=False), column] = np.nan
+    return frame
+
+
+def _cascade(frame, countries, global_areas, local_areas, types):
+    # Mismos filtros que la versión original de dashboard02, con máscaras isin sobre la tabla
+    subset = frame[frame["Country"].isin(countries) & frame["Type"].isin(types)] if countries else frame
+    if global_areas:
+        subset = subset[subset["Area Global"].isin(global_areas)]
+    if local_areas:
+        subset = subset[subset["Area Local"].isin(local_areas)]
+    return subset[subset["Type"].isin(types)]
+
+
+def _index_cascade(index, countries, global_areas, local_areas, types):
+    leaves = index.restrict(index.leaves_for(countries), "Type", types) if countries else index.leaves_for([])
+    if global_areas:
+        leaves = index.restrict(leaves, "Area Global", global_areas)
+    if local_areas:
+        leaves = index.restrict(leaves, "Area Local", local_areas)
+    return index.rows(index.restrict(leaves, "Type", types))
+
+
+def test_unfiltered_rows_keep_null_levels(data):
+    index = HierarchyIndex(data, LEVELS)
+    np.testing.assert_array_equal(index.rows(index.all_leaves), np.arange(len(data)))
+    assert index.leaves["n_rows"].sum() == len(data)
+
+
+@pytest.mark.parametrize("countries, global_areas, local_areas, types", [
+    ([], [], [], ["Anchorage", "Marina", "Port"]),
+    (["Chile"], [], [], ["Anchorage", "Marina", "Port"]),
+    (["China", "USA"], ["North"], [], ["Port"]),
+    ([], ["South"], ["Bay", "Strait"], ["Marina", "Port"]),
+    (["Spain"], [], ["Gulf"], []),
+    (["Atlantis"], [], [], ["Port"]),
+])
+def test_cascade_matches_isin_masks(data, countries, global_areas, local_areas, types):
+    index = HierarchyIndex(data, LEVELS)
+    expected = _cascade(data, countries, global_areas, local_areas, types)
+    got = _index_cascade(index, countries, global_areas, local_areas, types)
+    np.testing.assert_array_equal(got, np.flatnonzero(data.index.isin(expected.index)))
+
+
+def test_options_skip_nulls(data):
+    index = HierarchyIndex(data, LEVELS)
+    leaves = index.leaves_for(["China"])
+    expected = sorted(data.loc[data["Country"] == "China", "Area Global"].dropna().unique())
+    assert index.options(leaves, "Area Global") == expected
+    assert index.options(index.all_leaves, "Country") == ["Chile", "China", "Spain", "USA"]
+    assert index.options(index.leaves_for(["Atlantis"]), "Area Local") == []
+    assert len(index.rows(index.leaves_for(["Atlantis"]))) == 0
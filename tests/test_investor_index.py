@@ -0,0 +1,91 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.investor_index import InvestorIndex
+
+FUNDS = ["Accel", "Tiger Global", "SoftBank Group", "Index Ventures", "Insight Partners", "Y Combinator",
+         "Ribbit", "General Catalyst"]
+
+
+def _contains_filter(investors, selected):
+    # Filtro original de la página: subcadena en 'Select Investors' para cada inversionista elegido
+    mask = np.zeros(len(investors), dtype=bool)
+    for investor in selected:
+        mask |= investors.str.contains(investor, regex=False).to_numpy(dtype=bool, na_value=False)
+    return mask
+
+
+def _portfolios(investors):
+    # Compañías (posiciones) de cada inversionista, recorriendo las cadenas una por una
+    portfolios = {}
+    for position, value in enumerate(investors):
+        if pd.isna(value):
+            continue
+        for name in {token.strip() for token in value.split(",")} - {""}:
+            portfolios.setdefault(name, set()).add(position)
+    return portfolios
+
+
+@pytest.fixture
+def investors():
+    rng = np.random.default_rng(20)
+    values = [", ".join(rng.choice(FUNDS, rng.integers(1, 4), replace=False)) for _ in range(400)]
+    values[3] = None
+    values[7] = ""
+    values[11] = "Accel,Accel ,  Ribbit"
+    return pd.Series(values, dtype="string")
+
+
+@pytest.mark.parametrize("selected", [
+    ["Accel"],
+    ["Tiger Global", "Y Combinator"],
+    FUNDS,
+    [],
+    ["Unknown Capital"],
+])
+def test_companies_mask_matches_str_contains(investors, selected):
+    index = InvestorIndex(investors)
+    np.testing.assert_array_equal(index.companies_mask(selected), _contains_filter(investors, selected))
+
+
+def test_names_are_matched_whole_not_as_substrings():
+    investors = pd.Series(["Sequoia Capital China", "Sequoia Capital, Accel", "Accel"], dtype="string")
+    index = InvestorIndex(investors)
+    # `str.contains` también marcaría "Sequoia Capital China"; el índice compara el nombre completo
+    assert _contains_filter(investors, ["Sequoia Capital"]).tolist() == [True, True, False]
+    assert index.companies_mask(["Sequoia Capital"]).tolist() == [False, True, False]
+    assert index.options() == ["Accel", "Sequoia Capital", "Sequoia Capital China"]
+
+
+def test_top_by_valuation_matches_portfolios(investors):
+    index = InvestorIndex(investors)
+    valuation = np.linspace(1, 40, len(investors))
+    valuation[::9] = np.nan
+    company_mask = np.arange(len(investors)) % 3 != 0
+
+    got = index.top_by_valuation(valuation, company_mask, top_n=5)
+    expected = sorted(
+        ((name, sum(np.nan_to_num(valuation[p]) for p in rows if company_mask[p]),
+          sum(1 for p in rows if company_mask[p])) for name, rows in _portfolios(investors).items()),
+        key=lambda item: -item[1],
+    )[:5]
+    assert got["Investor"].tolist() == [name for name, _, _ in expected]
+    assert got["Companies"].tolist() == [count for _, _, count in expected]
+    np.testing.assert_allclose(got["Portfolio Valuation"], [total for _, total, _ in expected])
+
+
+def test_co_investment_pairs_match_brute_force(investors):
+    index = InvestorIndex(investors)
+    company_mask = np.arange(len(investors)) < 250
+    portfolios = {name: {p for p in rows if company_mask[p]} for name, rows in _portfolios(investors).items()}
+    shared = {
+        pair: len(portfolios[pair[0]] & portfolios[pair[1]])
+        for pair in itertools.combinations(sorted(portfolios), 2)
+    }
+    got = index.co_investment_pairs(company_mask, top_n=len(shared))
+    got_pairs = {(a, b): n for a, b, n in got.itertuples(index=False)}
+    assert got_pairs == {pair: n for pair, n in shared.items() if n}
+    assert got["Shared Companies"].is_monotonic_decreasing
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.ngram_index import NgramIndex, ngrams, normalize
+
+
+@pytest.fixture
+def ports():
+    return pd.DataFrame({
+        "Port Name": ["SHANGHAI", "SHANTOU", "SINGAPORE", "SANTOS", "SAN ANTONIO", "VALPARAÍSO", "ROTTERDAM", "RIO GRANDE"],
+        "UN Code": ["CNSHA", "CNSWA", "SGSIN", "BRSSZ", None, "CLVAP", "NLRTM", "BRRIG"],
+        "Also known as": ["Yangshan;Wusong", None, "Keppel", "", "San Antonio de Chile", "Valpo", None, "Rio Grande do Sul"],
+    })
+
+
+def _brute_force(data, query, limit=10, min_score=0.2):
+    # Puntaje de cada clave contra la consulta, sin índice invertido, y mejor clave por fila
+    query = normalize(query)
+    query_grams = ngrams(query)
+    records = []
+    for column, separator in [("Port Name", None), ("UN Code", None), ("Also known as", ";")]:
+        for row, value in enumerate(data[column]):
+            if pd.isna(value):
+                continue
+            for key in (value.split(separator) if separator else [value]):
+                if key:
+                    records.append((row, normalize(key)))
+    scored = []
+    for key_id, (row, key) in enumerate(records):
+        key_grams = ngrams(key)
+        shared = len(query_grams & key_grams)
+        if not shared:
+            continue
+        score = shared / len(query_grams | key_grams) + 0.5 * key.startswith(query) + 0.5 * (key == query)
+        if score >= min_score:
+            scored.append((row, key, score, key_id))
+    table = pd.DataFrame(scored, columns=["row", "match", "score", "key_id"])
+    table = table.sort_values(["score", "key_id"], ascending=[False, True]).drop_duplicates("row")
+    return table.head(limit).drop(columns="key_id").reset_index(drop=True)
+
+
+@pytest.mark.parametrize("query", ["shanghai", "shan", "cnsha", "valparaiso", "san antonio", "yangshan", "rio", "s"])
+def test_search_matches_brute_force(ports, query):
+    index = NgramIndex.from_columns(ports, ["Port Name", "UN Code"])
+    aliases = NgramIndex.from_columns(ports, ["Also known as"], separator=";")
+    index = NgramIndex(index.keys + aliases.keys, np.concatenate([index.rows, aliases.rows]))
+    got = index.search(query, limit=3)
+    expected = _brute_force(ports, query, limit=3)
+    assert got["row"].tolist() == expected["row"].tolist()
+    assert got["match"].tolist() == expected["match"].tolist()
+    np.testing.assert_allclose(got["score"], expected["score"])
+
+
+def test_exact_and_prefix_matches_rank_first(ports):
+    index = NgramIndex.from_columns(ports, ["Port Name"])
+    assert index.search("Valparaiso", limit=1)["row"].tolist() == [5]
+    results = index.search("SAN", limit=10)
+    assert set(results["row"].head(2)) == {3, 4}
+
+
+def test_empty_and_unmatched_queries(ports):
+    index = NgramIndex.from_columns(ports, ["Port Name"])
+    for query in ["", "   ", "zzzzqqq"]:
+        results = index.search(query)
+        assert results.empty
+        assert list(results.columns) == ["row", "match", "score"]
+    assert NgramIndex([], []).search("shanghai").empty
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pandas.testing as tm
+import pytest
+
+from utils.olap_cube import OlapCube
+
+DIMENSIONS = ["Year Founded", "Continent", "Industry"]
+MEASURES = ["Funding", "Valuation"]
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(4)
+    n_rows = 500
+    return pd.DataFrame({
+        "Year Founded": rng.integers(2000, 2011, n_rows),
+        "Continent": pd.Categorical(rng.choice(["Asia", "Europe", None], n_rows)),
+        "Industry": pd.Categorical(rng.choice(["AI", "Fintech", "Health"], n_rows)),
+        "Funding": rng.random(n_rows),
+        "Valuation": rng.random(n_rows) * 10,
+    })
+
+
+def _filtered(frame, selection, ranges=None):
+    mask = np.ones(len(frame), dtype=bool)
+    for column, (low, high) in (ranges or {}).items():
+        mask &= frame[column].between(low, high).to_numpy()
+    for column, values in selection.items():
+        mask &= frame[column].isin(values).to_numpy()
+    return frame[mask]
+
+
+def test_totals_include_rows_with_null_dimensions(data):
+    cube = OlapCube.build(data, DIMENSIONS, MEASURES)
+    assert cube.total("Count") == len(data)
+    assert cube.total("Funding") == pytest.approx(data["Funding"].sum())
+
+
+@pytest.mark.parametrize("selection, ranges", [
+    ({"Continent": ["Asia"]}, None),
+    ({"Continent": ["Asia", "Europe"], "Industry": ["AI"]}, {"Year Founded": (2003, 2007)}),
+    ({}, {"Year Founded": (2010, 2010)}),
+    ({"Industry": []}, None),
+    ({"Industry": ["Unknown"]}, {"Year Founded": (1900, 1950)}),
+])
+def test_slice_matches_filtered_groupby(data, selection, ranges):
+    subcube = OlapCube.build(data, DIMENSIONS, MEASURES).slice(selection, ranges)
+    filtered = _filtered(data, selection, ranges)
+
+    assert subcube.total("Count") == len(filtered)
+    assert subcube.total("Valuation") == pytest.approx(filtered["Valuation"].sum())
+    for by in (["Year Founded"], ["Industry"], ["Continent", "Industry"]):
+        expected = filtered.groupby(by, observed=True)[MEASURES].agg(["size", "sum"])
+        got = subcube.rollup(by).set_index(by)
+        tm.assert_series_equal(got["Count"], expected[("Funding", "size")], check_names=False)
+        for measure in MEASURES:
+            tm.assert_series_equal(got[measure], expected[(measure, "sum")], check_names=False)
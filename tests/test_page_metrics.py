@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import page_metrics
+from utils.olap_cube import OlapCube
+
+
+@pytest.fixture
+def cube(unicorns):
+    return OlapCube.build(unicorns, ["Year Founded", "Continent", "Industry", "Country"], ["Funding", "Valuation"])
+
+
+def test_top_country_counts_groups_the_rest_as_otros(unicorns, cube):
+    counts = unicorns["Country"].value_counts(sort=False).sort_values(ascending=False, kind="stable")
+    counts = counts[counts > 0]
+    result = page_metrics.top_country_counts(cube)
+    assert result["Country"].tolist() == counts.index[:5].tolist() + ["Otros"]
+    assert result["Count"].tolist() == counts.iloc[:5].tolist() + [counts.iloc[5:].sum()]
+    assert result["Count"].sum() == len(unicorns)
+
+
+@pytest.mark.parametrize("continents", [["Asia"], ["Europe", "North America"], []])
+def test_unicorn_kpis_match_pandas(unicorns, cube, continents):
+    filtered = unicorns[unicorns["Continent"].isin(continents)]
+    kpis = page_metrics.unicorn_kpis(filtered, cube.slice({"Continent": continents}))
+    assert kpis["rows"] == len(filtered)
+    for column in ["Funding", "Valuation"]:
+        mean = filtered[column].mean()
+        assert kpis[column]["total"] == pytest.approx(filtered[column].sum())
+        expected_above = 100 * (filtered[column] > mean).mean() if len(filtered) else 0
+        expected_below = 100 * (filtered[column] < mean).mean() if len(filtered) else 0
+        assert kpis[column]["above_pct"] == pytest.approx(expected_above)
+        assert kpis[column]["below_pct"] == pytest.approx(expected_below)
+
+
+def test_unicorn_charts_match_groupby(unicorns, cube):
+    charts = page_metrics.unicorn_charts(cube.slice({"Industry": ["Fintech"]}))
+    fintech = unicorns[unicorns["Industry"] == "Fintech"]
+    by_year = fintech.groupby("Year Founded")[["Funding", "Valuation"]].sum()
+    np.testing.assert_allclose(charts["by_year"].set_index("Year Founded")[["Funding", "Valuation"]], by_year)
+    assert charts["by_year"]["Count"].tolist() == fintech["Year Founded"].value_counts().sort_index().tolist()
+    assert charts["industry"].set_index("Industry")["Count"].to_dict() == {"Fintech": len(fintech)}
+
+
+def test_port_metrics_match_pandas():
+    ports = pd.DataFrame({
+        "Port Name": ["A", "B", "B", "C"],
+        "Country": pd.Categorical(["Chile", "Chile", "Peru", None], categories=["Chile", "Peru", "Spain"]),
+        "Type": pd.Categorical(["Port", "Port", "Marina", "Port"]),
+        "Area Global": pd.Categorical(["South", "South", "South", "North"]),
+        "Vessels in Port": [1.0, 2.0, 3.0, 4.0],
+        "Departures(Last 24 Hours)": [0.0, 1.0, 0.0, 2.0],
+        "Arrivals(Last 24 Hours)": [5.0, 0.0, 1.0, 1.0],
+    })
+    assert page_metrics.port_kpis(ports) == {"ports": 3, "vessels": 10, "departures": 3, "arrivals": 7}
+    # Sin las categorías que no aparecen (Spain) ni los nulos
+    country = page_metrics.port_charts(ports)["country"]
+    assert country.values.tolist() == [["Chile", 2], ["Peru", 1]]
+    assert page_metrics.category_counts(ports.iloc[:0], "Type").empty
+
+
+def test_rollup_summary_matches_groupby():
+    rng = np.random.default_rng(3)
+    sales = pd.DataFrame({
+        "Date": pd.Timestamp("2019-01-01") + pd.to_timedelta(rng.integers(0, 30, 200), unit="D"),
+        "Gender": rng.choice(["Female", "Male"], 200),
+        "Payment": rng.choice(["Cash", "Ewallet", "Credit card"], 200),
+        "Total": rng.random(200) * 100,
+    })
+    summary = page_metrics.rollup_summary(OlapCube.build(sales, ["Date", "Gender", "Payment"], ["Total"]))
+    assert summary["rows"] == 200
+    assert summary["total"] == pytest.approx(sales["Total"].sum())
+    np.testing.assert_allclose(summary["gender"].set_index("Gender")["Total"], sales.groupby("Gender")["Total"].sum())
+    np.testing.assert_allclose(summary["payment"].set_index("Payment")["Total"], sales.groupby("Payment")["Total"].sum())
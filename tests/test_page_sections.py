@@ -0,0 +1,78 @@
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from utils import telemetry
+
+PAGES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dashboards_pages")
+CMAP_LABEL = "Seleccione el estilo de cmap para la tabla de correlación:"
+
+
+def _spans(page, section):
+    sample = telemetry.get_metrics().registry.get_sample_value(
+        "dashboard_section_seconds_count", {"page": page, "section": section}
+    )
+    return sample or 0
+
+
+def _run(at, **sections):
+    # AppTest no devuelve el estado de los expanders entre ejecuciones: se fija en cada una
+    for key, is_open in sections.items():
+        at.session_state[key] = is_open
+    return at.run()
+
+
+def _labels(at):
+    return [selectbox.label for selectbox in at.selectbox]
+
+
+@pytest.fixture
+def sales_page():
+    return AppTest.from_file(os.path.join(PAGES, "dashboard03.py"), default_timeout=120)
+
+
+def test_closed_section_is_not_computed(sales_page):
+    before = _spans("dashboard03", "aggregate:correlation")
+    _run(sales_page)
+    assert not sales_page.exception
+    assert _spans("dashboard03", "aggregate:correlation") == before
+    assert CMAP_LABEL not in _labels(sales_page)
+
+
+def test_open_section_renders_and_closes_again(sales_page):
+    before = _spans("dashboard03", "aggregate:correlation")
+    _run(sales_page, correlation_section=True)
+    assert _spans("dashboard03", "aggregate:correlation") == before + 1
+    assert CMAP_LABEL in _labels(sales_page)
+    titles = [chart.proto.spec for chart in sales_page.get("plotly_chart")]
+    assert any("Correlación entre" in spec for spec in titles)
+
+    _run(sales_page, correlation_section=False)
+    assert CMAP_LABEL not in _labels(sales_page)
+    assert _spans("dashboard03", "aggregate:correlation") == before + 1
+
+
+def test_widgets_inside_the_section(sales_page):
+    _run(sales_page, correlation_section=True)
+    metrics = [(metric.label, metric.value) for metric in sales_page.metric]
+
+    column = next(selectbox for selectbox in sales_page.selectbox if selectbox.label.startswith("Seleccione una columna"))
+    column.set_value("Quantity")
+    _run(sales_page, correlation_section=True)
+    correlation = next(selectbox for selectbox in sales_page.selectbox if selectbox.label.startswith("Seleccione una correlación"))
+    # Las opciones del gráfico salen de la columna elegida dentro de la sección
+    assert all(option.startswith("Quantity y ") for option in correlation.options)
+    # Las métricas generales de la página no cambian
+    assert [(metric.label, metric.value) for metric in sales_page.metric] == metrics
+
+
+def test_top5_company_details():
+    at = AppTest.from_file(os.path.join(PAGES, "dashboard01.py"), default_timeout=120)
+    _run(at, top5_section=True)
+    company = next(selectbox for selectbox in at.selectbox if selectbox.label.startswith("Seleccione una empresa"))
+    assert len(company.options) == 5
+
+    company.set_value(company.options[-1])
+    _run(at, top5_section=True)
+    assert f"### {company.options[-1]}" in [markdown.value for markdown in at.markdown]
@@ -0,0 +1,100 @@
+import pandas as pd
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from utils import paginated_table
+
+N_ROWS = 230
+
+
+def _table_page(n_rows):
+    import numpy as np
+    import pandas as pd
+    import streamlit as st
+
+    from utils.paginated_table import paginated_table
+
+    base = pd.DataFrame({
+        # Solo cuatro valores: el orden por "Group" tiene muchos empates
+        "Group": np.arange(n_rows) % 4,
+        "Name": [f"Sale {i:03d}" for i in range(n_rows)],
+    })
+    # Filtro de la página: las primeras `view_rows` filas del dataset
+    view_rows = st.sidebar.number_input("Filas filtradas", min_value=0, max_value=n_rows, value=n_rows, key="view_rows")
+    paginated_table(base, base.iloc[:view_rows], key="sales", dataset_key=f"sales-{n_rows}")
+
+
+@pytest.fixture
+def app():
+    paginated_table._column_order.clear()
+    at = AppTest.from_function(_table_page, args=(N_ROWS,))
+    return at.run()
+
+
+def _shown(at):
+    return at.dataframe[0].value
+
+
+def _caption(at):
+    return at.caption[0].value
+
+
+def test_first_and_last_partial_page(app):
+    assert app.selectbox(key="sales_page_size").value == 50
+    assert _shown(app)["Name"].tolist() == [f"Sale {i:03d}" for i in range(50)]
+    assert _caption(app) == "Mostrando filas 1–50 de 230 (página 1 de 5)"
+
+    app.number_input(key="sales_page").set_value(5).run()
+    # La última página solo tiene las 30 filas restantes
+    assert _shown(app).index.tolist() == list(range(200, 230))
+    assert _caption(app) == "Mostrando filas 201–230 de 230 (página 5 de 5)"
+
+
+def test_page_boundaries_do_not_overlap(app):
+    app.selectbox(key="sales_page_size").set_value(25).run()
+    seen = []
+    for page in range(1, 11):
+        app.number_input(key="sales_page").set_value(page).run()
+        seen.extend(_shown(app).index)
+    assert seen == list(range(N_ROWS))
+
+
+def test_empty_view(app):
+    app.number_input(key="view_rows").set_value(0).run()
+    assert not app.exception
+    assert _shown(app).empty
+    assert _caption(app) == "Mostrando filas 0–0 de 0 (página 1 de 1)"
+
+
+def test_fewer_pages_after_filtering_moves_to_the_last_valid_page(app):
+    app.number_input(key="sales_page").set_value(4).run()
+    app.number_input(key="view_rows").set_value(60).run()
+    assert app.number_input(key="sales_page").value == 2
+    assert _shown(app).index.tolist() == list(range(50, 60))
+
+
+@pytest.mark.parametrize("order", ["Ascendente", "Descendente"])
+def test_sort_is_stable_across_pages(app, order):
+    app.selectbox(key="sales_sort").set_value("Group")
+    app.selectbox(key="sales_order").set_value(order).run()
+    # Cambiar el orden vuelve a la primera página
+    assert app.number_input(key="sales_page").value == 1
+
+    pages = []
+    for page in range(1, 6):
+        app.number_input(key="sales_page").set_value(page).run()
+        pages.append(_shown(app))
+    shown = pd.concat(pages)
+
+    expected = pd.DataFrame({"Group": [i % 4 for i in range(N_ROWS)]}).sort_values(
+        "Group", ascending=order == "Ascendente", kind="stable"
+    )
+    # A igual "Group" las filas conservan su orden original en todas las páginas
+    assert shown.index.tolist() == expected.index.tolist()
+
+
+def test_search_filters_before_paging(app):
+    app.text_input(key="sales_search").set_value("sale 1").run()
+    # Los nombres tienen tres dígitos ("Sale 000"...): coinciden "Sale 100" a "Sale 199", sin distinguir mayúsculas
+    assert _caption(app) == "Mostrando filas 1–50 de 100 (página 1 de 2)"
+    assert _shown(app).index.tolist() == list(range(100, 150))
@@ -0,0 +1,145 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pandas.testing as tm
+import pytest
+
+from utils.port_stream import PortEventStream
+
+WINDOW = 100
+NOW = 1000.0
+
+
+def _append(path, events, partial=None):
+    with open(path, "a", encoding="utf-8") as file:
+        for event in events:
+            file.write(json.dumps(event) + "\n")
+        if partial is not None:
+            file.write(partial)
+
+
+def _window_counts(events, kind, now):
+    counts = {}
+    for event in events:
+        if event["event"] == kind and event["ts"] > now - WINDOW:
+            counts[event["port"]] = counts.get(event["port"], 0) + 1
+    return counts
+
+
+@pytest.fixture
+def events():
+    rng = np.random.default_rng(9)
+    ports = ["SHANGHAI", "SINGAPORE", "ROTTERDAM"]
+    return [
+        {"ts": float(ts), "port": str(port), "event": str(kind)}
+        for ts, port, kind in zip(
+            rng.uniform(NOW - 2 * WINDOW, NOW, 200), rng.choice(ports, 200), rng.choice(["arrival", "departure"], 200)
+        )
+    ]
+
+
+@pytest.fixture
+def port_data():
+    return pd.DataFrame({
+        "Port Name": pd.array(["SHANGHAI", "SINGAPORE", "ROTTERDAM", "VALPARAISO"], dtype="string"),
+        "Vessels in Port": [3.0, 0.0, 10.0, 5.0],
+        "Arrivals(Last 24 Hours)": [9.0, 9.0, 9.0, 9.0],
+        "Departures(Last 24 Hours)": [9.0, 9.0, 9.0, 9.0],
+    })
+
+
+def test_counters_match_brute_force(tmp_path, events, port_data):
+    path = tmp_path / "events.jsonl"
+    _append(path, events[:120])
+    stream = PortEventStream(str(path), window_seconds=WINDOW)
+    assert stream.poll(now=NOW) == 120
+    # El resto llega en un segundo poll, sin volver a leer lo anterior
+    _append(path, events[120:])
+    assert stream.poll(now=NOW) == 80
+
+    for kind in ("arrival", "departure"):
+        assert dict(stream.window[kind]) == _window_counts(events, kind, NOW)
+    updated = stream.apply_to(port_data)
+
+    arrivals = _window_counts(events, "arrival", NOW)
+    departures = _window_counts(events, "departure", NOW)
+    net = {port: sum(1 if e["event"] == "arrival" else -1 for e in events if e["port"] == port) for port in arrivals}
+    names = port_data["Port Name"].tolist()
+    expected = port_data.assign(**{
+        "Arrivals(Last 24 Hours)": [arrivals.get(name, 0) for name in names],
+        "Departures(Last 24 Hours)": [departures.get(name, 0) for name in names],
+        "Vessels in Port": (port_data["Vessels in Port"] + [net.get(name, 0) for name in names]).clip(lower=0),
+    })
+    tm.assert_frame_equal(updated, expected)
+    # apply_to devuelve una copia: el DataFrame base no cambia
+    assert (port_data["Arrivals(Last 24 Hours)"] == 9).all()
+
+
+def test_version_changes_with_new_and_expired_events(tmp_path, events):
+    path = tmp_path / "events.jsonl"
+    stream = PortEventStream(str(path), window_seconds=WINDOW)
+    assert stream.poll(now=NOW) == 0
+    assert stream.version == 0
+
+    _append(path, events)
+    stream.poll(now=NOW)
+    version = stream.version
+    stream.poll(now=NOW)
+    assert stream.version == version
+
+    # Al avanzar el reloj expiran eventos: cambia la versión y los conteos vuelven a coincidir
+    later = NOW + WINDOW / 2
+    stream.poll(now=later)
+    assert stream.version > version
+    assert dict(stream.window["arrival"]) == _window_counts(events, "arrival", later)
+    stream.poll(now=NOW + 10 * WINDOW)
+    assert not stream.window["arrival"] and not stream.window["departure"]
+
+
+def test_partial_lines_and_truncated_log(tmp_path):
+    path = tmp_path / "events.jsonl"
+    event = {"ts": NOW, "port": "SHANGHAI", "event": "arrival"}
+    _append(path, [event], partial=json.dumps(event))
+    stream = PortEventStream(str(path), window_seconds=WINDOW)
+    assert stream.poll(now=NOW) == 1
+    # La línea a medio escribir se procesa cuando se completa
+    _append(path, [], partial="\n")
+    assert stream.poll(now=NOW) == 1
+    assert stream.window["arrival"]["SHANGHAI"] == 2
+
+    # Un log rotado (más corto que el desplazamiento leído) se procesa desde el principio
+    path.write_text(json.dumps(dict(event, port="SINGAPORE")) + "\n", encoding="utf-8")
+    assert stream.poll(now=NOW) == 1
+    assert dict(stream.window["arrival"]) == {"SINGAPORE": 1}
+
+
+def test_invalid_records_are_skipped_and_counted(tmp_path):
+    path = tmp_path / "events.jsonl"
+    good = {"ts": NOW, "port": "SHANGHAI", "event": "arrival"}
+    lines = [
+        json.dumps(good),
+        json.dumps({"ts": NOW, "event": "departure"}),            # falta "port"
+        '{"ts": 1000.0, "port": "SINGAPORE", "ev',                 # JSON cortado con salto de línea
+        json.dumps({"ts": "no es una fecha", "port": "SHANGHAI", "event": "arrival"}),
+        json.dumps(["SHANGHAI", "arrival"]),
+        json.dumps(dict(good, port="ROTTERDAM", event="departure")),
+    ]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    # Registro sin "ts" a medio escribir: no cuenta todavía como inválido
+    _append(path, [], partial=json.dumps({"port": "SINGAPORE", "event": "arrival"}))
+
+    stream = PortEventStream(str(path), window_seconds=WINDOW)
+    assert stream.poll(now=NOW) == 2
+    assert stream.invalid_events == 4
+    assert dict(stream.window["arrival"]) == {"SHANGHAI": 1}
+    assert dict(stream.window["departure"]) == {"ROTTERDAM": 1}
+    assert dict(stream.net_vessels) == {"SHANGHAI": 1, "ROTTERDAM": -1}
+
+    # Al completarse, la línea pendiente se lee una sola vez y se descarta por el campo faltante
+    _append(path, [], partial="\n")
+    assert stream.poll(now=NOW) == 0
+    assert stream.invalid_events == 5
+    _append(path, [good])
+    assert stream.poll(now=NOW) == 1
+    assert stream.window["arrival"]["SHANGHAI"] == 2
@@ -0,0 +1,69 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from utils import datasets, resources, shared_store
+
+SALES_CSV = os.path.abspath(datasets.SALES_CSV)
+
+
+@pytest.fixture
+def sales_csv(tmp_path, monkeypatch):
+    # Las rutas de los CSV y de la copia Arrow son relativas: se trabaja sobre una copia en tmp_path
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(shared_store, "SHARED_STORE_DIR", "")
+    os.makedirs(os.path.dirname(datasets.SALES_CSV))
+    shutil.copy(SALES_CSV, datasets.SALES_CSV)
+    resources._local_frame.clear()
+    resources.load_sales_date_index.clear()
+    resources._attached_versions.clear()
+    yield datasets.SALES_CSV
+    resources._local_frame.clear()
+    resources.load_sales_date_index.clear()
+    resources._attached_versions.clear()
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    calls = []
+    build_sales = datasets.build_sales
+
+    def counting_build(path):
+        calls.append(path)
+        return build_sales(path)
+
+    monkeypatch.setattr(datasets, "build_sales", counting_build)
+    return calls
+
+
+def test_first_load_builds_once(sales_csv, builds):
+    first = resources.load_sales()
+    assert resources.load_sales() is first
+    assert len(builds) == 1
+    assert len(first) == len(pd.read_csv(sales_csv))
+
+
+def test_changed_csv_is_picked_up(sales_csv, builds):
+    assert len(resources.load_sales()) == 1000
+    assert len(resources.load_sales_date_index().order) == 1000
+
+    pd.read_csv(sales_csv).head(10).to_csv(sales_csv, index=False)
+    changed = resources.load_sales()
+    assert len(changed) == 10
+    assert len(builds) == 2
+    # Las estructuras derivadas del contenido anterior se descartan
+    assert len(resources.load_sales_date_index().order) == 10
+
+
+def test_touching_the_csv_keeps_the_derived_structures(sales_csv, builds):
+    resources.load_sales()
+    date_index = resources.load_sales_date_index()
+
+    stat = os.stat(sales_csv)
+    os.utime(sales_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert len(resources.load_sales()) == 1000
+    # Mismo contenido: la copia Arrow no se reconstruye y el índice sigue siendo el mismo
+    assert len(builds) == 1
+    assert resources.load_sales_date_index() is date_index
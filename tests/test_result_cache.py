@@ -0,0 +1,163 @@
+import heapq
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import resources
+from utils.result_cache import BudgetedCache, size_of
+
+
+class ReferenceCache:
+    """GreedyDual-Size sin optimizaciones: recorre todas las entradas para elegir la que sale."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.clock = 0.0
+        self.entries = {}  # clave -> (tamaño, costo, prioridad, orden)
+        self.order = itertools.count()
+
+    def _touch(self, key, size, cost):
+        self.entries[key] = (size, cost, self.clock + cost / max(size, 1), next(self.order))
+
+    def get(self, key):
+        if key in self.entries:
+            size, cost, _, _ = self.entries[key]
+            self._touch(key, size, cost)
+            return True
+        return False
+
+    def put(self, key, size, cost):
+        if size > self.max_bytes:
+            return
+        self._touch(key, size, cost)
+        while sum(entry[0] for entry in self.entries.values()) > self.max_bytes:
+            victim = min(self.entries, key=lambda k: self.entries[k][2:])
+            self.clock = self.entries.pop(victim)[2]
+
+
+def test_matches_reference_greedy_dual_size():
+    rng = np.random.default_rng(23)
+    cache = BudgetedCache("test_reference", 1000)
+    reference = ReferenceCache(1000)
+    for _ in range(2000):
+        key = int(rng.integers(0, 40))
+        if rng.random() < 0.5:
+            hit = cache.get(key) is not None
+            assert hit == reference.get(key)
+        else:
+            size, cost = int(rng.integers(1, 400)), float(rng.choice([0.01, 0.1, 1.0]))
+            cache.put(key, f"value-{key}", cost=cost, size=size)
+            reference.put(key, size, cost)
+        assert set(cache._entries) == set(reference.entries)
+        assert cache.current_bytes == sum(entry[0] for entry in reference.entries.values()) <= 1000
+
+
+def test_equal_cost_behaves_as_lru():
+    cache = BudgetedCache("test_lru", 300)
+    for key in "abc":
+        cache.put(key, key, cost=1.0, size=100)
+    cache.get("a")
+    cache.put("d", "d", cost=1.0, size=100)
+    assert cache.get("b") is None
+    assert all(cache.get(key) == key for key in "acd")
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expensive_small_entry_outlives_cheap_large_one():
+    cache = BudgetedCache("test_cost", 1000)
+    cache.put("cheap", "cheap", cost=0.001, size=600)
+    cache.put("expensive", "expensive", cost=5.0, size=100)
+    cache.put("new", "new", cost=0.5, size=400)
+    assert cache.get("cheap") is None
+    assert cache.get("expensive") == "expensive"
+
+
+def test_entries_over_budget_are_rejected_without_evicting():
+    cache = BudgetedCache("test_reject", 100)
+    cache.put("small", "small", size=50)
+    cache.put("huge", "huge", size=101)
+    assert cache.get("huge") is None
+    assert cache.get("small") == "small"
+    stats = cache.stats()
+    assert (stats["rejections"], stats["evictions"], stats["resident_bytes"]) == (1, 0, 50)
+
+    # Un resultado que nunca cabe se vuelve a construir en cada llamada
+    calls = []
+    for _ in range(2):
+        cache.get_or_build("huge_build", lambda: calls.append(1) or "x" * 500)
+    assert len(calls) == 2
+
+
+def test_get_or_build_builds_once_and_clear_empties():
+    cache = BudgetedCache("test_build", 10_000)
+    calls = []
+    for _ in range(3):
+        assert cache.get_or_build("key", lambda: calls.append(1) or [1, 2, 3]) == [1, 2, 3]
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 2
+    cache.clear()
+    assert cache.stats()["entries"] == 0 and cache.current_bytes == 0
+
+
+def test_size_of_counts_dataframes_deep_and_shared_objects_once():
+    frame = pd.DataFrame({"name": ["a" * 100] * 50, "value": np.arange(50.0)})
+    assert size_of(frame) == frame.memory_usage(index=True, deep=True).sum()
+    array = np.zeros(1000)
+    assert size_of([array, array]) == size_of([array]) + 8
+    assert size_of({"frame": frame}) > size_of(frame)
+
+
+def test_cached_result_is_keyed_by_data_version():
+    resources.get_result_cache().clear()
+    calls = []
+    build = lambda: calls.append(1) or pd.DataFrame({"x": [len(calls)]})
+    first = resources.cached_result(build, "test", "filtered", "v1", {"types": ["Port"]})
+    assert resources.cached_result(build, "test", "filtered", "v1", {"types": ["Port"]}) is first
+    assert resources.cached_result(build, "test", "filtered", "v2", {"types": ["Port"]}) is not first
+    assert len(calls) == 2
+
+
+def test_new_dataset_version_clears_derived_resources(monkeypatch):
+    class Derived:
+        cleared = 0
+
+        def clear(self):
+            self.cleared += 1
+
+    derived = Derived()
+    monkeypatch.setitem(resources.DERIVED_RESOURCES, "ports", [derived])
+    monkeypatch.setattr(resources, "_attached_versions", {})
+    resources._track_version("ports", "v1")
+    resources._track_version("ports", "v1")
+    assert derived.cleared == 0
+    resources._track_version("ports", "v2")
+    assert derived.cleared == 1
+
+
+def test_accounting_holds_under_concurrent_sessions():
+    from concurrent.futures import ThreadPoolExecutor
+
+    cache = BudgetedCache("test_threads", 5_000)
+
+    def session(seed):
+        rng = np.random.default_rng(seed)
+        gets = 0
+        for _ in range(500):
+            key = int(rng.integers(0, 60))
+            if rng.random() < 0.6:
+                cache.get(key)
+                gets += 1
+            else:
+                cache.put(key, key, cost=float(rng.random()), size=int(rng.integers(50, 800)))
+        return gets
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        gets = sum(pool.map(session, range(8)))
+
+    # Cada consulta cuenta una sola vez y los bytes residentes cuadran con las entradas que quedaron
+    stats = cache.stats()
+    assert stats["hits"] + stats["misses"] == gets
+    assert cache.current_bytes == sum(entry[1] for entry in cache._entries.values()) <= 5_000
+    assert {key for _, _, key in cache._heap} >= set(cache._entries)
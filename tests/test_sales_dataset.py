@@ -0,0 +1,72 @@
+import datetime
+import os
+
+import pandas as pd
+import pytest
+
+from utils import datasets, sales_dataset
+from utils.sales_dataset import SalesDataset, build_sales_dataset, filter_expression
+
+CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dashboards_pages", "data", "supermarket_sales.csv")
+
+
+@pytest.fixture
+def sales():
+    return datasets.build_sales(CSV)
+
+
+@pytest.fixture
+def store(tmp_path):
+    build_sales_dataset(CSV, str(tmp_path), chunk_rows=300)
+    return str(tmp_path)
+
+
+def test_catalog_comes_from_the_sidecar_without_scanning(store, sales, monkeypatch):
+    def no_scan(*args, **kwargs):
+        raise AssertionError("el catálogo no debe recorrer el dataset")
+
+    monkeypatch.setattr(SalesDataset, "batches", no_scan)
+    dataset = SalesDataset(store)
+    for column in ("Branch", "Gender", "Payment"):
+        assert dataset.options[column] == sorted(sales[column].unique())
+    assert dataset.date_bounds == (sales["Date"].min().date(), sales["Date"].max().date())
+    assert dataset.n_rows == len(sales)
+
+
+def test_summary_matches_pandas(store, sales):
+    dataset = SalesDataset(store)
+    start, end = datetime.date(2019, 1, 15), datetime.date(2019, 2, 20)
+    expression = filter_expression(["A", "C"], ["Female"], ["Cash", "Ewallet"], start, end)
+    summary = dataset.summary(expression)
+
+    mask = (sales["Branch"].isin(["A", "C"]) & (sales["Gender"] == "Female") & sales["Payment"].isin(["Cash", "Ewallet"])
+            & sales["Date"].between(pd.Timestamp(start), pd.Timestamp(end)))
+    filtered = sales[mask]
+    assert summary["rows"] == len(filtered)
+    assert summary["total"] == pytest.approx(filtered["Total"].sum())
+    expected = filtered.groupby("Payment", observed=True)["Total"].sum()
+    assert summary["payment"].set_index("Payment")["Total"].to_dict() == pytest.approx(expected.to_dict())
+
+
+def test_rebuild_keeps_open_versions_readable(store, sales):
+    old = SalesDataset(store)
+    expression = filter_expression(["A"], ["Male"], ["Cash"], *old.date_bounds)
+    before = old.summary(expression)
+
+    new_version = build_sales_dataset(CSV, store, chunk_rows=500)
+    assert sales_dataset.current_version(store) == new_version != old.version
+    # El objeto abierto sigue leyendo su versión, que se conserva tras la reconstrucción
+    assert old.summary(expression)["rows"] == before["rows"]
+    assert SalesDataset(store).version == new_version
+
+    # Con una tercera versión, la primera se borra (se conservan KEEP_VERSIONS)
+    build_sales_dataset(CSV, store, chunk_rows=500)
+    versions = sorted(name for name in os.listdir(store) if os.path.isdir(os.path.join(store, name)))
+    assert len(versions) == sales_dataset.KEEP_VERSIONS
+    assert old.version not in versions
+
+
+def test_missing_dataset_is_reported(tmp_path):
+    assert sales_dataset.current_version(str(tmp_path)) is None
+    with pytest.raises(FileNotFoundError):
+        SalesDataset(str(tmp_path))
@@ -0,0 +1,131 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pandas.testing as tm
+import pytest
+
+from utils import shared_store
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        "Country": pd.Categorical(["Chile", "Spain", None]),
+        "Port Name": pd.array(["VALPARAISO", "VALENCIA", None], dtype="string"),
+        "Vessels in Port": [3.0, np.nan, 1.0],
+        "Rows": np.arange(3, dtype="int64"),
+    })
+
+
+def test_attach_returns_the_published_frame(tmp_path, frame):
+    store = str(tmp_path)
+    assert shared_store.current_version("ports", store) is None
+    shared_store.publish("ports", frame, "v1", store)
+    assert shared_store.current_version("ports", store) == "v1"
+    tm.assert_frame_equal(shared_store.attach("ports", "v1", store), frame)
+
+
+def test_publish_if_missing_builds_once(tmp_path, frame):
+    store = str(tmp_path)
+    calls = []
+
+    def build():
+        calls.append(1)
+        return frame
+
+    assert shared_store.publish_if_missing("ports", build, lambda: "v1", store) == "v1"
+    assert shared_store.publish_if_missing("ports", build, lambda: "v2", store) == "v1"
+    assert len(calls) == 1
+
+
+def _arrow_files(store):
+    return sorted(name for name in os.listdir(store) if name.endswith(".arrow"))
+
+
+def _publish_at(store, frame, version, mtime):
+    # mtime explícito: el orden de las versiones no depende de la resolución del reloj
+    shared_store.publish("ports", frame, version, store)
+    path = os.path.join(store, f"ports-{version}.arrow")
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_previous_version_stays_readable(tmp_path, frame):
+    store = str(tmp_path)
+    _publish_at(store, frame, "v1", 1)
+    mapped = shared_store.attach("ports", "v1", store)
+    _publish_at(store, frame.iloc[:1], "v2", 2)
+
+    # Quien leyó el puntero antes del cambio todavía puede abrir la versión anterior
+    assert shared_store.current_version("ports", store) == "v2"
+    tm.assert_frame_equal(shared_store.attach("ports", "v1", store), mapped)
+    tm.assert_frame_equal(shared_store.attach("ports", "v2", store), frame.iloc[:1])
+
+    _publish_at(store, frame.iloc[:2], "v3", 3)
+    assert _arrow_files(store) == ["ports-v2.arrow", "ports-v3.arrow"]
+    with pytest.raises(FileNotFoundError):
+        shared_store.attach("ports", "v1", store)
+
+
+def test_file_in_use_is_removed_on_a_later_publish(tmp_path, frame, monkeypatch):
+    store = str(tmp_path)
+    monkeypatch.setattr(shared_store, "KEEP_VERSIONS", 1)
+    _publish_at(store, frame, "v1", 1)
+
+    # Como en Windows con el archivo mapeado en otro proceso
+    def locked(path):
+        raise PermissionError(13, "El archivo está en uso", path)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(shared_store.os, "remove", locked)
+        _publish_at(store, frame, "v2", 2)
+    assert _arrow_files(store) == ["ports-v1.arrow", "ports-v2.arrow"]
+
+    _publish_at(store, frame, "v3", 3)
+    assert _arrow_files(store) == ["ports-v3.arrow"]
+
+
+def test_publishes_without_fcntl(tmp_path, frame, monkeypatch):
+    # En Windows no hay fcntl: se bloquea con msvcrt o, sin él, no se bloquea
+    monkeypatch.setattr(shared_store, "fcntl", None)
+    monkeypatch.setattr(shared_store, "msvcrt", None)
+    assert shared_store.publish_if_missing("ports", lambda: frame, lambda: "v1", str(tmp_path)) == "v1"
+    tm.assert_frame_equal(shared_store.attach("ports", "v1", str(tmp_path)), frame)
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Un proceso del servidor: publica "ports" si falta (anotando en `builds` cada construcción) y lo lee
+SERVER_PROCESS = """
+import sys
+import pandas as pd
+from utils import shared_store
+
+store, builds = sys.argv[1], sys.argv[2]
+
+def build():
+    with open(builds, "a") as file:
+        file.write("build\\n")
+    return pd.DataFrame({"Vessels in Port": [3.0, 1.0, 4.0]})
+
+version = shared_store.publish_if_missing("ports", build, lambda: "v1", store)
+print(version, shared_store.attach("ports", version, store)["Vessels in Port"].sum())
+"""
+
+
+def test_processes_share_one_published_version(tmp_path):
+    store, builds = str(tmp_path / "store"), str(tmp_path / "builds.log")
+    os.makedirs(store)
+    processes = [
+        subprocess.Popen([sys.executable, "-c", SERVER_PROCESS, store, builds], cwd=ROOT,
+                         stdout=subprocess.PIPE, text=True)
+        for _ in range(4)
+    ]
+    outputs = [process.communicate(timeout=60)[0].strip() for process in processes]
+    assert all(process.returncode == 0 for process in processes)
+    # El bloqueo deja construir a un solo proceso; los demás se conectan a su versión
+    assert outputs == ["v1 8.0"] * 4
+    with open(builds) as file:
+        assert file.read().count("build") == 1
@@ -0,0 +1,63 @@
+import pandas.testing as tm
+
+from utils import snapshots
+from utils.bitmap_index import BitmapIndex
+from utils.olap_cube import OlapCube
+
+
+def _unicorns_context(data):
+    # Igual que `snapshots._unicorns_context`, pero sobre datos en memoria
+    return {
+        "version": "test-1",
+        "data": data,
+        "filter_index": BitmapIndex(data, ["Continent", "Industry", "Year Founded"]),
+        "cube": OlapCube.build(data, ["Year Founded", "Continent", "Industry", "Country"], ["Funding", "Valuation"]),
+    }
+
+
+def _write(tmp_path, context, grid):
+    results = []
+    for selection in grid:
+        kpis, charts = snapshots._render_unicorns(context, selection)
+        results.append((snapshots.snapshot_key("dashboard01", context["version"], selection), selection, kpis, charts))
+    snapshots.write_snapshots(str(tmp_path), "dashboard01", context["version"], results)
+    return snapshots.SnapshotSet(str(tmp_path / "dashboard01"))
+
+
+def test_every_grid_selection_round_trips(tmp_path, unicorns):
+    context = _unicorns_context(unicorns)
+    grid = snapshots._unicorns_grid(context)
+    snapshot_set = _write(tmp_path, context, grid)
+
+    for selection in grid:
+        snapshot = snapshot_set.lookup("test-1", selection)
+        kpis, charts = snapshots._render_unicorns(context, selection)
+        assert snapshot["kpis"] == kpis
+        for chart_id, frame in charts.items():
+            # Las categorías vuelven del Parquet como texto
+            expected = frame.astype({column: "string" for column in frame.select_dtypes("category").columns})
+            tm.assert_frame_equal(snapshot["charts"][chart_id], expected.reset_index(drop=True), check_dtype=False)
+
+
+def test_selection_without_rows_returns_empty_charts(tmp_path, unicorns):
+    context = _unicorns_context(unicorns)
+    years = [2000, 2015]
+    empty = {"years": years, "continents": ["Africa"], "industries": ["Artificial Intelligence"]}
+    full = {"years": years, "continents": ["Africa"], "industries": ["Fintech"]}
+    snapshot_set = _write(tmp_path, context, [full, empty])
+
+    snapshot = snapshot_set.lookup("test-1", empty)
+    assert snapshot["kpis"]["rows"] == 0
+    assert len(snapshot["charts"]["by_year"]) == 0
+    assert list(snapshot["charts"]["by_year"].columns) == ["Year Founded", "Count", "Funding", "Valuation"]
+    assert snapshot["charts"]["by_year"].dtypes.equals(snapshot_set.lookup("test-1", full)["charts"]["by_year"].dtypes)
+    # "Otros" siempre está, aunque no haya compañías
+    assert snapshot["charts"]["top_countries"]["Count"].tolist() == [0]
+
+
+def test_lookup_misses_other_versions_and_selections(tmp_path, unicorns):
+    context = _unicorns_context(unicorns)
+    selection = {"years": [2000, 2015], "continents": ["Asia"], "industries": ["Fintech"]}
+    snapshot_set = _write(tmp_path, context, [selection])
+    assert snapshot_set.lookup("test-2", selection) is None
+    assert snapshot_set.lookup("test-1", dict(selection, continents=["Europe"])) is None
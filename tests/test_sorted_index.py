@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.sorted_index import SortedIndex
+
+
+@pytest.fixture
+def dates():
+    rng = np.random.default_rng(18)
+    values = pd.Series(pd.to_datetime("2019-01-01") + pd.to_timedelta(rng.integers(0, 90, 300), unit="D"))
+    values[rng.choice(300, 10, replace=False)] = pd.NaT
+    return values
+
+
+@pytest.mark.parametrize("low, high", [
+    ("2019-01-01", "2019-03-31"),
+    ("2019-02-01", "2019-02-28"),
+    ("2019-02-10", "2019-02-10"),
+    ("2018-01-01", "2018-12-31"),
+    ("2019-03-01", "2019-02-01"),
+])
+def test_rows_match_between(dates, low, high):
+    index = SortedIndex(dates)
+    low, high = pd.Timestamp(low), pd.Timestamp(high)
+    expected = (dates >= low) & (dates <= high)
+    rows = index.rows(low.to_datetime64(), high.to_datetime64())
+    np.testing.assert_array_equal(rows, np.flatnonzero(expected))
+    # Con `take` se obtiene el mismo subconjunto (y las mismas etiquetas) que con la máscara
+    pd.testing.assert_series_equal(dates.take(rows), dates[expected])
+
+
+def test_positions_are_sorted_by_value_and_stable(dates):
+    index = SortedIndex(dates)
+    low, high = np.datetime64("2019-01-15"), np.datetime64("2019-02-15")
+    positions = index.positions(low, high)
+    expected = dates[(dates >= low) & (dates <= high)].sort_values(kind="stable").index.to_numpy()
+    np.testing.assert_array_equal(positions, expected)
+
+
+def test_numeric_column_with_nan():
+    values = pd.Series([3.0, np.nan, 1.0, 2.0, np.nan, 2.0])
+    index = SortedIndex(values)
+    np.testing.assert_array_equal(index.rows(2.0, 3.0), np.flatnonzero(values.between(2.0, 3.0)))
+    assert len(index.rows(-1.0, 0.0)) == 0
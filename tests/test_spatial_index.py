@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.spatial_index import EARTH_RADIUS_KM, SpatialIndex
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(21)
+    n_rows = 2000
+    frame = pd.DataFrame({
+        "Latitude": np.degrees(np.arcsin(rng.uniform(-1, 1, n_rows))),
+        "Longitude": rng.uniform(-180, 180, n_rows),
+    })
+    frame.loc[rng.choice(n_rows, 20, replace=False), "Latitude"] = np.nan
+    frame.loc[rng.choice(n_rows, 20, replace=False), "Longitude"] = np.nan
+    return frame
+
+
+def _haversine_km(frame, latitude, longitude):
+    lat1, lon1 = np.radians(frame["Latitude"].to_numpy()), np.radians(frame["Longitude"].to_numpy())
+    lat2, lon2 = np.radians(latitude), np.radians(longitude)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+@pytest.mark.parametrize("latitude, longitude, radius_km", [
+    (40.0, -100.0, 1000), (-33.4, -70.6, 3000), (89.0, 10.0, 500), (0.0, 179.5, 2500), (10.0, 10.0, 1), (0.0, 0.0, 25000),
+])
+def test_within_radius_matches_haversine(data, latitude, longitude, radius_km):
+    distances = _haversine_km(data, latitude, longitude)
+    got = SpatialIndex(data).within_radius(latitude, longitude, radius_km)
+    # Las filas a menos de 1 m del borde pueden caer de cualquier lado por redondeo
+    clear = np.isnan(distances) | (np.abs(distances - radius_km) > 1e-3)
+    np.testing.assert_array_equal(got[clear], (distances <= radius_km)[clear])
+
+
+@pytest.mark.parametrize("lat_min, lat_max, lon_min, lon_max", [
+    (25.0, 50.0, -125.0, -65.0), (-60.0, 10.0, 100.0, -150.0), (-90.0, 90.0, -180.0, 180.0), (50.0, 25.0, 0.0, 30.0),
+    (10.0, 10.5, 20.0, 20.5),
+])
+def test_within_bbox_matches_coordinate_filter(data, lat_min, lat_max, lon_min, lon_max):
+    latitude, longitude = data["Latitude"], data["Longitude"]
+    low, high = sorted((lat_min, lat_max))
+    in_lon = longitude.between(lon_min, lon_max) if lon_min <= lon_max else (longitude >= lon_min) | (longitude <= lon_max)
+    expected = (latitude.between(low, high) & in_lon).to_numpy()
+    np.testing.assert_array_equal(SpatialIndex(data).within_bbox(lat_min, lat_max, lon_min, lon_max), expected)
+
+
+@pytest.mark.parametrize("k", [1, 20, 5000])
+def test_nearest_matches_sorted_distances(data, k):
+    index = SpatialIndex(data)
+    mask = (np.arange(len(data)) % 3 == 0)
+    distances = _haversine_km(data, 40.0, -100.0)
+    allowed = mask & ~np.isnan(distances)
+    expected = np.sort(distances[allowed])[:k]
+
+    rows, km = index.nearest(40.0, -100.0, k, mask=mask)
+    assert mask[rows].all()
+    np.testing.assert_allclose(km, expected, rtol=1e-9, atol=1e-6)
+    np.testing.assert_allclose(distances[rows], km, rtol=1e-9, atol=1e-6)
+    assert index.nearest_mask(40.0, -100.0, k, mask=mask).sum() == len(expected)
+
+
+def test_empty_mask_returns_no_rows(data):
+    index = SpatialIndex(data)
+    rows, km = index.nearest(0.0, 0.0, 10, mask=np.zeros(len(data), dtype=bool))
+    assert len(rows) == 0 and len(km) == 0
+    assert not index.nearest_mask(0.0, 0.0, 10, mask=np.zeros(len(data), dtype=bool)).any()
+
+
+CITIES = pd.DataFrame(
+    [
+        ("Santiago", -33.45, -70.66),
+        ("Buenos Aires", -34.60, -58.38),
+        ("Madrid", 40.42, -3.70),
+        ("Paris", 48.86, 2.35),
+        ("Suva", -18.14, 178.44),
+        ("Apia", -13.83, -171.76),
+        ("Sin coordenadas", np.nan, np.nan),
+    ],
+    columns=["City", "Latitude", "Longitude"],
+)
+
+
+def _cities(mask):
+    return CITIES.loc[mask, "City"].tolist()
+
+
+def test_city_examples():
+    index = SpatialIndex(CITIES)
+    # Santiago - Buenos Aires son unos 1140 km y Madrid - París unos 1050 km
+    assert _cities(index.within_radius(-33.45, -70.66, 1100)) == ["Santiago"]
+    assert _cities(index.within_radius(-33.45, -70.66, 1200)) == ["Santiago", "Buenos Aires"]
+    assert _cities(index.within_radius(40.42, -3.70, 1100)) == ["Madrid", "Paris"]
+    # Recuadro que cruza el antimeridiano: de 170°E a 170°O
+    assert _cities(index.within_bbox(-25, -10, 170, -170)) == ["Suva", "Apia"]
+    # El recuadro complementario, de 170°O a 170°E, deja fuera las dos islas
+    assert _cities(index.within_bbox(-40, -10, -170, 170)) == ["Santiago", "Buenos Aires"]
+
+    rows, km = index.nearest(-33.05, -71.62, 2)  # Valparaíso
+    assert CITIES["City"].iloc[rows].tolist() == ["Santiago", "Buenos Aires"]
+    assert km[0] == pytest.approx(100, abs=15)
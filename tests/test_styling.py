@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pandas.testing as tm
+import pytest
+
+from utils import styling
+
+PALETTE = ["color: red;", "color: green;", "color: blue;"]
+
+
+def _row_wise(data, column, top_values, palette):
+    # Versión original de las páginas: una llamada de Python por fila con `Styler.apply(axis=1)`
+    def style_row(row):
+        if row[column] in top_values:
+            return [palette[top_values.index(row[column])]] * len(row)
+        return [""] * len(row)
+    return data.apply(style_row, axis=1, result_type="expand").set_axis(data.columns, axis=1)
+
+
+def _rendered(styler):
+    # Propiedades CSS que el Styler asigna a cada celda
+    return styler._compute().ctx
+
+
+@pytest.fixture
+def ports():
+    return pd.DataFrame({
+        "Country": pd.Categorical(["Chile", "Spain", None, "Chile", "Peru", "Spain", "Chile", None]),
+        "Type": ["Port", "Anchorage", "Port", np.nan, "Marina", "Port", "Anchorage", "Port"],
+        "Vessels": [3.0, np.nan, 7.0, 7.0, 1.0, np.nan, 0.0, 7.0],
+    }, index=[10, 11, 12, 13, 14, 15, 16, 17])
+
+
+@pytest.mark.parametrize("column, top_values", [
+    ("Country", ["Chile", "Spain", "Peru"]),
+    ("Country", ["Spain"]),
+    # Valores repetidos en la lista: gana la primera posición, como con `list.index`
+    ("Country", ["Peru", "Chile", "Peru"]),
+    ("Country", ["Argentina", "Chile"]),
+    ("Country", []),
+    ("Type", ["Port", "Anchorage"]),
+])
+def test_rank_styles_matches_row_wise_function(ports, column, top_values):
+    got = styling.rank_styles(ports, column, top_values, PALETTE)
+    tm.assert_frame_equal(got, _row_wise(ports, column, top_values, PALETTE), check_dtype=False)
+    assert _rendered(ports.style.apply(styling.rank_styles, axis=None, column=column, top_values=top_values,
+                                       palette=PALETTE)) == \
+        _rendered(ports.style.apply(_row_wise, axis=None, column=column, top_values=top_values, palette=PALETTE))
+
+
+def test_rank_styles_on_an_empty_frame(ports):
+    empty = ports.iloc[:0]
+    assert styling.rank_styles(empty, "Country", ["Chile"], PALETTE).shape == (0, 3)
+
+
+def test_highlight_values_matches_highlight_max():
+    data = pd.DataFrame({
+        # Empates en el máximo y NaN, que `highlight_max` ignora
+        "Total": [10.5, np.nan, 10.5, 3.0],
+        "Quantity": [1, 9, 9, 2],
+        "Date": pd.to_datetime(["2019-01-05", "2019-03-30", None, "2019-03-30"]),
+        "Invoice": ["a-1", "c-9", "b-2", None],
+    })
+    targets = {column: series.max() for column, series in data.items()}
+    got = _rendered(data.style.apply(styling.highlight_values, axis=None, targets=targets))
+    assert got == _rendered(data.style.highlight_max(axis=0))
+    assert got[(0, 0)] == got[(2, 0)] == [("background-color", "yellow")]
+
+
+def test_highlight_values_in_a_window_uses_the_full_maxima():
+    data = pd.DataFrame({"Total": [5.0, 8.0, 2.0, 8.0], "Rating": [9.1, 4.0, np.nan, 9.9]})
+    targets = data.max().to_dict()
+    window = data.iloc[2:]
+    styles = styling.highlight_values(window, targets)
+    # En la ventana solo se marcan las celdas que son el máximo de todo el conjunto
+    assert styles["Total"].tolist() == ["", "background-color: yellow;"]
+    assert styles["Rating"].tolist() == ["", "background-color: yellow;"]
+    assert (styling.highlight_values(data.iloc[:1], targets) == "").all().all()
@@ -0,0 +1,61 @@
+import importlib
+
+import prometheus_client
+import pytest
+
+from utils import telemetry
+from utils.result_cache import BudgetedCache
+
+
+def test_reimport_reuses_the_registered_metrics():
+    metrics = telemetry.get_metrics()
+    # Un segundo import del módulo no vuelve a registrar las series
+    importlib.reload(telemetry)
+    importlib.reload(telemetry)
+    assert telemetry.get_metrics() is metrics
+
+
+def test_metrics_stay_out_of_the_default_registry():
+    telemetry.Metrics()
+    telemetry.Metrics()
+    assert prometheus_client.REGISTRY.get_sample_value("dashboard_warmup_ready") is None
+
+
+def test_span_and_rows_are_recorded():
+    metrics = telemetry.Metrics()
+    tracer = telemetry.PageTracer("dashboard01", metrics=metrics)
+    with tracer.span("filter"):
+        pass
+    # El span se registra aunque la sección falle
+    with pytest.raises(RuntimeError), tracer.span("filter"):
+        raise RuntimeError
+    tracer.rows("filter", 1000, 37)
+
+    sample = metrics.registry.get_sample_value
+    assert sample("dashboard_section_seconds_count", {"page": "dashboard01", "section": "filter"}) == 2
+    assert sample("dashboard_filter_rows_in_total", {"page": "dashboard01", "stage": "filter"}) == 1000
+    assert sample("dashboard_filter_rows_out_total", {"page": "dashboard01", "stage": "filter"}) == 37
+
+
+def test_budgeted_cache_reports_its_usage():
+    cache = BudgetedCache("telemetry-test", max_bytes=100)
+    cache.put("a", "x", size=60)
+    cache.get("a")
+    cache.get("b")
+    cache.put("c", "y", size=60)  # Expulsa "a"
+    cache.put("d", "z", size=500)  # Mayor que el presupuesto
+
+    def sample(name):
+        return telemetry.get_metrics().registry.get_sample_value(name, {"cache": "telemetry-test"})
+
+    assert sample("dashboard_cache_hits_total") == 1
+    assert sample("dashboard_cache_misses_total") == 1
+    assert sample("dashboard_cache_evictions_total") == 1
+    assert sample("dashboard_cache_rejections_total") == 1
+    assert sample("dashboard_cache_resident_bytes") == 60
+    assert sample("dashboard_cache_entries") == 1
+    assert sample("dashboard_cache_budget_bytes") == 100
+
+
+def test_metrics_server_disabled_with_port_zero():
+    assert telemetry.start_metrics_server(0) is None
@@ -0,0 +1,90 @@
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from utils import telemetry
+from utils.lazy_module import LazyModule
+from utils.warmup import HEAVY_MODULES, Warmup
+
+
+def _ready_gauge():
+    return telemetry.get_metrics().registry.get_sample_value("dashboard_warmup_ready")
+
+
+def test_steps_run_in_order():
+    calls = []
+    warmup = Warmup([(name, lambda name=name: calls.append(name)) for name in ["unicorns", "ports", "sales"]])
+    assert warmup.state == "pending" and not warmup.is_ready()
+    warmup.run()
+    assert calls == warmup.completed_steps == ["unicorns", "ports", "sales"]
+    assert warmup.is_ready()
+    assert _ready_gauge() == 1
+
+
+def test_failed_step_stops_the_warmup():
+    calls = []
+
+    def broken():
+        raise FileNotFoundError("ports.csv")
+
+    warmup = Warmup([("unicorns", lambda: calls.append("unicorns")), ("ports", broken),
+                     ("sales", lambda: calls.append("sales"))])
+    warmup.run()
+    assert warmup.state == "failed"
+    assert warmup.completed_steps == calls == ["unicorns"]
+    assert "ports.csv" in warmup.error
+    assert warmup.wait(0)
+    assert _ready_gauge() == 0
+
+
+def test_start_does_not_block_the_caller():
+    release = threading.Event()
+    warmup = Warmup([("slow", release.wait)]).start()
+    # La sesión sigue mientras el paso lento corre en segundo plano
+    assert not warmup.wait(0.05)
+    assert warmup.state == "running"
+    release.set()
+    assert warmup.wait(5)
+    assert warmup.is_ready()
+
+
+@pytest.fixture
+def fake_module(tmp_path, monkeypatch):
+    # Módulo que cuenta cuántas veces se ejecuta su importación
+    (tmp_path / "heavy_fake.py").write_text("import builtins\nbuiltins.heavy_fake_imports += 1\nVALUE = 42\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr("builtins.heavy_fake_imports", 0, raising=False)
+    monkeypatch.delitem(sys.modules, "heavy_fake", raising=False)
+    yield
+    sys.modules.pop("heavy_fake", None)
+
+
+def test_lazy_module_imports_on_first_attribute(fake_module):
+    import builtins
+
+    lazy = LazyModule("heavy_fake")
+    assert "heavy_fake" not in sys.modules
+    assert builtins.heavy_fake_imports == 0
+
+    threads = [threading.Thread(target=lambda: lazy.VALUE) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert lazy.VALUE == 42
+    assert builtins.heavy_fake_imports == 1
+
+
+def test_utils_do_not_import_the_heavy_modules():
+    # Proceso aparte: en este ya pueden estar importados por otros tests
+    code = (
+        "import sys\n"
+        "import utils.resources, utils.warmup, utils.figure_cache\n"
+        f"print([name for name in {HEAVY_MODULES!r} if name in sys.modules])\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert result.stdout.strip() == "[]"
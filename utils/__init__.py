@@ -0,0 +1 @@
+# Módulos compartidos por los dashboards (capa de datos, índices y utilidades)
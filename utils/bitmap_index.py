@@ -0,0 +1,64 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+class BitmapIndex:
+    """Índice de filtros con un bitmap empaquetado (8 filas por byte) por cada valor de cada columna.
+
+    Una selección se resuelve con un OR de bitmaps dentro de cada columna y un AND
+    entre columnas, sin volver a recorrer los datos. Los resultados se memorizan por selección.
+    """
+
+    def __init__(self, data, columns, memo_size=256):
+        self.n_rows = len(data)
+        self.bitmaps = {}
+        for column in columns:
+            series = data[column]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                values = series.cat.categories
+                codes = series.cat.codes.to_numpy()
+            else:
+                values, codes = np.unique(series.to_numpy(), return_inverse=True)
+            self.bitmaps[column] = {
+                value: np.packbits(codes == code) for code, value in enumerate(values.tolist())
+            }
+        self._memo = OrderedDict()
+        self._memo_size = memo_size
+        self._lock = threading.Lock()
+
+    def values(self, column):
+        return sorted(self.bitmaps[column])
+
+    def values_between(self, column, low, high):
+        # Valores de la columna dentro de un rango (p. ej. años del select_slider)
+        return [value for value in self.bitmaps[column] if low <= value <= high]
+
+    def select(self, selection):
+        """Máscara booleana de filas para `selection` ({columna: valores permitidos})."""
+        key = tuple(sorted((column, frozenset(values)) for column, values in selection.items()))
+        with self._lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                return self._memo[key]
+
+        n_bytes = (self.n_rows + 7) // 8
+        result = np.full(n_bytes, 0xFF, dtype=np.uint8)
+        for column, values in selection.items():
+            bitmaps = self.bitmaps[column]
+            dimension = np.zeros(n_bytes, dtype=np.uint8)
+            for value in values:
+                if value in bitmaps:
+                    np.bitwise_or(dimension, bitmaps[value], out=dimension)
+            np.bitwise_and(result, dimension, out=result)
+
+        mask = np.unpackbits(result, count=self.n_rows).view(bool)
+        # La máscara se comparte entre sesiones, así que se protege contra escrituras
+        mask.flags.writeable = False
+        with self._lock:
+            self._memo[key] = mask
+            if len(self._memo) > self._memo_size:
+                self._memo.popitem(last=False)
+        return mask
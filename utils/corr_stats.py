@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+from utils import filters
+
+
+class CorrelationStats:
+    """Estadísticos suficientes (n, Σx, Σxy) por partición para calcular correlaciones.
+
+    Se agrupan las filas por `partition_columns` y se guardan las sumas de cada partición.
+    La matriz de correlación de cualquier filtro que se exprese sobre esas columnas se
+    obtiene sumando las particiones seleccionadas y normalizando, sin volver a leer filas.
+    Las columnas de `value_columns` no deben tener nulos.
+    """
+
+    def __init__(self, data, partition_columns, value_columns):
+        self.value_columns = list(value_columns)
+        groups = data.groupby(partition_columns, observed=True, sort=False)
+        group_ids = groups.ngroup().to_numpy()
+        self.partitions = groups.size().reset_index(name="n")
+        n_partitions = len(self.partitions)
+
+        # Desplazar por la media global mejora la estabilidad numérica de Σxy (la covarianza no cambia)
+        values = data[self.value_columns].to_numpy(dtype=float)
+        values = values - values.mean(axis=0)
+        k = len(self.value_columns)
+        self.n = np.bincount(group_ids, minlength=n_partitions).astype(float)
+        self.sum_x = np.column_stack([
+            np.bincount(group_ids, weights=values[:, i], minlength=n_partitions) for i in range(k)
+        ]) if k else np.zeros((n_partitions, 0))
+        self.sum_xy = np.zeros((n_partitions, k, k))
+        for i in range(k):
+            for j in range(i, k):
+                products = np.bincount(group_ids, weights=values[:, i] * values[:, j], minlength=n_partitions)
+                self.sum_xy[:, i, j] = products
+                self.sum_xy[:, j, i] = products
+
+    def partition_mask(self, selection=None, ranges=None):
+        """Particiones que cumplen `selection` ({columna: valores}) y `ranges` ({columna: (mín, máx)})."""
+        mask = np.ones(len(self.partitions), dtype=bool)
+        for column, values in (selection or {}).items():
+            mask &= filters.isin_codes(self.partitions[column], values)
+        for column, (low, high) in (ranges or {}).items():
+            mask &= ((self.partitions[column] >= low) & (self.partitions[column] <= high)).to_numpy()
+        return mask
+
+    def correlation(self, selection=None, ranges=None):
+        """Matriz de correlación de Pearson de las filas de las particiones seleccionadas."""
+        mask = self.partition_mask(selection, ranges)
+        return correlation_matrix(
+            self.n[mask].sum(), self.sum_x[mask].sum(axis=0), self.sum_xy[mask].sum(axis=0), self.value_columns
+        )
+
+
+def correlation_matrix(n, sum_x, sum_xy, columns):
+    """Matriz de correlación de Pearson a partir de n, Σx (k) y Σxy (k × k) de un mismo conjunto de filas."""
+    if n == 0:
+        return pd.DataFrame(np.nan, index=columns, columns=columns)
+    mean = sum_x / n
+    covariance = sum_xy / n - np.outer(mean, mean)
+    std = np.sqrt(np.clip(np.diag(covariance), 0, None))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = covariance / np.outer(std, std)
+    corr[:, std == 0] = np.nan
+    corr[std == 0, :] = np.nan
+    np.fill_diagonal(corr, np.where(std > 0, 1.0, np.nan))
+    return pd.DataFrame(np.clip(corr, -1, 1), index=columns, columns=columns)
@@ -0,0 +1,116 @@
+import hashlib
+import json
+import os
+
+import pyarrow as pa
+
+# Carpeta donde se guardan las copias columnares (Arrow IPC) de cada CSV
+CACHE_DIR = os.environ.get("DASHBOARD_CACHE_DIR", "./dashboards_pages/data/.cache")
+
+
+def _file_sha256(path, chunk_size=1 << 20):
+    # Calcular el hash del archivo por bloques para no cargarlo entero en memoria
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_paths(name, cache_dir):
+    base = os.path.join(cache_dir, name)
+    return base + ".arrow", base + ".meta.json"
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_atomic(path, write_fn, mode="wb"):
+    # Escribir en un archivo temporal y renombrar, para que ningún lector vea un archivo a medias
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, mode) as file:
+        write_fn(file)
+    os.replace(tmp_path, path)
+
+
+def write_json(path, payload):
+    """Escribe `payload` como JSON de forma atómica (los lectores ven el archivo anterior o el nuevo)."""
+    _write_atomic(path, lambda file: json.dump(payload, file), mode="w")
+
+
+def _write_meta(meta_path, meta):
+    write_json(meta_path, meta)
+
+
+def is_fresh(source_path, meta, version):
+    """Indica si la copia en caché sigue siendo válida para el CSV de origen.
+
+    Primero se compara mtime y tamaño; solo si cambiaron se recalcula el hash,
+    de modo que un `touch` sin cambios de contenido no fuerza la reconstrucción.
+    """
+    if meta is None or meta.get("version") != version:
+        return False
+    stat = os.stat(source_path)
+    if meta.get("mtime_ns") == stat.st_mtime_ns and meta.get("size") == stat.st_size:
+        return True
+    return meta.get("sha256") == _file_sha256(source_path)
+
+
+def write_table(frame, arrow_path):
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+
+    def write(file):
+        with pa.ipc.new_file(file, table.schema) as writer:
+            writer.write_table(table)
+
+    _write_atomic(arrow_path, write)
+
+
+def read_table(arrow_path):
+    # Lectura mapeada en memoria: los buffers de Arrow apuntan directamente al archivo
+    with pa.memory_map(arrow_path, "r") as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def load_cached(name, source_path, build_fn, version=1, cache_dir=CACHE_DIR):
+    """Devuelve el DataFrame de `build_fn(source_path)` usando una copia Arrow IPC en disco.
+
+    La copia se reconstruye solo cuando cambia el CSV de origen (mtime/hash) o
+    la `version` del constructor, que debe incrementarse al cambiar las columnas derivadas.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    arrow_path, meta_path = _cache_paths(name, cache_dir)
+    meta = _read_meta(meta_path)
+
+    if os.path.exists(arrow_path) and is_fresh(source_path, meta, version):
+        stat = os.stat(source_path)
+        if meta.get("mtime_ns") != stat.st_mtime_ns or meta.get("size") != stat.st_size:
+            # Mismo contenido con otro mtime: actualizar la metadata para evitar rehashear
+            meta.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            _write_meta(meta_path, meta)
+    else:
+        write_table(build_fn(source_path), arrow_path)
+        stat = os.stat(source_path)
+        _write_meta(meta_path, {
+            "source": source_path,
+            "version": version,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": _file_sha256(source_path),
+        })
+
+    # Siempre se devuelve la versión leída del archivo, así los tipos son idénticos en frío y en caliente
+    return read_table(arrow_path).to_pandas(split_blocks=True)
+
+
+def cache_version(name, cache_dir=CACHE_DIR):
+    """Identificador de la versión de datos en caché (versión del constructor + hash del CSV)."""
+    meta = _read_meta(_cache_paths(name, cache_dir)[1])
+    if meta is None:
+        return None
+    return f"{meta['version']}-{meta['sha256'][:16]}"
@@ -0,0 +1,146 @@
+import ast
+import os
+
+import pandas as pd
+
+from utils import data_store, shared_store
+
+# Carpeta de los CSV (se puede cambiar, por ejemplo, para apuntar a datos sintéticos de benchmark)
+DATA_DIR = os.environ.get("DASHBOARD_DATA_DIR", "./dashboards_pages/data")
+
+UNICORNS_CSV = f"{DATA_DIR}/UnicornCompanies_2.csv"
+PORTS_CSV = f"{DATA_DIR}/Port_Data_pre.csv"
+SALES_CSV = f"{DATA_DIR}/supermarket_sales.csv"
+
+
+# --- Esquemas: columnas usadas, tipos explícitos y formato de fechas de cada CSV ---
+# Las columnas de baja cardinalidad se guardan como `category` para filtrar por código
+
+UNICORNS_SCHEMA = {
+    "usecols": ["Company", "Valuation", "Date Joined", "Industry", "Country", "Continent",
+                "Year Founded", "Funding", "Select Investors", "Latitude", "Longitude"],
+    "dtype": {
+        "Company": "string",
+        "Valuation": "float64",
+        "Industry": "category",
+        "Country": "category",
+        "Continent": "category",
+        "Year Founded": "int64",
+        "Funding": "float64",
+        "Select Investors": "string",
+        "Latitude": "float64",
+        "Longitude": "float64",
+    },
+    "dates": {"Date Joined": "%Y-%m-%d"},
+}
+
+PORTS_SCHEMA = {
+    "usecols": ["Country", "Port Name", "UN Code", "Vessels in Port", "Departures(Last 24 Hours)",
+                "Arrivals(Last 24 Hours)", "Expected Arrivals", "Type", "Area Local", "Area Global",
+                "Also known as"],
+    "dtype": {
+        "Country": "category",
+        "Port Name": "string",
+        "UN Code": "string",
+        "Vessels in Port": "float64",
+        "Departures(Last 24 Hours)": "float64",
+        "Arrivals(Last 24 Hours)": "float64",
+        "Expected Arrivals": "float64",
+        "Type": "category",
+        "Area Local": "category",
+        "Area Global": "category",
+        "Also known as": "string",
+    },
+    "dates": {},
+}
+
+SALES_SCHEMA = {
+    "usecols": ["Branch", "Gender", "Product line", "Unit price", "Quantity", "Tax 5%", "Total",
+                "Date", "Payment", "cogs", "gross income", "Rating"],
+    "dtype": {
+        "Branch": "category",
+        "Gender": "category",
+        "Product line": "category",
+        "Unit price": "float64",
+        "Quantity": "int64",
+        "Tax 5%": "float64",
+        "Total": "float64",
+        "Payment": "category",
+        "cogs": "float64",
+        "gross income": "float64",
+        "Rating": "float64",
+    },
+    "dates": {"Date": "%m/%d/%Y"},
+}
+
+
+def read_csv_with_schema(path, schema):
+    data = pd.read_csv(path, usecols=schema["usecols"], dtype=schema["dtype"])
+    for column, date_format in schema["dates"].items():
+        data[column] = pd.to_datetime(data[column], format=date_format, errors='coerce')
+    # Respetar el orden de columnas declarado en el esquema
+    return data[schema["usecols"]]
+
+
+# --- Constructores: leen el CSV y calculan las columnas derivadas una sola vez ---
+
+def build_unicorns(path):
+    data = read_csv_with_schema(path, UNICORNS_SCHEMA)
+    # Calcular 'Years to Unicorn' a partir de 'Date Joined'
+    data['Years to Unicorn'] = (data['Date Joined'].dt.year - data['Year Founded']).fillna(0).astype(int)
+    return data
+
+
+# Separador de los alias en la columna 'Also known as' ya procesada
+ALIAS_SEPARATOR = "; "
+
+
+def parse_aliases(value):
+    """Alias de un puerto a partir de la lista serializada del CSV (p. ej. "['SHANG HAI', ' YANGSHAN']")."""
+    if pd.isna(value):
+        return []
+    try:
+        aliases = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        aliases = [value]
+    # Se descartan los espacios sobrantes y los marcadores vacíos como '-'
+    return [alias.strip() for alias in aliases if alias.strip().strip("-")]
+
+
+def build_ports(path):
+    data = read_csv_with_schema(path, PORTS_SCHEMA)
+    data['Also known as'] = data['Also known as'].map(
+        lambda value: ALIAS_SEPARATOR.join(parse_aliases(value))
+    ).astype("string")
+    data['Vessels in Port'] = data['Vessels in Port'].fillna(0).astype(int)
+    data['Departures(Last 24 Hours)'] = data['Departures(Last 24 Hours)'].fillna(0).astype(int)
+    data['Arrivals(Last 24 Hours)'] = data['Arrivals(Last 24 Hours)'].fillna(0).astype(int)
+    data['Expected Arrivals'] = data['Expected Arrivals'].fillna(0).astype(int)
+    return data
+
+
+def build_sales(path):
+    data = read_csv_with_schema(path, SALES_SCHEMA)
+    data['Income'] = data['Total'] - data['gross income']
+    return data
+
+
+# --- Cargadores: usan la copia Arrow IPC en disco y solo reconstruyen si cambia el CSV ---
+
+def load_unicorns():
+    return data_store.load_cached("unicorns", UNICORNS_CSV, build_unicorns, version=3)
+
+
+def load_ports():
+    return data_store.load_cached("ports", PORTS_CSV, build_ports, version=3)
+
+
+def load_sales():
+    return data_store.load_cached("sales", SALES_CSV, build_sales, version=2)
+
+
+def dataset_version(name):
+    """Versión de los datos de `name` ("unicorns", "ports" o "sales") para claves de caché."""
+    if shared_store.enabled():
+        return shared_store.current_version(name)
+    return data_store.cache_version(name)
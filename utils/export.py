@@ -0,0 +1,78 @@
+import io
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import streamlit as st
+
+# Filas por bloque al exportar: cada bloque se serializa y se escribe antes de leer el siguiente
+EXPORT_CHUNK_ROWS = 100_000
+
+# Formato → (extensión, tipo MIME)
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+
+def frame_chunks(frame, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Bloques consecutivos de `frame` (vistas por posición, sin copiar el DataFrame entero)."""
+    for start in range(0, len(frame), chunk_rows):
+        yield frame.iloc[start:start + chunk_rows]
+
+
+def write_chunks(chunks, file, extension, columns):
+    """Escribe en `file` los DataFrames de `chunks` como CSV o Parquet, bloque a bloque.
+
+    En Parquet cada bloque es un row group; el esquema sale del primer bloque y los
+    siguientes se convierten a él. Si no llega ningún bloque se escribe un archivo
+    vacío con las columnas `columns`.
+    """
+    writer = None
+    for chunk in chunks:
+        if extension == "csv":
+            chunk.to_csv(file, header=writer is None, index=False)
+            writer = True
+            continue
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if writer is None:
+            writer = pq.ParquetWriter(file, table.schema)
+        writer.write_table(table.cast(writer.schema))
+    if writer is None:
+        write_chunks([pd.DataFrame(columns=list(columns))], file, extension, columns)
+    elif extension == "parquet":
+        writer.close()
+
+
+def export_file(chunks, extension, columns):
+    """Archivo exportado en memoria (`io.BytesIO` rebobinado), para entregarlo a `st.download_button`.
+
+    Streamlit lee el resultado completo para servirlo, así que no se gana nada volcándolo
+    a disco; escribir por bloques evita además tener el CSV entero como un único texto.
+    """
+    file = io.BytesIO()
+    write_chunks(chunks, file, extension, columns)
+    file.seek(0)
+    return file
+
+
+def export_controls(key, file_stem, columns, chunks_fn):
+    """Selector de formato y botón de descarga de la vista filtrada actual.
+
+    `chunks_fn()` devuelve los bloques (DataFrames) a exportar. Se pasa al botón como
+    función, así el archivo solo se genera cuando el usuario hace clic y no en cada
+    ejecución de la página, y el clic no vuelve a ejecutar el script.
+    """
+    col_format, col_button = st.columns([0.4, 0.6], vertical_alignment="bottom")
+    export_format = col_format.radio(
+        "Formato de exportación", list(EXPORT_FORMATS), horizontal=True, key=f"{key}_format"
+    )
+    extension, mime = EXPORT_FORMATS[export_format]
+    col_button.download_button(
+        label=f"Descargar datos filtrados ({export_format})",
+        data=lambda: export_file(chunks_fn(), extension, columns),
+        file_name=f"{file_stem}.{extension}",
+        mime=mime,
+        key=f"{key}_download",
+        on_click="ignore",
+    )
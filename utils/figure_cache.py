@@ -0,0 +1,64 @@
+import hashlib
+import json
+import os
+
+import pandas as pd
+import plotly.io as pio
+import streamlit as st
+
+from utils.result_cache import BudgetedCache
+
+# Presupuesto de memoria para las figuras serializadas (en MB)
+FIGURE_CACHE_MB = float(os.environ.get("DASHBOARD_FIGURE_CACHE_MB", 64))
+
+
+def _key_part(value):
+    # Un DataFrame o Series entra en la clave por su contenido completo (su repr se trunca)
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        row_hashes = pd.util.hash_pandas_object(value, index=True).to_numpy()
+        columns = list(value.columns) if isinstance(value, pd.DataFrame) else [value.name]
+        return [[str(column) for column in columns], hashlib.sha256(row_hashes.tobytes()).hexdigest()]
+    return str(value)
+
+
+def figure_key(*parts):
+    """Clave de contenido: hash de las partes (página, gráfico, versión de datos, filtros, DataFrames...)."""
+    payload = json.dumps(parts, sort_keys=True, default=_key_part)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class FigureCache(BudgetedCache):
+    """Caché de figuras de Plotly serializadas a JSON, limitada por tamaño en bytes.
+
+    En un acierto la figura se reconstruye desde el JSON guardado, sin volver a
+    agregar datos con pandas ni construir el gráfico con plotly.express. El tamaño de
+    cada entrada es el del JSON y el costo, el tiempo que tomó construir la figura.
+    """
+
+    def __init__(self, max_bytes=int(FIGURE_CACHE_MB * 1024 * 1024)):
+        super().__init__("figures", max_bytes)
+
+    def get(self, key):
+        figure_json = super().get(key)
+        return None if figure_json is None else pio.from_json(figure_json)
+
+    def put(self, key, figure, cost=0.0):
+        figure_json = figure.to_json()
+        super().put(key, figure_json, cost, size=len(figure_json.encode("utf-8")))
+
+
+# Una sola caché por proceso, compartida por todas las sesiones y páginas
+@st.cache_resource
+def get_figure_cache():
+    return FigureCache()
+
+
+def cached_figure(page, chart_id, dataset_version, build_fn, **inputs):
+    """Figura de `build_fn()` cacheada por página, gráfico, versión del dataset y `inputs`.
+
+    `inputs` son solo los valores de los que depende la figura: los filtros que usa,
+    sus parámetros propios o directamente el DataFrame (pequeño) que dibuja. Un filtro
+    que no cambia el gráfico no debe formar parte de la clave.
+    """
+    key = figure_key(page, chart_id, dataset_version, inputs)
+    return get_figure_cache().get_or_build(key, build_fn)
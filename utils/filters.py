@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+
+def category_options(series):
+    """Opciones ordenadas para un filtro a partir de las categorías de la columna."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.categories.tolist()
+    return sorted(series.dropna().unique())
+
+
+def isin_codes(series, values):
+    """Equivalente a `series.isin(values)` resuelto sobre los códigos enteros de la categoría.
+
+    Se construye una tabla booleana con una posición por categoría (más una al final
+    para los nulos, cuyo código es -1) y se indexa con los códigos de cada fila,
+    sin comparar cadenas fila por fila.
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return series.isin(values).to_numpy()
+    categories = series.cat.categories
+    lookup = np.zeros(len(categories) + 1, dtype=bool)
+    lookup[:-1] = categories.isin(list(values))
+    return lookup[series.cat.codes.to_numpy()]
+
+
+def observed_counts(series):
+    """`value_counts` sin las categorías que no aparecen en los datos filtrados."""
+    counts = series.value_counts()
+    return counts[counts > 0]
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+ZOOM_LEVELS = range(0, 13)
+# Número de celdas de la rejilla por cada tesela del mapa (a lo ancho) en un nivel de zoom
+CELLS_PER_TILE = 8
+
+
+class GridClusters:
+    """Agrupación espacial de puntos en una rejilla lat/lon por cada nivel de zoom.
+
+    Al construirse se asigna a cada fila su celda en todos los niveles de zoom y se
+    precalculan los clusters del dataset completo. Para un subconjunto filtrado los
+    clusters se obtienen con `np.bincount` sobre esos códigos, sin volver a calcular celdas.
+    """
+
+    def __init__(self, data, value_column="Valuation", label_column="Country", zoom_levels=ZOOM_LEVELS):
+        self.latitude = data["Latitude"].to_numpy(dtype=float)
+        self.longitude = data["Longitude"].to_numpy(dtype=float)
+        self.values = data[value_column].fillna(0).to_numpy(dtype=float)
+        labels = data[label_column].astype("category")
+        self.label_codes = labels.cat.codes.to_numpy()
+        self.label_names = np.asarray(labels.cat.categories.tolist(), dtype=object)
+        self.value_column = value_column
+        self.label_column = label_column
+
+        valid = ~(np.isnan(self.latitude) | np.isnan(self.longitude))
+        self.cell_codes = {}
+        self.n_cells = {}
+        for zoom in zoom_levels:
+            cell_size = 360 / (2 ** zoom) / CELLS_PER_TILE
+            rows = np.floor((self.latitude[valid] + 90) / cell_size).astype(np.int64)
+            cols = np.floor((self.longitude[valid] + 180) / cell_size).astype(np.int64)
+            cells, codes = np.unique(rows * (2 ** zoom * CELLS_PER_TILE) + cols, return_inverse=True)
+            zoom_codes = np.full(len(valid), -1, dtype=np.int32)
+            zoom_codes[valid] = codes
+            self.cell_codes[zoom] = zoom_codes
+            self.n_cells[zoom] = len(cells)
+
+        everything = np.ones(len(valid), dtype=bool)
+        self.clusters = {zoom: self._aggregate(zoom, everything) for zoom in zoom_levels}
+
+    def _aggregate(self, zoom, mask):
+        codes = self.cell_codes[zoom][mask]
+        keep = codes >= 0
+        codes = codes[keep]
+        n_cells = self.n_cells[zoom]
+        count = np.bincount(codes, minlength=n_cells)
+        occupied = count > 0
+        latitude = np.bincount(codes, weights=self.latitude[mask][keep], minlength=n_cells)
+        longitude = np.bincount(codes, weights=self.longitude[mask][keep], minlength=n_cells)
+        values = np.bincount(codes, weights=self.values[mask][keep], minlength=n_cells)
+
+        # Etiqueta dominante por celda: la combinación (celda, etiqueta) más frecuente
+        labels = self.label_codes[mask][keep].astype(np.int64)
+        pairs, pair_counts = np.unique(codes.astype(np.int64) * (len(self.label_names) + 1) + labels + 1,
+                                       return_counts=True)
+        pair_cells = pairs // (len(self.label_names) + 1)
+        pair_labels = pairs % (len(self.label_names) + 1) - 1
+        order = np.lexsort((-pair_counts, pair_cells))
+        first = np.r_[True, pair_cells[order][1:] != pair_cells[order][:-1]]
+        dominant = np.full(n_cells, -1, dtype=np.int64)
+        dominant[pair_cells[order][first]] = pair_labels[order][first]
+
+        dominant = dominant[occupied]
+        return pd.DataFrame({
+            "latitude": latitude[occupied] / count[occupied],
+            "longitude": longitude[occupied] / count[occupied],
+            "Count": count[occupied],
+            self.value_column: values[occupied],
+            self.label_column: np.where(dominant >= 0, self.label_names[np.maximum(dominant, 0)], None),
+        })
+
+    def clusters_for(self, zoom, mask=None):
+        """Clusters del nivel `zoom` para las filas de `mask` (todas si es None)."""
+        if mask is None or mask.all():
+            return self.clusters[zoom]
+        return self._aggregate(zoom, np.asarray(mask, dtype=bool))
+
+    def zoom_for_budget(self, max_markers):
+        """Mayor nivel de zoom cuyo número de clusters no supera `max_markers`."""
+        fitting = [zoom for zoom, n_cells in self.n_cells.items() if n_cells <= max_markers]
+        return max(fitting) if fitting else min(self.n_cells)
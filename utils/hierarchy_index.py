@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from utils import filters
+
+
+class HierarchyIndex:
+    """Índice jerárquico País → Área Global → Área Local (→ Tipo) con los ids de fila de cada hoja.
+
+    Las hojas son las combinaciones observadas de `levels` y se guardan ordenadas, de modo
+    que las hojas de cada país son contiguas. Las opciones de cada filtro dependiente y las
+    filas finales se obtienen combinando hojas, sin recorrer la tabla completa.
+
+    Las filas con algún nivel nulo forman sus propias hojas (ordenadas al final): entran
+    cuando no se filtra por ese nivel y quedan fuera cuando se filtra, igual que con
+    `isin` sobre la tabla, pero el nulo no aparece entre las opciones.
+    """
+
+    def __init__(self, data, levels):
+        self.levels = list(levels)
+        groups = data.groupby(self.levels, observed=True, sort=True, dropna=False)
+        leaf_ids = groups.ngroup().to_numpy()
+        self.leaves = groups.size().reset_index(name="n_rows")
+        # Ids de fila agrupados por hoja (formato CSR: `row_ids[offsets[i]:offsets[i + 1]]`)
+        self.row_ids = np.argsort(leaf_ids, kind="stable")
+        self.offsets = np.concatenate([[0], np.cumsum(self.leaves["n_rows"].to_numpy())])
+
+        top_level = self.levels[0]
+        # Se comparan códigos y no valores para que el bloque de hojas sin país (NaN != NaN) quede junto
+        top_codes = pd.factorize(self.leaves[top_level], use_na_sentinel=True)[0]
+        bounds = np.flatnonzero(np.r_[True, top_codes[1:] != top_codes[:-1]])
+        ends = np.r_[bounds[1:], len(self.leaves)]
+        self.top_slices = {
+            self.leaves[top_level].iloc[start]: (start, end) for start, end in zip(bounds, ends)
+        }
+        self.all_leaves = np.arange(len(self.leaves))
+
+    def leaves_for(self, values):
+        """Hojas bajo los valores seleccionados del primer nivel (todas si no hay selección)."""
+        if not values:
+            return self.all_leaves
+        ranges = [np.arange(*self.top_slices[value]) for value in values if value in self.top_slices]
+        return np.concatenate(ranges) if ranges else self.all_leaves[:0]
+
+    def restrict(self, leaves, level, values):
+        """Hojas de `leaves` cuyo valor en `level` está en `values`."""
+        return leaves[filters.isin_codes(self.leaves[level].iloc[leaves], values)]
+
+    def options(self, leaves, level):
+        """Valores ordenados de `level` presentes en `leaves`, para las opciones del filtro."""
+        return sorted(self.leaves[level].iloc[leaves].dropna().unique())
+
+    def rows(self, leaves):
+        """Posiciones de fila (en el orden original) de todas las hojas de `leaves`."""
+        if len(leaves) == 0:
+            return self.row_ids[:0]
+        row_ids = np.concatenate([self.row_ids[self.offsets[leaf]:self.offsets[leaf + 1]] for leaf in leaves])
+        return np.sort(row_ids)
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+class InvestorIndex:
+    """Índice invertido inversionista → compañías sobre una matriz dispersa inversionista × compañía.
+
+    La columna de inversionistas (nombres separados por comas) se tokeniza una sola vez con
+    operaciones vectorizadas de pandas. Cada fila de `matrix` (CSR) es la lista de compañías
+    de un inversionista, de modo que el filtro, el valor del portafolio y los pares de
+    coinversión se resuelven con productos de matrices dispersas y no recorriendo cadenas.
+    """
+
+    def __init__(self, investors, separator=","):
+        tokens = investors.str.split(separator).explode().str.strip()
+        tokens = tokens[tokens.notna() & (tokens != "")]
+        # Índice de fila de cada compañía (posición en el dataset) y código de cada inversionista
+        companies = investors.index.get_indexer(tokens.index)
+        codes, self.investors = pd.factorize(tokens.to_numpy(), sort=True)
+        self.n_companies = len(investors)
+        self.matrix = sparse.csr_matrix(
+            (np.ones(len(codes), dtype=np.float64), (codes, companies)),
+            shape=(len(self.investors), self.n_companies)
+        )
+        # Un inversionista listado dos veces en la misma compañía cuenta una sola vez
+        self.matrix.sum_duplicates()
+        self.matrix.data[:] = 1.0
+        self._positions = pd.Series(np.arange(len(self.investors)), index=self.investors)
+
+    def options(self):
+        return self.investors.tolist()
+
+    def companies_mask(self, selected):
+        """Máscara de compañías con al menos uno de los inversionistas `selected` (lista de posting-lists)."""
+        ids = self._positions.reindex(selected).dropna().to_numpy(dtype=np.int64)
+        mask = np.zeros(self.n_companies, dtype=bool)
+        mask[self.matrix[ids].indices] = True
+        return mask
+
+    def top_by_valuation(self, valuation, company_mask, top_n=10):
+        """Inversionistas con mayor valoración sumada de sus compañías dentro de `company_mask`."""
+        weights = np.where(company_mask, np.nan_to_num(np.asarray(valuation, dtype=float)), 0.0)
+        portfolio = self.matrix @ weights
+        companies = self.matrix @ company_mask.astype(np.float64)
+        top = np.argsort(-portfolio, kind="stable")[:top_n]
+        top = top[portfolio[top] > 0]
+        return pd.DataFrame({
+            "Investor": self.investors[top],
+            "Companies": companies[top].astype(int),
+            "Portfolio Valuation": portfolio[top],
+        })
+
+    def co_investment_pairs(self, company_mask, top_n=10, max_investors=500):
+        """Pares de inversionistas con más compañías en común dentro de `company_mask`.
+
+        Se usa `B · Bᵀ` sobre las columnas filtradas, limitado a los `max_investors`
+        inversionistas con más compañías para acotar el tamaño del producto.
+        """
+        filtered = self.matrix @ sparse.diags(company_mask.astype(np.float64))
+        portfolio_sizes = np.asarray(filtered.sum(axis=1)).ravel()
+        active = np.flatnonzero(portfolio_sizes >= 2)
+        if len(active) > max_investors:
+            active = active[np.argsort(-portfolio_sizes[active], kind="stable")[:max_investors]]
+        shared = sparse.triu(filtered[active] @ filtered[active].T, k=1).tocoo()
+        order = np.lexsort((shared.col, shared.row, -shared.data))[:top_n]
+        return pd.DataFrame({
+            "Investor A": self.investors[active[shared.row[order]]],
+            "Investor B": self.investors[active[shared.col[order]]],
+            "Shared Companies": shared.data[order].astype(int),
+        })
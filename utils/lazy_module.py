@@ -0,0 +1,19 @@
+import importlib
+
+
+class LazyModule:
+    """Módulo que se importa la primera vez que se usa uno de sus atributos.
+
+    `px = LazyModule("plotly.express")` permite escribir `px.bar(...)` sin pagar la
+    importación al cargar la página: si todas las figuras salen de la caché, nunca se importa.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attribute):
+        if self._module is None:
+            # `import_module` usa los bloqueos de importación de Python, por lo que es seguro entre hilos
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attribute)
@@ -0,0 +1,106 @@
+import unicodedata
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+NGRAM = 3
+
+
+def normalize(text):
+    """Mayúsculas, sin acentos y con los espacios colapsados, para comparar nombres."""
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(text.upper().split())
+
+
+def ngrams(text):
+    """Trigramas del texto normalizado, con relleno al inicio para que los prefijos cortos también coincidan."""
+    padded = f"{'$' * (NGRAM - 1)}{text}$"
+    return {padded[i:i + NGRAM] for i in range(len(padded) - NGRAM + 1)}
+
+
+class NgramIndex:
+    """Índice invertido de trigramas para búsqueda difusa de texto.
+
+    Cada clave (nombre, alias, código…) apunta a una fila del dataset; varias claves
+    pueden apuntar a la misma fila. Una consulta solo recorre las listas de claves de
+    sus trigramas: la similitud es el índice de Jaccard entre trigramas, con un
+    bonus si la clave empieza por la consulta o es igual a ella, y cada fila se
+    puntúa con su mejor clave.
+    """
+
+    def __init__(self, keys, rows):
+        self.keys = [normalize(key) for key in keys]
+        self.rows = np.asarray(rows, dtype=np.int64)
+        postings = defaultdict(list)
+        self.key_sizes = np.zeros(len(self.keys), dtype=np.int32)
+        for key_id, key in enumerate(self.keys):
+            grams = ngrams(key)
+            self.key_sizes[key_id] = len(grams)
+            for gram in grams:
+                postings[gram].append(key_id)
+        self.postings = {gram: np.asarray(ids, dtype=np.int32) for gram, ids in postings.items()}
+        # Claves ordenadas: las que empiezan por la consulta forman un rango contiguo (búsqueda binaria)
+        self.sorted_ids = np.argsort(np.asarray(self.keys, dtype=object), kind="stable").astype(np.int32)
+        self.sorted_keys = np.asarray(self.keys, dtype=object)[self.sorted_ids]
+        self.max_keys_per_row = int(np.bincount(self.rows).max()) if len(self.rows) else 0
+
+    @classmethod
+    def from_columns(cls, data, columns, separator=None):
+        """Índice sobre varias columnas de `data`; si se indica `separator`, cada celda se divide en varias claves."""
+        keys, rows = [], []
+        for column in columns:
+            for row, value in enumerate(data[column]):
+                if pd.isna(value):
+                    continue
+                for key in (value.split(separator) if separator else [value]):
+                    if key:
+                        keys.append(key)
+                        rows.append(row)
+        return cls(keys, rows)
+
+    def _prefix_ids(self, query):
+        # Claves iguales a la consulta y claves que empiezan por ella
+        start = np.searchsorted(self.sorted_keys, query, side="left")
+        exact_stop = np.searchsorted(self.sorted_keys, query, side="right")
+        stop = np.searchsorted(self.sorted_keys, query + "\uffff", side="left")
+        return self.sorted_ids[start:exact_stop], self.sorted_ids[start:stop]
+
+    def search(self, query, limit=10, min_score=0.2):
+        """Filas que mejor coinciden con `query`: DataFrame con `row`, `match` (la clave) y `score`, ordenado."""
+        query = normalize(query)
+        results = pd.DataFrame({"row": pd.Series(dtype="int64"), "match": pd.Series(dtype=object),
+                                "score": pd.Series(dtype=float)})
+        grams = ngrams(query) if query else set()
+        lists = [self.postings[gram] for gram in grams if gram in self.postings]
+        if not lists:
+            return results
+
+        # Trigramas compartidos por cada clave candidata
+        candidates, shared = np.unique(np.concatenate(lists), return_counts=True)
+        scores = shared / (len(grams) + self.key_sizes[candidates] - shared)
+
+        # Las coincidencias exactas y por prefijo van primero aunque la clave sea más larga
+        exact_ids, prefix_ids = self._prefix_ids(query)
+        scores += 0.5 * np.isin(candidates, prefix_ids) + 0.5 * np.isin(candidates, exact_ids)
+        keep = scores >= min_score
+        candidates, scores = candidates[keep], scores[keep]
+
+        # Basta ordenar las mejores claves que pueden cubrir `limit` filas distintas
+        top = limit * self.max_keys_per_row
+        if len(candidates) > top:
+            best = np.argpartition(-scores, top)[:top]
+            candidates, scores = candidates[best], scores[best]
+        order = np.lexsort((candidates, -scores))
+        candidates, scores = candidates[order], scores[order]
+
+        # Mejor clave por fila y las `limit` filas con mayor puntaje
+        rows = self.rows[candidates]
+        _, first = np.unique(rows, return_index=True)
+        first = np.sort(first)[:limit]
+        return pd.DataFrame({
+            "row": rows[first],
+            "match": [self.keys[key_id] for key_id in candidates[first]],
+            "score": scores[first],
+        })
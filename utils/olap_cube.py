@@ -0,0 +1,55 @@
+import numpy as np
+
+from utils import filters
+from utils.sorted_index import SortedIndex
+
+
+class OlapCube:
+    """Cubo preagregado: una fila por combinación observada de las dimensiones,
+    con el número de filas (`Count`) y la suma de cada medida.
+
+    Los gráficos se responden filtrando y reagrupando el cubo, por lo que su coste
+    depende del número de grupos y no del número de filas originales.
+    """
+
+    def __init__(self, cells, dimensions, measures):
+        self.cells = cells
+        self.dimensions = list(dimensions)
+        self.measures = ["Count"] + list(measures)
+        # Índices ordenados por dimensión para los filtros de rango, construidos al primer uso
+        self._range_indexes = {}
+
+    @classmethod
+    def build(cls, data, dimensions, measures):
+        aggregations = {"Count": (dimensions[0], "size")}
+        aggregations.update({measure: (measure, "sum") for measure in measures})
+        cells = data.groupby(dimensions, observed=True, dropna=False).agg(**aggregations).reset_index()
+        return cls(cells, dimensions, measures)
+
+    def _range_index(self, column):
+        if column not in self._range_indexes:
+            self._range_indexes[column] = SortedIndex(self.cells[column])
+        return self._range_indexes[column]
+
+    def slice(self, selection, ranges=None):
+        """Subcubo con las celdas que cumplen `selection` ({dimensión: valores permitidos})
+        y `ranges` ({dimensión: (mín, máx)}, resuelto con búsqueda binaria)."""
+        # Los rangos reducen primero las celdas a sus posiciones; la selección se evalúa solo sobre ellas
+        rows = None
+        for column, (low, high) in (ranges or {}).items():
+            column_rows = self._range_index(column).rows(low, high)
+            rows = column_rows if rows is None else np.intersect1d(rows, column_rows, assume_unique=True)
+        cells = self.cells if rows is None else self.cells.take(rows)
+        mask = None
+        for column, values in selection.items():
+            column_mask = filters.isin_codes(cells[column], values)
+            mask = column_mask if mask is None else mask & column_mask
+        cells = cells if mask is None else cells[mask]
+        return OlapCube(cells, self.dimensions, self.measures[1:])
+
+    def total(self, measure):
+        return self.cells[measure].sum()
+
+    def rollup(self, by):
+        """Agrega las celdas a las dimensiones `by`, sumando el conteo y las medidas."""
+        return self.cells.groupby(by, observed=True)[self.measures].sum().reset_index()
@@ -0,0 +1,122 @@
+import pandas as pd
+
+from utils import filters
+
+
+# --- dashboard01: unicornios ---
+
+def calculate_percentage_above_below(df, column):
+    """Media de `column` y porcentaje de compañías por encima y por debajo de ella."""
+    mean_value = df[column].mean()
+    above_mean = (df[column] > mean_value).sum()
+    below_mean = (df[column] < mean_value).sum()
+    total = len(df)
+
+    above_percentage = (above_mean / total) * 100 if total > 0 else 0
+    below_percentage = (below_mean / total) * 100 if total > 0 else 0
+
+    return mean_value, above_percentage, below_percentage
+
+
+def year_totals(cube):
+    """Conteo y sumas de Funding y Valuation por año de fundación (desde el cubo)."""
+    return cube.rollup(["Year Founded"])[["Year Founded", "Count", "Funding", "Valuation"]]
+
+
+def industry_counts(cube):
+    """Conteo de compañías por industria (desde el cubo)."""
+    return cube.rollup(["Industry"])[["Industry", "Count"]]
+
+
+def top_country_counts(cube):
+    """Conteo de compañías de los 5 principales países y "Otros" (desde el cubo)."""
+    top_countries_data = cube.rollup(["Country"]).set_index("Country")["Count"].sort_values(ascending=False, kind="stable")
+    top_countries = top_countries_data.nlargest(5)
+    other_countries_count = top_countries_data.iloc[5:].sum()
+
+    # Crear un DataFrame con los principales países y "Otros"
+    top_countries_df = pd.concat([top_countries, pd.Series(other_countries_count, index=["Otros"])]).reset_index()
+    top_countries_df.columns = ["Country", "Count"]
+    return top_countries_df
+
+
+# Gráfico → datos que lo alimentan, calculados desde el cubo filtrado
+UNICORN_CHARTS = {
+    "by_year": year_totals,
+    "industry": industry_counts,
+    "top_countries": top_country_counts,
+}
+
+
+def unicorn_selection(filter_index, start_year, end_year, continents, industries):
+    """Selección de dashboard01 para el índice de bitmaps y el cubo."""
+    return {
+        "Year Founded": filter_index.values_between("Year Founded", start_year, end_year),
+        "Continent": continents,
+        "Industry": industries,
+    }
+
+
+def unicorn_kpis(filtered_data, cube):
+    """Total y porcentaje de compañías por encima/debajo de la media de Funding y Valuation."""
+    kpis = {"rows": len(filtered_data)}
+    for column in ["Funding", "Valuation"]:
+        _, above_percentage, below_percentage = calculate_percentage_above_below(filtered_data, column)
+        kpis[column] = {
+            "total": float(cube.total(column)),
+            "above_pct": float(above_percentage),
+            "below_pct": float(below_percentage),
+        }
+    return kpis
+
+
+def unicorn_charts(cube):
+    return {chart_id: build_fn(cube) for chart_id, build_fn in UNICORN_CHARTS.items()}
+
+
+# --- dashboard02: puertos ---
+
+def category_counts(data, column):
+    """Filas por cada valor observado de `column`, de mayor a menor, con las columnas `[column, "Count"]`."""
+    counts = filters.observed_counts(data[column]).reset_index()
+    counts.columns = [column, "Count"]
+    return counts
+
+
+# Gráfico → columna cuyos conteos lo alimentan
+PORT_CHARTS = {
+    "country": "Country",
+    "type": "Type",
+    "area_global": "Area Global",
+}
+
+
+def port_kpis(filtered_data):
+    """Métricas generales de dashboard02."""
+    return {
+        "ports": len(filtered_data['Port Name'].unique()),
+        "vessels": int(filtered_data['Vessels in Port'].sum()),
+        "departures": int(filtered_data['Departures(Last 24 Hours)'].sum()),
+        "arrivals": int(filtered_data['Arrivals(Last 24 Hours)'].sum()),
+    }
+
+
+def port_charts(filtered_data):
+    return {chart_id: category_counts(filtered_data, column) for chart_id, column in PORT_CHARTS.items()}
+
+
+# --- dashboard03: ventas ---
+
+def rollup_summary(rollup):
+    """Resumen de ventas de dashboard03 desde los agregados diarios, con la forma de `SalesDataset.summary()`."""
+    return {
+        "rows": int(rollup.total('Count')),
+        "total": float(rollup.total('Total')),
+        "gender": rollup.rollup(['Gender'])[['Gender', 'Total']],
+        "payment": rollup.rollup(['Payment'])[['Payment', 'Total']],
+    }
+
+
+def sales_summary(snapshot):
+    """Resumen de ventas (como `rollup_summary()`) a partir de un snapshot de dashboard03."""
+    return dict(snapshot["kpis"], gender=snapshot["charts"]["gender"], payment=snapshot["charts"]["payment"])
@@ -0,0 +1,92 @@
+import math
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils import filters
+
+PAGE_SIZES = [25, 50, 100, 250, 500]
+ORIGINAL_ORDER = "(orden original)"
+
+
+# Orden completo de una columna del dataset base, calculado una vez y compartido entre sesiones
+@st.cache_resource(max_entries=64)
+def _column_order(_base, dataset_key, n_rows, column, ascending):
+    ordered = _base[column].sort_values(ascending=ascending, kind="stable", na_position="last")
+    return ordered.index.to_numpy()
+
+
+def _search_mask(view, text):
+    # Búsqueda sin distinguir mayúsculas en las columnas de texto; las categóricas se resuelven por código
+    text = text.lower()
+    mask = np.zeros(len(view), dtype=bool)
+    for column in view.columns:
+        series = view[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            categories = series.cat.categories
+            matches = categories[categories.astype(str).str.lower().str.contains(text, regex=False)]
+            mask |= filters.isin_codes(series, matches)
+        elif series.dtype == object or pd.api.types.is_string_dtype(series.dtype):
+            mask |= series.str.lower().str.contains(text, regex=False).to_numpy(dtype=bool, na_value=False)
+    return mask
+
+
+def _sorted_labels(base, dataset_key, view, column, ascending):
+    labels = view.index.to_numpy()
+    if column == ORIGINAL_ORDER:
+        return labels
+    if column not in base.columns:
+        # Columna derivada que solo existe en la vista: se ordena directamente sobre las filas filtradas
+        return view[column].sort_values(ascending=ascending, kind="stable", na_position="last").index.to_numpy()
+    # Reutilizar el orden global de la columna y quedarse con las filas presentes en la vista
+    order = _column_order(base, dataset_key, len(base), column, ascending)
+    in_view = np.zeros(len(base), dtype=bool)
+    in_view[labels] = True
+    return order[in_view[order]]
+
+
+def paginated_table(base, view, key, dataset_key, style_fn=None, default_sort=ORIGINAL_ORDER,
+                    default_ascending=True, **dataframe_kwargs):
+    """Tabla paginada: busca, ordena y estiliza en el servidor solo la ventana visible.
+
+    `base` es el dataset completo (con índice 0..n-1) y `view` el subconjunto filtrado
+    que se quiere mostrar, cuyas etiquetas de índice son posiciones de `base`.
+    `style_fn` recibe la ventana visible y devuelve un `Styler`.
+    """
+    search_col, sort_col, order_col, size_col = st.columns([0.4, 0.3, 0.15, 0.15])
+    search = search_col.text_input("Buscar", key=f"{key}_search", placeholder="Buscar en la tabla...")
+    sort_options = [ORIGINAL_ORDER] + list(view.columns)
+    sort_column = sort_col.selectbox(
+        "Ordenar por", sort_options, index=sort_options.index(default_sort), key=f"{key}_sort"
+    )
+    ascending = order_col.selectbox(
+        "Orden", ["Ascendente", "Descendente"], index=0 if default_ascending else 1, key=f"{key}_order"
+    ) == "Ascendente"
+    page_size = size_col.selectbox("Filas por página", PAGE_SIZES, index=1, key=f"{key}_page_size")
+
+    if search:
+        view = view[_search_mask(view, search)]
+
+    total_rows = len(view)
+    n_pages = max(1, math.ceil(total_rows / page_size))
+    # Volver a la primera página al cambiar la búsqueda o el orden, y a una página válida si
+    # los filtros reducen el número de páginas (antes de crear el widget)
+    page_key = f"{key}_page"
+    table_state = (search, sort_column, ascending, page_size)
+    if st.session_state.get(f"{key}_state") != table_state:
+        st.session_state[f"{key}_state"] = table_state
+        st.session_state[page_key] = 1
+    elif st.session_state.get(page_key, 1) > n_pages:
+        st.session_state[page_key] = n_pages
+    page = st.number_input("Página", min_value=1, max_value=n_pages, step=1, key=page_key)
+
+    labels = _sorted_labels(base, dataset_key, view, sort_column, ascending)
+    start = (page - 1) * page_size
+    window = view.loc[labels[start:start + page_size]]
+
+    st.caption(
+        f"Mostrando filas {min(start + 1, total_rows):,}–{min(start + page_size, total_rows):,} "
+        f"de {total_rows:,} (página {page} de {n_pages})"
+    )
+    st.dataframe(style_fn(window) if style_fn else window, **dataframe_kwargs)
@@ -0,0 +1,119 @@
+import heapq
+import json
+import os
+import threading
+import time
+from collections import Counter
+
+import pandas as pd
+
+from utils import datasets
+
+# Log append-only de eventos, una línea JSON por evento:
+# {"ts": "2024-05-01T10:15:00Z", "port": "SHANGHAI", "event": "arrival"}
+EVENTS_PATH = f"{datasets.DATA_DIR}/port_events.jsonl"
+WINDOW_SECONDS = 24 * 60 * 60
+
+
+def _event_time(value):
+    # Se aceptan segundos epoch o fechas ISO 8601
+    if isinstance(value, (int, float)):
+        return float(value)
+    return pd.Timestamp(value).timestamp()
+
+
+class PortEventStream:
+    """Contadores por puerto alimentados incrementalmente desde un log JSONL.
+
+    Cada `poll()` lee solo las líneas nuevas desde el último desplazamiento del archivo
+    y actualiza los contadores de la ventana móvil (llegadas y salidas de las últimas 24 h)
+    y el balance acumulado de buques, con coste proporcional al número de eventos nuevos.
+    Las líneas que no son JSON válido o a las que les falta un campo se saltan y se cuentan
+    en `invalid_events`.
+    """
+
+    def __init__(self, path=EVENTS_PATH, window_seconds=WINDOW_SECONDS, key_column="Port Name"):
+        self.path = path
+        self.window_seconds = window_seconds
+        self.key_column = key_column
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.offset = 0
+        self.events_processed = 0
+        self.invalid_events = 0
+        # Cambia cada vez que cambian los contadores (eventos nuevos o expirados)
+        self.version = 0
+        self.last_event_time = None
+        self.window = {"arrival": Counter(), "departure": Counter()}
+        self.net_vessels = Counter()
+        # Montículo por marca de tiempo: tolera eventos que llegan algo desordenados
+        self._window_events = []
+
+    def poll(self, now=None):
+        """Procesa los eventos añadidos al log y devuelve cuántos eran nuevos."""
+        with self._lock:
+            if not os.path.exists(self.path):
+                return 0
+            if os.path.getsize(self.path) < self.offset:
+                # El log fue truncado o rotado: empezar de nuevo desde el principio
+                self._reset()
+            now = time.time() if now is None else now
+            new_events = 0
+            with open(self.path, "rb") as file:
+                file.seek(self.offset)
+                for line in file:
+                    if not line.endswith(b"\n"):
+                        # Línea todavía a medio escribir: se leerá en el próximo poll
+                        break
+                    self.offset += len(line)
+                    if not line.strip():
+                        continue
+                    try:
+                        self._apply(json.loads(line), now - self.window_seconds)
+                    except (ValueError, KeyError, TypeError):
+                        # JSON inválido, campo faltante o marca de tiempo ilegible: el evento se descarta
+                        self.invalid_events += 1
+                        continue
+                    new_events += 1
+            self._expire(now - self.window_seconds)
+            return new_events
+
+    def _apply(self, event, window_start):
+        # Todos los campos se leen antes de tocar los contadores: un evento inválido no deja cambios a medias
+        kind = event["event"]
+        if kind not in self.window:
+            return
+        port = event["port"]
+        timestamp = _event_time(event["ts"])
+        self.net_vessels[port] += 1 if kind == "arrival" else -1
+        self.events_processed += 1
+        self.version += 1
+        if timestamp > window_start:
+            # Los eventos que ya quedan fuera de la ventana solo cuentan para el balance de buques
+            self.window[kind][port] += 1
+            heapq.heappush(self._window_events, (timestamp, port, kind))
+        self.last_event_time = max(timestamp, self.last_event_time or timestamp)
+
+    def _expire(self, window_start):
+        # Quitar de la ventana los eventos con más de 24 horas
+        while self._window_events and self._window_events[0][0] <= window_start:
+            _, port, kind = heapq.heappop(self._window_events)
+            self.version += 1
+            self.window[kind][port] -= 1
+            if not self.window[kind][port]:
+                del self.window[kind][port]
+
+    def apply_to(self, port_data):
+        """Copia de `port_data` con los conteos de 24 h y los buques en puerto según los eventos."""
+        with self._lock:
+            arrivals = pd.Series(self.window["arrival"], dtype="int64")
+            departures = pd.Series(self.window["departure"], dtype="int64")
+            net_vessels = pd.Series(self.net_vessels, dtype="int64")
+        keys = port_data[self.key_column].astype(object)
+        data = port_data.copy()
+        data['Arrivals(Last 24 Hours)'] = keys.map(arrivals).fillna(0).astype(int)
+        data['Departures(Last 24 Hours)'] = keys.map(departures).fillna(0).astype(int)
+        data['Vessels in Port'] = (data['Vessels in Port'] + keys.map(net_vessels).fillna(0).astype(int)).clip(lower=0)
+        return data
@@ -0,0 +1,231 @@
+import os
+
+import streamlit as st
+
+from utils import data_store, datasets, sales_dataset, shared_store, snapshots
+from utils.bitmap_index import BitmapIndex
+from utils.corr_stats import CorrelationStats
+from utils.figure_cache import figure_key
+from utils.geo_cluster import GridClusters
+from utils.hierarchy_index import HierarchyIndex
+from utils.investor_index import InvestorIndex
+from utils.ngram_index import NgramIndex
+from utils.olap_cube import OlapCube
+from utils.result_cache import get_result_cache
+from utils.sales_dataset import SalesDataset
+from utils.sorted_index import SortedIndex
+from utils.spatial_index import SpatialIndex
+
+# Datos y estructuras derivadas de cada dashboard, cacheados por proceso.
+# Viven fuera de las páginas para que el precalentamiento de main.py pueda construirlos.
+
+
+# --- Caché de resultados con presupuesto de memoria (DASHBOARD_RESULT_CACHE_MB) ---
+
+def cached_result(build_fn, *key_parts):
+    """Resultado de `build_fn()` guardado en la caché de resultados bajo la clave de `key_parts`.
+
+    Sirve para los resultados derivados de las páginas (subconjuntos filtrados, columnas
+    calculadas, cubos); los datasets base no pasan por aquí porque las estructuras derivadas
+    los mantienen en memoria aunque se expulsen. La clave debe incluir la versión de los
+    datos y los filtros. El resultado se comparte entre sesiones y no debe modificarse.
+    """
+    return get_result_cache().get_or_build(figure_key(*key_parts), build_fn)
+
+
+# --- Datasets base: cacheados por versión, fuera del presupuesto de la caché de resultados ---
+
+# Versión de cada dataset que usa este proceso
+_attached_versions = {}
+
+def _track_version(name, version):
+    # Nueva versión de los datos: las estructuras derivadas de la anterior ya no corresponden
+    if _attached_versions.get(name, version) != version:
+        for derived in DERIVED_RESOURCES[name]:
+            derived.clear()
+    _attached_versions[name] = version
+
+# Una versión del CSV de origen (mtime y tamaño), leída con una sola llamada a la copia Arrow local y
+# compartida por todas las sesiones del proceso
+@st.cache_resource(max_entries=6)
+def _local_frame(name, mtime_ns, size):
+    return DATASET_LOADERS[name]()
+
+def _load_local(name):
+    # El CSV se consulta en cada ejecución: si cambió, la copia Arrow se reconstruye en la siguiente carga
+    stat = os.stat(DATASET_SOURCES[name])
+    frame = _local_frame(name, stat.st_mtime_ns, stat.st_size)
+    # Las estructuras derivadas se descartan solo si cambió el contenido (no basta con tocar el archivo)
+    _track_version(name, data_store.cache_version(name))
+    return frame
+
+# Una versión publicada, mapeada en memoria y compartida por todas las sesiones del proceso
+@st.cache_resource(max_entries=6)
+def _shared_frame(name, version):
+    return shared_store.attach(name, version)
+
+def _load_shared(name):
+    # Si nadie publicó el dataset, este proceso hace de cargador
+    for _ in range(3):
+        version = shared_store.current_version(name) or shared_store.publish_if_missing(
+            name, DATASET_LOADERS[name], lambda: data_store.cache_version(name)
+        )
+        try:
+            frame = _shared_frame(name, version)
+        except FileNotFoundError:
+            # La versión se reemplazó entre leer el puntero y abrir el archivo: se reintenta con la nueva
+            continue
+        _track_version(name, version)
+        return frame
+    raise FileNotFoundError(f"No se pudo abrir la versión publicada de '{name}'")
+
+def load_dataset(name):
+    """Dataset `name` desde el almacén compartido (DASHBOARD_SHARED_STORE) o desde la copia Arrow local."""
+    if shared_store.enabled():
+        return _load_shared(name)
+    return _load_local(name)
+
+
+# --- Unicorn Companies (dashboard01) ---
+
+# Dataset desde la copia Arrow en disco, con 'Years to Unicorn' ya calculado
+def load_unicorns():
+    return load_dataset("unicorns")
+
+# Índice de bitmaps por continente, industria y año de fundación, construido una vez por dataset
+@st.cache_resource
+def load_unicorn_filter_index():
+    return BitmapIndex(load_unicorns(), ["Continent", "Industry", "Year Founded"])
+
+# Cubo con conteo, suma de Funding y suma de Valuation por año, continente, industria y país
+@st.cache_resource
+def load_unicorn_cube():
+    return OlapCube.build(load_unicorns(), ["Year Founded", "Continent", "Industry", "Country"], ["Funding", "Valuation"])
+
+# Clusters geográficos de las compañías precalculados para todos los niveles de zoom
+@st.cache_resource
+def load_unicorn_geo_clusters():
+    return GridClusters(load_unicorns())
+
+# Matriz dispersa inversionista × compañía a partir de 'Select Investors', tokenizada una sola vez
+@st.cache_resource
+def load_unicorn_investor_index():
+    return InvestorIndex(load_unicorns()['Select Investors'])
+
+# KD-tree de las coordenadas en la esfera unitaria para los filtros de radio, recuadro y vecinos más cercanos
+@st.cache_resource
+def load_unicorn_spatial_index():
+    return SpatialIndex(load_unicorns())
+
+
+# --- Puertos (dashboard02) ---
+
+# Dataset desde la copia Arrow en disco, con los conteos ya convertidos a enteros
+def load_ports():
+    return load_dataset("ports")
+
+# Índice País → Área Global → Área Local → Tipo con los ids de fila de cada combinación
+@st.cache_resource
+def load_port_area_index():
+    return HierarchyIndex(load_ports(), ["Country", "Area Global", "Area Local", "Type"])
+
+# Índice de trigramas sobre el nombre, los alias y el código UN de cada puerto para la búsqueda difusa
+@st.cache_resource
+def load_port_search_index():
+    return NgramIndex.from_columns(
+        load_ports(), ["Port Name", "Also known as", "UN Code"], separator=datasets.ALIAS_SEPARATOR
+    )
+
+
+# --- Ventas de supermercado (dashboard03) ---
+
+# Dataset desde la copia Arrow en disco, con 'Income' ya calculado
+def load_sales():
+    return load_dataset("sales")
+
+# Estadísticos suficientes por Sucursal × Género × Método de Pago × Fecha para la matriz de correlación
+@st.cache_resource
+def load_sales_correlation_stats():
+    sales = load_sales()
+    return CorrelationStats(sales, ["Branch", "Gender", "Payment", "Date"], sales.select_dtypes("number").columns)
+
+# Permutación de las ventas ordenadas por fecha: el rango de fechas se resuelve con búsqueda binaria
+@st.cache_resource
+def load_sales_date_index():
+    return SortedIndex(load_sales()['Date'])
+
+# Agregados diarios por Fecha × Sucursal × Género × Método de Pago × Línea de producto para las métricas y gráficos
+@st.cache_resource
+def load_sales_daily_rollup():
+    return OlapCube.build(
+        load_sales(), ["Date", "Branch", "Gender", "Payment", "Product line"], ["Total", "cogs", "gross income"]
+    )
+
+# Una versión del dataset Parquet particionado, compartida por todas las sesiones del proceso
+@st.cache_resource(max_entries=sales_dataset.KEEP_VERSIONS)
+def _sales_dataset_version(version):
+    return SalesDataset(sales_dataset.SALES_DATASET_DIR, version)
+
+# Dataset Parquet (modo fuera de memoria) en su versión vigente, o None si DASHBOARD_SALES_DATASET no está
+# configurado. El puntero se relee en cada ejecución, así una reconstrucción se ve sin reiniciar el servidor
+def load_sales_dataset():
+    if not sales_dataset.SALES_DATASET_DIR:
+        return None
+    return _sales_dataset_version(sales_dataset.current_version(sales_dataset.SALES_DATASET_DIR))
+
+# Resultado de una consulta de SalesDataset ("summary", "column_max", "correlation", "head", ...) por filtro.
+# `filter_args` son los argumentos de `filter_expression()`; la consulta se hace sobre la versión `version`
+# (`SalesDataset.version`), así el resultado cacheado siempre corresponde a ella.
+@st.cache_data(max_entries=64)
+def query_sales_dataset(version, query, filter_args, *args):
+    expression = sales_dataset.filter_expression(*filter_args)
+    return getattr(_sales_dataset_version(version), query)(expression, *args)
+
+
+# --- Archivos estáticos (p. ej. el reporte PDF de Power BI en dashboard02) ---
+
+# Contenido del archivo leído una sola vez por proceso y versión (mtime), compartido por todas las sesiones
+@st.cache_resource(max_entries=8)
+def _read_static_asset(path, mtime_ns):
+    with open(path, "rb") as file:
+        return file.read()
+
+def static_asset(path):
+    """Bytes del archivo estático `path`, o None si no existe."""
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return _read_static_asset(path, mtime_ns)
+
+
+# --- Snapshots precalculados por `python -m utils.snapshots` (DASHBOARD_SNAPSHOT_DIR) ---
+
+# Snapshots de una página, releídos cuando el renderizador reemplaza el manifiesto
+@st.cache_resource(max_entries=6)
+def _load_snapshot_set(page_dir, mtime_ns):
+    return snapshots.SnapshotSet(page_dir)
+
+def page_snapshot(page, data_version, selection):
+    """KPIs y datos de gráficos precalculados de `page` para `selection`, o None si no hay snapshot que coincida."""
+    if not snapshots.SNAPSHOT_DIR:
+        return None
+    page_dir = os.path.join(snapshots.SNAPSHOT_DIR, page)
+    try:
+        mtime_ns = os.stat(os.path.join(page_dir, snapshots.MANIFEST_FILE)).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return _load_snapshot_set(page_dir, mtime_ns).lookup(data_version, selection)
+
+
+# Constructores de cada dataset (copia Arrow en disco, reconstruida solo si cambia el CSV)
+DATASET_LOADERS = {"unicorns": datasets.load_unicorns, "ports": datasets.load_ports, "sales": datasets.load_sales}
+DATASET_SOURCES = {"unicorns": datasets.UNICORNS_CSV, "ports": datasets.PORTS_CSV, "sales": datasets.SALES_CSV}
+
+# Estructuras construidas a partir de cada dataset, que se descartan al publicarse una versión nueva
+DERIVED_RESOURCES = {
+    "unicorns": [load_unicorn_filter_index, load_unicorn_cube, load_unicorn_geo_clusters,
+                 load_unicorn_investor_index, load_unicorn_spatial_index],
+    "ports": [load_port_area_index, load_port_search_index],
+    "sales": [load_sales_date_index, load_sales_daily_rollup, load_sales_correlation_stats],
+}
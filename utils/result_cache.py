@@ -0,0 +1,167 @@
+import heapq
+import itertools
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils import telemetry
+
+# Presupuesto de memoria para los resultados derivados de las páginas (subconjuntos filtrados, cubos...) en MB
+RESULT_CACHE_MB = float(os.environ.get("DASHBOARD_RESULT_CACHE_MB", 512))
+
+
+def size_of(value, _seen=None):
+    """Bytes que ocupa `value` en memoria, incluido el contenido de texto de los DataFrames.
+
+    Los contenedores y los objetos simples (p. ej. un `OlapCube`) se recorren de forma
+    recursiva; cada objeto se cuenta una sola vez aunque aparezca varias veces.
+    """
+    _seen = set() if _seen is None else _seen
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (str, bytes, bytearray)):
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            size_of(key, _seen) + size_of(item, _seen) for key, item in value.items()
+        )
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(size_of(item, _seen) for item in value)
+    if hasattr(value, "__dict__"):
+        return sys.getsizeof(value) + size_of(vars(value), _seen)
+    return sys.getsizeof(value)
+
+
+class BudgetedCache:
+    """Caché en memoria limitada por bytes con expulsión LRU ponderada por costo (GreedyDual-Size).
+
+    Cada entrada guarda su tamaño real y su costo (segundos que tomó construirla). Su
+    prioridad es `reloj + costo / tamaño`: al usarse se renueva, y al expulsar sale la
+    de menor prioridad y el reloj sube hasta ella, así las entradas que llevan tiempo sin
+    usarse acaban saliendo aunque hayan sido caras. Entre entradas de igual costo se
+    comporta como LRU; a igual antigüedad, primero salen las grandes y baratas de rehacer.
+
+    Los aciertos, fallos, expulsiones, rechazos (entradas mayores que todo el presupuesto,
+    que no se guardan) y bytes residentes se exportan a Prometheus con la
+    etiqueta `cache=<name>`. Los valores se devuelven sin copiar: no deben modificarse.
+    `None` no se guarda (un `get` que devuelve None es un fallo).
+    """
+
+    def __init__(self, name, max_bytes):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rejections = 0
+        self._clock = 0.0
+        # clave -> (valor, tamaño, costo, prioridad, orden); el heap guarda (prioridad, orden, clave) y se limpia al
+        # expulsar. El orden identifica cada inserción: una entrada renovada puede repetir la prioridad anterior
+        self._entries = {}
+        self._heap = []
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+        self._metrics = telemetry.get_metrics()
+        self._metrics.cache_budget_bytes.labels(name).set(max_bytes)
+
+    def _priority(self, size, cost):
+        return self._clock + cost / max(size, 1)
+
+    def _push(self, key, value, size, cost):
+        priority = self._priority(size, cost)
+        order = next(self._order)
+        self._entries[key] = (value, size, cost, priority, order)
+        heapq.heappush(self._heap, (priority, order, key))
+
+    def _report(self):
+        self._metrics.cache_resident_bytes.labels(self.name).set(self.current_bytes)
+        self._metrics.cache_entries.labels(self.name).set(len(self._entries))
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                self._metrics.cache_misses.labels(self.name).inc()
+                return None
+            value, size, cost = entry[:3]
+            self._push(key, value, size, cost)
+            self.hits += 1
+            self._metrics.cache_hits.labels(self.name).inc()
+            # El heap acumula prioridades viejas; se compacta si crece demasiado respecto a las entradas
+            if len(self._heap) > 4 * len(self._entries) + 64:
+                self._heap = [(entry[3], entry[4], key) for key, entry in self._entries.items()]
+                heapq.heapify(self._heap)
+        return value
+
+    def put(self, key, value, cost=0.0, size=None):
+        """Guarda `value` con su costo de construcción en segundos; `size` se mide si no se indica."""
+        size = size_of(value) if size is None else size
+        with self._lock:
+            if size > self.max_bytes:
+                # No cabe en el presupuesto: no se guarda, pero queda contado para dimensionarlo
+                self.rejections += 1
+                self._metrics.cache_rejections.labels(self.name).inc()
+                return
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            self._push(key, value, size, cost)
+            self.current_bytes += size
+            # Expulsar las entradas de menor prioridad hasta volver al presupuesto
+            while self.current_bytes > self.max_bytes:
+                priority, order, evicted_key = heapq.heappop(self._heap)
+                entry = self._entries.get(evicted_key)
+                if entry is None or entry[4] != order:
+                    continue  # Inserción vieja de una entrada ya renovada o expulsada
+                del self._entries[evicted_key]
+                self.current_bytes -= entry[1]
+                self._clock = priority
+                self.evictions += 1
+                self._metrics.cache_evictions.labels(self.name).inc()
+            self._report()
+
+    def get_or_build(self, key, build_fn):
+        value = self.get(key)
+        if value is None:
+            start = time.perf_counter()
+            value = build_fn()
+            self.put(key, value, cost=time.perf_counter() - start)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._heap = []
+            self.current_bytes = 0
+            self._report()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "resident_bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "rejections": self.rejections,
+            }
+
+
+# Una sola caché de resultados por proceso, compartida por todas las sesiones y páginas
+@st.cache_resource
+def get_result_cache():
+    return BudgetedCache("results", int(RESULT_CACHE_MB * 1024 * 1024))
@@ -0,0 +1,263 @@
+import argparse
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from utils import data_store, datasets
+from utils.corr_stats import correlation_matrix
+
+# Dataset Parquet de ventas particionado por Sucursal y mes; si no se configura, dashboard03 usa la copia en memoria
+SALES_DATASET_DIR = os.environ.get("DASHBOARD_SALES_DATASET", "")
+
+# Filas del CSV que se leen por bloque al construir el dataset, y filas por row group en cada archivo
+CHUNK_ROWS = 500_000
+ROW_GROUP_ROWS = 128 * 1024
+
+# Versiones del dataset que se conservan al reconstruirlo: los procesos que todavía leen la anterior no la pierden
+KEEP_VERSIONS = 2
+
+# Puntero a la versión vigente (en la raíz del dataset) y catálogo de cada versión; el prefijo "_" hace que
+# pyarrow no los trate como archivos de datos
+POINTER_FILE = "current.json"
+CATALOG_FILE = "_catalog.json"
+
+PARTITIONING = ds.partitioning(pa.schema([("Branch", pa.string()), ("Month", pa.string())]), flavor="hive")
+
+# Columnas que lee cada consulta: solo las que necesita el resultado
+SUMMARY_COLUMNS = ["Gender", "Payment", "Total"]
+TABLE_COLUMNS = ["Date", "Branch", "Gender", "Product line", "Total", "Payment"]
+EXPORT_COLUMNS = datasets.SALES_SCHEMA["usecols"] + ["Income"]
+
+
+def _arrow_type(column, dtype):
+    if column in datasets.SALES_SCHEMA["dates"]:
+        return pa.date32()
+    return {"category": pa.string(), "float64": pa.float64(), "int64": pa.int64()}[dtype]
+
+
+# Esquema de los archivos Parquet: las categorías se guardan como texto (Parquet las codifica por diccionario)
+FILE_SCHEMA = pa.schema(
+    [(column, _arrow_type(column, datasets.SALES_SCHEMA["dtype"].get(column)))
+     for column in datasets.SALES_SCHEMA["usecols"]]
+    + [("Income", pa.float64()), ("Month", pa.string())]
+)
+
+
+def current_version(out_dir):
+    """Versión vigente del dataset en `out_dir`, o None si todavía no se construyó."""
+    try:
+        with open(os.path.join(out_dir, POINTER_FILE), "r", encoding="utf-8") as file:
+            return json.load(file)["version"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def build_sales_dataset(csv_path, out_dir, chunk_rows=CHUNK_ROWS):
+    """Convierte el CSV de ventas en una nueva versión del dataset Parquet particionado por `Branch` y `Month` (AAAA-MM).
+
+    El CSV se lee por bloques, así que sirve para archivos que no caben en memoria.
+    Dentro de cada bloque las filas se ordenan por fecha para que las estadísticas de
+    los row groups permitan descartar días fuera del rango. Mientras se escriben los
+    bloques se reúne el catálogo (opciones de filtro, rango de fechas y filas), que se
+    guarda junto a la versión para no tener que recorrer el dataset al abrirlo.
+
+    Cada versión vive en su propio directorio y el puntero `current.json` cambia a ella
+    solo al terminar; se conservan las `KEEP_VERSIONS` más recientes, así los procesos
+    que tienen abierta la anterior siguen leyéndola hasta pasar a la nueva.
+    """
+    schema = datasets.SALES_SCHEMA
+    dtype = {column: "string" if kind == "category" else kind for column, kind in schema["dtype"].items()}
+    version = time.strftime("%Y%m%dT%H%M%S") + f"-{time.time_ns() % 10**9:09d}"
+    version_dir = os.path.join(out_dir, version)
+    tmp_dir = f"{version_dir}.tmp"
+    os.makedirs(tmp_dir)
+
+    options = {"Branch": set(), "Gender": set(), "Payment": set()}
+    date_min = date_max = None
+    n_rows = 0
+    reader = pd.read_csv(csv_path, usecols=schema["usecols"], dtype=dtype, chunksize=chunk_rows)
+    for index, chunk in enumerate(reader):
+        for column, date_format in schema["dates"].items():
+            chunk[column] = pd.to_datetime(chunk[column], format=date_format, errors='coerce')
+        chunk = chunk.dropna(subset=["Date"]).sort_values("Date", kind="stable")
+        chunk['Income'] = chunk['Total'] - chunk['gross income']
+        chunk['Month'] = chunk['Date'].dt.strftime("%Y-%m")
+        table = pa.Table.from_pandas(chunk[FILE_SCHEMA.names], preserve_index=False).cast(FILE_SCHEMA)
+        ds.write_dataset(
+            table, tmp_dir, format="parquet", partitioning=PARTITIONING,
+            basename_template=f"part-{index:05d}-{{i}}.parquet",
+            max_rows_per_group=ROW_GROUP_ROWS, existing_data_behavior="overwrite_or_ignore"
+        )
+        n_rows += len(chunk)
+        for column, values in options.items():
+            values.update(chunk[column].dropna().unique())
+        if len(chunk):
+            date_min = min(date_min, chunk['Date'].iloc[0]) if date_min is not None else chunk['Date'].iloc[0]
+            date_max = max(date_max, chunk['Date'].iloc[-1]) if date_max is not None else chunk['Date'].iloc[-1]
+
+    data_store.write_json(os.path.join(tmp_dir, CATALOG_FILE), {
+        "options": {column: sorted(values) for column, values in options.items()},
+        "date_bounds": [None if date is None else date.date().isoformat() for date in (date_min, date_max)],
+        "n_rows": n_rows,
+    })
+    os.replace(tmp_dir, version_dir)
+    data_store.write_json(os.path.join(out_dir, POINTER_FILE), {"version": version, "built_at": time.time()})
+    _remove_old_versions(out_dir, version)
+    return version
+
+
+def _remove_old_versions(out_dir, current):
+    # Las versiones ordenan por fecha de construcción; se borran las que exceden KEEP_VERSIONS
+    versions = sorted(
+        name for name in os.listdir(out_dir)
+        if os.path.isdir(os.path.join(out_dir, name)) and not name.endswith(".tmp") and name <= current
+    )
+    for name in versions[:-KEEP_VERSIONS]:
+        shutil.rmtree(os.path.join(out_dir, name), ignore_errors=True)
+
+
+def filter_expression(branches, genders, payments, start, end):
+    """Expresión de filtro de pyarrow equivalente a los filtros laterales de dashboard03.
+
+    La condición sobre `Month` usa la clave de partición y evita abrir los archivos de
+    otros meses; la de `Date` descarta row groups por sus estadísticas mínimo/máximo.
+    """
+    return (
+        ds.field("Branch").isin(pa.array(list(branches), pa.string())) &
+        ds.field("Gender").isin(pa.array(list(genders), pa.string())) &
+        ds.field("Payment").isin(pa.array(list(payments), pa.string())) &
+        (ds.field("Month") >= start.strftime("%Y-%m")) &
+        (ds.field("Month") <= end.strftime("%Y-%m")) &
+        (ds.field("Date") >= start) &
+        (ds.field("Date") <= end)
+    )
+
+
+class SalesDataset:
+    """Ventas leídas desde Parquet con filtros y proyección empujados al escaneo.
+
+    Cada consulta recibe una expresión de `filter_expression()` y recorre por lotes solo
+    los archivos, row groups y columnas que necesita, acumulando el resultado lote a lote;
+    nunca se materializa el conjunto filtrado completo. Todas reciben la expresión como
+    primer argumento, así `resources.query_sales_dataset()` puede cachearlas por filtro.
+
+    El objeto queda fijo en una versión del dataset (la vigente si no se indica) y sus
+    opciones de filtro salen del catálogo guardado al construirla, sin recorrer los datos.
+    """
+
+    def __init__(self, path, version=None):
+        self.path = path
+        version = version or current_version(path)
+        if version is None:
+            raise FileNotFoundError(f"No hay un dataset de ventas en {path}: ejecute `python -m utils.sales_dataset`")
+        version_dir = os.path.join(path, version)
+        self.dataset = ds.dataset(version_dir, format="parquet", partitioning=PARTITIONING)
+        self.version = version
+        self.numeric_columns = [
+            field.name for field in self.dataset.schema
+            if pa.types.is_integer(field.type) or pa.types.is_floating(field.type)
+        ]
+        self._load_catalog(os.path.join(version_dir, CATALOG_FILE))
+
+    def _load_catalog(self, catalog_path):
+        # Opciones de los filtros, rango de fechas y número de filas reunidos al construir la versión
+        with open(catalog_path, "r", encoding="utf-8") as file:
+            catalog = json.load(file)
+        self.options = catalog["options"]
+        self.date_bounds = tuple(None if date is None else pd.Timestamp(date).date() for date in catalog["date_bounds"])
+        self.n_rows = catalog["n_rows"]
+
+    def batches(self, columns, expression=None):
+        return self.dataset.to_batches(columns=columns, filter=expression)
+
+    def _frames(self, columns, expression):
+        for batch in self.batches(columns, expression):
+            if batch.num_rows:
+                yield batch.to_pandas(date_as_object=False)
+
+    def summary(self, expression):
+        """Número de filas, total de ventas y ventas por género y por método de pago."""
+        n_rows, total = 0, 0.0
+        by_gender = pd.Series(dtype=float)
+        by_payment = pd.Series(dtype=float)
+        for frame in self._frames(SUMMARY_COLUMNS, expression):
+            n_rows += len(frame)
+            total += frame['Total'].sum()
+            by_gender = by_gender.add(frame.groupby('Gender')['Total'].sum(), fill_value=0)
+            by_payment = by_payment.add(frame.groupby('Payment')['Total'].sum(), fill_value=0)
+        return {
+            "rows": n_rows,
+            "total": total,
+            "gender": by_gender.rename_axis('Gender').reset_index(name='Total'),
+            "payment": by_payment.rename_axis('Payment').reset_index(name='Total'),
+        }
+
+    def column_max(self, expression, columns):
+        """Máximo de cada columna entre las filas filtradas (el texto se compara alfabéticamente)."""
+        maxima = {}
+        for batch in self.batches(list(columns), expression):
+            for column in columns:
+                value = pc.max(batch.column(column)).as_py()
+                if value is not None and (column not in maxima or value > maxima[column]):
+                    maxima[column] = value
+        if "Date" in maxima:
+            maxima["Date"] = pd.Timestamp(maxima["Date"])
+        return maxima
+
+    def correlation(self, expression):
+        """Matriz de correlación de las columnas numéricas acumulando n, Σx y Σxy por lote."""
+        k = len(self.numeric_columns)
+        n, sum_x, sum_xy = 0, np.zeros(k), np.zeros((k, k))
+        shift = None
+        for frame in self._frames(self.numeric_columns, expression):
+            values = frame.to_numpy(dtype=float)
+            # Desplazar por la media del primer lote mejora la estabilidad de Σxy (la covarianza no cambia)
+            if shift is None:
+                shift = values.mean(axis=0)
+            values = values - shift
+            n += len(values)
+            sum_x += values.sum(axis=0)
+            sum_xy += values.T @ values
+        return correlation_matrix(n, sum_x, sum_xy, self.numeric_columns)
+
+    def sample(self, expression, columns, n, seed=0):
+        """Muestra aleatoria uniforme de hasta `n` filas filtradas (una clave aleatoria por fila, se quedan las menores)."""
+        rng = np.random.default_rng(seed)
+        kept = None
+        for frame in self._frames(list(columns), expression):
+            frame["_key"] = rng.random(len(frame))
+            kept = frame if kept is None else pd.concat([kept, frame], ignore_index=True)
+            kept = kept.nsmallest(n, "_key")
+        if kept is None:
+            return pd.DataFrame(columns=list(columns))
+        return kept.drop(columns="_key").reset_index(drop=True)
+
+    def chunks(self, expression, columns):
+        """DataFrames lote a lote con las filas filtradas, para exportarlas sin reunir el resultado completo."""
+        return self._frames(list(columns), expression)
+
+    def head(self, expression, columns, n):
+        """Primeras `n` filas filtradas; el escaneo se detiene al completarlas."""
+        return self.dataset.head(n, columns=list(columns), filter=expression).to_pandas(date_as_object=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convierte el CSV de ventas en un dataset Parquet particionado.")
+    parser.add_argument("--csv", default=datasets.SALES_CSV, help="CSV de ventas de origen")
+    parser.add_argument("--output", default=SALES_DATASET_DIR or f"{datasets.DATA_DIR}/sales_dataset",
+                        help="Directorio del dataset Parquet")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="Filas del CSV por bloque")
+    args = parser.parse_args()
+    version = build_sales_dataset(args.csv, args.output, args.chunk_rows)
+    print(f"Dataset de ventas escrito en {args.output}/{version}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+import argparse
+import json
+import os
+import time
+from contextlib import contextmanager
+
+from utils import data_store
+
+# Bloqueo entre procesos: flock en POSIX, msvcrt.locking en Windows; sin ninguno de los dos no se bloquea
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+# Carpeta compartida entre los procesos del servidor (p. ej. /dev/shm/dashboards); vacía desactiva el almacén
+SHARED_STORE_DIR = os.environ.get("DASHBOARD_SHARED_STORE", "")
+# Versiones de cada dataset que se conservan en el almacén (la vigente y las anteriores que aún puedan estar mapeadas)
+KEEP_VERSIONS = int(os.environ.get("DASHBOARD_SHARED_STORE_KEEP", "2"))
+
+
+def enabled():
+    return bool(SHARED_STORE_DIR)
+
+
+def _pointer_path(name, store_dir):
+    return os.path.join(store_dir, f"{name}.current.json")
+
+
+def _table_file(name, version):
+    return f"{name}-{version}.arrow"
+
+
+@contextmanager
+def _publish_lock(name, store_dir):
+    # Un solo proceso publica cada dataset; los demás esperan y luego leen la versión publicada
+    os.makedirs(store_dir, exist_ok=True)
+    with open(os.path.join(store_dir, f"{name}.lock"), "w") as lock_file:
+        _lock(lock_file)
+        try:
+            yield
+        finally:
+            _unlock(lock_file)
+
+
+def _lock(lock_file):
+    if fcntl is not None:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+    elif msvcrt is not None:
+        # LK_LOCK reintenta durante unos 10 s y luego lanza OSError; se sigue esperando
+        while True:
+            try:
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+
+
+def _unlock(lock_file):
+    if fcntl is not None:
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+    elif msvcrt is not None:
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def current_version(name, store_dir=None):
+    """Versión publicada de `name`, o None si todavía no se publicó."""
+    store_dir = store_dir or SHARED_STORE_DIR
+    try:
+        with open(_pointer_path(name, store_dir), "r", encoding="utf-8") as file:
+            return json.load(file)["version"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def publish(name, frame, version, store_dir=None):
+    """Publica `frame` como la versión `version` de `name` y cambia el puntero de forma atómica.
+
+    La tabla se escribe como Arrow IPC sin comprimir en un archivo propio de la versión y
+    después se reemplaza el puntero `<name>.current.json`. Las versiones anteriores no se
+    borran enseguida: un proceso puede haber leído el puntero viejo y estar a punto de
+    abrir su archivo, o tenerlo mapeado (en Windows no se puede borrar). Se conservan las
+    últimas `KEEP_VERSIONS` y las demás se borran en `_remove_old_versions()`.
+    """
+    store_dir = store_dir or SHARED_STORE_DIR
+    os.makedirs(store_dir, exist_ok=True)
+    table_file = _table_file(name, version)
+    table_path = os.path.join(store_dir, table_file)
+    if not os.path.exists(table_path):
+        data_store.write_table(frame, table_path)
+    data_store.write_json(
+        _pointer_path(name, store_dir), {"version": version, "file": table_file, "published_at": time.time()}
+    )
+    _remove_old_versions(name, table_file, store_dir)
+    return version
+
+
+def _remove_old_versions(name, current_file, store_dir, keep=None):
+    """Borra los archivos de `name` salvo `current_file` y los más recientes hasta sumar `keep` versiones.
+
+    Un archivo que no se puede borrar todavía (PermissionError en Windows mientras otro
+    proceso lo tiene mapeado) se deja para la próxima publicación.
+    """
+    keep = KEEP_VERSIONS if keep is None else keep
+    paths = [
+        os.path.join(store_dir, file_name) for file_name in os.listdir(store_dir)
+        if file_name.startswith(f"{name}-") and file_name.endswith(".arrow") and file_name != current_file
+    ]
+    # La versión vigente cuenta como una; de las demás se conservan las escritas más recientemente
+    paths.sort(key=lambda path: os.stat(path).st_mtime_ns, reverse=True)
+    for path in paths[max(keep - 1, 0):]:
+        try:
+            os.remove(path)
+        except (PermissionError, FileNotFoundError):
+            # Aún mapeado en otro proceso (se reintenta más tarde) o ya borrado
+            continue
+
+
+def publish_if_missing(name, build_fn, version_fn, store_dir=None):
+    """Publica `build_fn()` si `name` aún no tiene versión (el primer proceso hace de cargador)."""
+    store_dir = store_dir or SHARED_STORE_DIR
+    with _publish_lock(name, store_dir):
+        version = current_version(name, store_dir)
+        if version is None:
+            frame = build_fn()
+            version = publish(name, frame, version_fn(), store_dir)
+    return version
+
+
+def attach(name, version, store_dir=None):
+    """DataFrame de la versión `version` de `name` sobre el archivo mapeado en memoria.
+
+    Solo las columnas numéricas sin nulos apuntan directamente a las páginas compartidas
+    del archivo (todas las instancias del servidor comparten esa memoria). El texto se
+    convierte en objetos de Python y las categorías en códigos y categorías propios, así
+    que esas columnas ocupan memoria en cada proceso. Lanza FileNotFoundError si la versión
+    ya se borró (quedó más de `KEEP_VERSIONS` versiones atrás).
+    """
+    store_dir = store_dir or SHARED_STORE_DIR
+    table = data_store.read_table(os.path.join(store_dir, _table_file(name, version)))
+    return table.to_pandas(split_blocks=True)
+
+
+def main():
+    from utils import datasets
+
+    loaders = {"unicorns": datasets.load_unicorns, "ports": datasets.load_ports, "sales": datasets.load_sales}
+    parser = argparse.ArgumentParser(description="Publica los datasets de los dashboards en el almacén compartido.")
+    parser.add_argument("--store", default=SHARED_STORE_DIR or "/dev/shm/dashboards", help="Carpeta del almacén")
+    parser.add_argument("--names", nargs="+", choices=sorted(loaders), default=sorted(loaders))
+    args = parser.parse_args()
+
+    for name in args.names:
+        frame = loaders[name]()
+        version = data_store.cache_version(name)
+        with _publish_lock(name, args.store):
+            if current_version(name, args.store) == version:
+                print(f"{name}: versión {version} ya publicada")
+                continue
+            publish(name, frame, version, args.store)
+        print(f"{name}: publicada la versión {version} en {args.store}")
+
+
+if __name__ == "__main__":
+    main()
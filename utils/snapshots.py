@@ -0,0 +1,257 @@
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from utils import data_store, datasets, filters, page_metrics, sales_dataset
+from utils.bitmap_index import BitmapIndex
+from utils.figure_cache import figure_key
+from utils.hierarchy_index import HierarchyIndex
+from utils.olap_cube import OlapCube
+
+# Carpeta con los snapshots precalculados que sirven las páginas; vacía desactiva su uso
+SNAPSHOT_DIR = os.environ.get("DASHBOARD_SNAPSHOT_DIR", "")
+
+# Combinaciones que procesa cada tarea del pool de procesos
+GRID_CHUNKSIZE = 8
+
+MANIFEST_FILE = "manifest.json"
+
+
+# --- Contexto de cada página: datos y estructuras, cargados una vez por proceso del pool ---
+
+def _unicorns_context():
+    data = datasets.load_unicorns()
+    return {
+        "version": datasets.dataset_version("unicorns"),
+        "data": data,
+        "filter_index": BitmapIndex(data, ["Continent", "Industry", "Year Founded"]),
+        "cube": OlapCube.build(data, ["Year Founded", "Continent", "Industry", "Country"], ["Funding", "Valuation"]),
+    }
+
+
+def _ports_context():
+    data = datasets.load_ports()
+    return {
+        "version": datasets.dataset_version("ports"),
+        "data": data,
+        "area_index": HierarchyIndex(data, ["Country", "Area Global", "Area Local", "Type"]),
+    }
+
+
+def _sales_context():
+    # Con el dataset Parquet configurado se consulta como en dashboard03; si no, desde los agregados diarios
+    if sales_dataset.SALES_DATASET_DIR:
+        parquet = sales_dataset.SalesDataset(sales_dataset.SALES_DATASET_DIR)
+        return {"version": parquet.version, "parquet": parquet, "options": parquet.options,
+                "date_bounds": [pd.Timestamp(date) for date in parquet.date_bounds]}
+    data = datasets.load_sales()
+    return {
+        "version": datasets.dataset_version("sales"),
+        "parquet": None,
+        "options": {column: data[column].unique().tolist() for column in ["Branch", "Gender", "Payment"]},
+        "date_bounds": [data['Date'].min(), data['Date'].max()],
+        "rollup": OlapCube.build(
+            data, ["Date", "Branch", "Gender", "Payment", "Product line"], ["Total", "cogs", "gross income"]
+        ),
+    }
+
+
+# --- Grillas de filtros: cada selección usa las mismas claves que el `filter_state` de su página ---
+
+def _unicorns_grid(context):
+    data = context["data"]
+    years = [int(data['Year Founded'].min()), int(data['Year Founded'].max())]
+    continents = sorted(filters.category_options(data['Continent']))
+    industries = sorted(filters.category_options(data['Industry']))
+    # Vista inicial (todo seleccionado), cada continente y cada continente × industria
+    grid = [{"years": years, "continents": continents, "industries": industries}]
+    for continent in continents:
+        grid.append({"years": years, "continents": [continent], "industries": industries})
+        grid.extend({"years": years, "continents": [continent], "industries": [industry]} for industry in industries)
+    return grid
+
+
+def _ports_grid(context):
+    data = context["data"]
+    types = sorted(filters.category_options(data['Type']))
+    base = {"types": types, "global_areas": [], "local_areas": []}
+    # Vista inicial (todos los países) y cada país con todos los tipos de puerto
+    return [dict(base, countries=[])] + [
+        dict(base, countries=[country]) for country in filters.category_options(data['Country'])
+    ]
+
+
+def _sales_grid(context):
+    options = {column: sorted(values) for column, values in context["options"].items()}
+    start, end = context["date_bounds"]
+    base = {"gender": options["Gender"], "payment": options["Payment"]}
+    # Vista inicial (todo el rango) y cada sucursal × mes, recortando el primer y último mes al rango de datos
+    grid = [dict(base, branch=options["Branch"], date_range=[str(start.date()), str(end.date())])]
+    for month in pd.period_range(start, end, freq="M"):
+        month_range = [str(max(month.start_time, start).date()), str(min(month.end_time, end).date())]
+        grid.extend(dict(base, branch=[branch], date_range=month_range) for branch in options["Branch"])
+    return grid
+
+
+# --- Cálculo de una selección (misma lógica de filtrado y agregación que cada página) ---
+
+def _render_unicorns(context, selection):
+    filter_index, cube = context["filter_index"], context["cube"]
+    bitmap_selection = page_metrics.unicorn_selection(
+        filter_index, *selection["years"], selection["continents"], selection["industries"]
+    )
+    filtered_data = context["data"][filter_index.select(bitmap_selection)]
+    filtered_cube = cube.slice(bitmap_selection)
+    return page_metrics.unicorn_kpis(filtered_data, filtered_cube), page_metrics.unicorn_charts(filtered_cube)
+
+
+def _render_ports(context, selection):
+    area_index = context["area_index"]
+    leaves = area_index.leaves_for(selection["countries"])
+    for level, key in [("Area Global", "global_areas"), ("Area Local", "local_areas")]:
+        if selection[key]:
+            leaves = area_index.restrict(leaves, level, selection[key])
+    leaves = area_index.restrict(leaves, 'Type', selection["types"])
+    filtered_data = context["data"].iloc[area_index.rows(leaves)]
+    return page_metrics.port_kpis(filtered_data), page_metrics.port_charts(filtered_data)
+
+
+def _render_sales(context, selection):
+    start, end = (pd.Timestamp(date) for date in selection["date_range"])
+    if context["parquet"] is not None:
+        expression = sales_dataset.filter_expression(
+            selection["branch"], selection["gender"], selection["payment"], start.date(), end.date()
+        )
+        summary = context["parquet"].summary(expression)
+    else:
+        rollup_selection = {"Branch": selection["branch"], "Gender": selection["gender"], "Payment": selection["payment"]}
+        summary = page_metrics.rollup_summary(context["rollup"].slice(rollup_selection, {"Date": (start, end)}))
+    kpis = {"rows": int(summary["rows"]), "total": float(summary["total"])}
+    return kpis, {"gender": summary["gender"], "payment": summary["payment"]}
+
+
+# Página → (contexto, grilla, cálculo de una selección)
+PAGES = {
+    "dashboard01": (_unicorns_context, _unicorns_grid, _render_unicorns),
+    "dashboard02": (_ports_context, _ports_grid, _render_ports),
+    "dashboard03": (_sales_context, _sales_grid, _render_sales),
+}
+
+
+def snapshot_key(page, data_version, selection):
+    return figure_key(page, data_version, selection)
+
+
+# Contexto del proceso del pool (se carga en el inicializador, una vez por proceso)
+_worker_context = {}
+
+
+def _init_worker(page):
+    _worker_context["page"] = page
+    _worker_context["context"] = PAGES[page][0]()
+
+
+def _render_selection(selection):
+    page, context = _worker_context["page"], _worker_context["context"]
+    kpis, charts = PAGES[page][2](context, selection)
+    return snapshot_key(page, context["version"], selection), selection, kpis, charts
+
+
+def write_snapshots(out_dir, page, data_version, results):
+    """Escribe un manifiesto JSON con las selecciones y KPIs y un Parquet por gráfico con todas las selecciones.
+
+    Se escribe en un directorio temporal que reemplaza al anterior al terminar, así las
+    páginas nunca leen un conjunto de snapshots a medias.
+    """
+    page_dir = os.path.join(out_dir, page)
+    tmp_dir = f"{page_dir}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    manifest = {"page": page, "data_version": data_version, "generated_at": time.time(), "snapshots": {}}
+    chart_frames = {}
+    for key, selection, kpis, charts in results:
+        manifest["snapshots"][key] = {"selection": selection, "kpis": kpis}
+        for chart_id, frame in charts.items():
+            chart_frames.setdefault(chart_id, []).append(frame.assign(snapshot=key))
+    for chart_id, frames in chart_frames.items():
+        table = pd.concat(frames, ignore_index=True)
+        # Las categorías se guardan como texto: cada selección observa sus propios valores
+        table = table.astype({column: "string" for column in table.select_dtypes("category").columns})
+        pq.write_table(pa.Table.from_pandas(table, preserve_index=False), os.path.join(tmp_dir, f"{chart_id}.parquet"))
+    data_store.write_json(os.path.join(tmp_dir, MANIFEST_FILE), manifest)
+    shutil.rmtree(page_dir, ignore_errors=True)
+    os.replace(tmp_dir, page_dir)
+    return len(manifest["snapshots"])
+
+
+def render_page(page, out_dir, workers=None):
+    """Calcula los snapshots de toda la grilla de `page` en un pool de procesos y los escribe en `out_dir`."""
+    context_fn, grid_fn, _ = PAGES[page]
+    context = context_fn()
+    grid = grid_fn(context)
+    # "spawn": cada proceso importa pandas/pyarrow desde cero en lugar de heredar sus hilos con fork
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker, initargs=(page,)
+    ) as executor:
+        results = list(executor.map(_render_selection, grid, chunksize=GRID_CHUNKSIZE))
+    return write_snapshots(out_dir, page, context["version"], results)
+
+
+class SnapshotSet:
+    """Snapshots de una página leídos del disco, indexados por clave de selección."""
+
+    def __init__(self, page_dir):
+        with open(os.path.join(page_dir, MANIFEST_FILE), "r", encoding="utf-8") as file:
+            manifest = json.load(file)
+        self.page = manifest["page"]
+        self.data_version = manifest["data_version"]
+        self.snapshots = manifest["snapshots"]
+        self.charts = {}
+        # Una selección sin filas no deja filas en el Parquet: se responde con el gráfico vacío del mismo esquema
+        self.empty_charts = {}
+        for file_name in os.listdir(page_dir):
+            if file_name.endswith(".parquet"):
+                chart_id = file_name[:-len(".parquet")]
+                table = pq.read_table(os.path.join(page_dir, file_name)).to_pandas()
+                self.charts[chart_id] = {
+                    key: frame.drop(columns="snapshot").reset_index(drop=True)
+                    for key, frame in table.groupby("snapshot", sort=False)
+                }
+                self.empty_charts[chart_id] = table.iloc[:0].drop(columns="snapshot").reset_index(drop=True)
+
+    def lookup(self, data_version, selection):
+        """KPIs y datos de gráficos de `selection`, o None si no se precalculó para esta versión de los datos."""
+        if data_version != self.data_version:
+            return None
+        key = snapshot_key(self.page, data_version, selection)
+        snapshot = self.snapshots.get(key)
+        if snapshot is None:
+            return None
+        charts = {chart_id: frames.get(key, self.empty_charts[chart_id]) for chart_id, frames in self.charts.items()}
+        return {"kpis": snapshot["kpis"], "charts": charts}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precalcula KPIs y datos de gráficos de los dashboards para grillas de filtros.")
+    parser.add_argument("--output", default=SNAPSHOT_DIR or f"{datasets.DATA_DIR}/snapshots", help="Carpeta de los snapshots")
+    parser.add_argument("--pages", nargs="+", choices=sorted(PAGES), default=sorted(PAGES))
+    parser.add_argument("--workers", type=int, default=None, help="Procesos del pool (por defecto, uno por CPU)")
+    args = parser.parse_args()
+
+    for page in args.pages:
+        start = time.perf_counter()
+        count = render_page(page, args.output, args.workers)
+        print(f"{page}: {count} snapshots en {time.perf_counter() - start:.1f}s ({args.output}/{page})")
+
+
+if __name__ == "__main__":
+    main()
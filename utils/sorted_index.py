@@ -0,0 +1,27 @@
+import numpy as np
+
+
+class SortedIndex:
+    """Permutación que ordena una columna, para resolver filtros de rango con búsqueda binaria.
+
+    El orden de las filas del dataset no cambia: se guardan las posiciones ordenadas por
+    valor y un rango `[low, high]` se traduce en dos `searchsorted` y un corte contiguo
+    de esa permutación, en lugar de comparar la columna completa dos veces. El coste de
+    una consulta depende del número de filas del rango, no del tamaño de la columna.
+    """
+
+    def __init__(self, series):
+        values = series.to_numpy()
+        # Orden estable: a igual valor se conserva el orden original (NaT queda al final)
+        self.order = np.argsort(values, kind="stable")
+        self.sorted_values = values[self.order]
+
+    def positions(self, low, high):
+        """Posiciones de las filas con `low <= valor <= high`, en orden de valor."""
+        start = np.searchsorted(self.sorted_values, np.asarray(low, dtype=self.sorted_values.dtype), side="left")
+        stop = np.searchsorted(self.sorted_values, np.asarray(high, dtype=self.sorted_values.dtype), side="right")
+        return self.order[start:stop]
+
+    def rows(self, low, high):
+        """Posiciones de las filas dentro del rango en el orden original, para `take`/`iloc`."""
+        return np.sort(self.positions(low, high))
@@ -0,0 +1,103 @@
+import numpy as np
+from scipy.spatial import cKDTree
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def unit_vectors(latitude, longitude):
+    """Coordenadas (x, y, z) sobre la esfera unitaria de puntos en grados."""
+    lat = np.radians(np.asarray(latitude, dtype=float))
+    lon = np.radians(np.asarray(longitude, dtype=float))
+    return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+
+def chord_for_km(distance_km):
+    # Distancia en línea recta (cuerda) entre dos puntos de la esfera unitaria separados `distance_km`
+    angle = np.minimum(np.asarray(distance_km, dtype=float) / EARTH_RADIUS_KM, np.pi)
+    return 2 * np.sin(angle / 2)
+
+
+def km_for_chord(chord):
+    return 2 * np.arcsin(np.clip(np.asarray(chord, dtype=float) / 2, 0, 1)) * EARTH_RADIUS_KM
+
+
+class SpatialIndex:
+    """KD-tree sobre las coordenadas de las filas proyectadas a la esfera unitaria.
+
+    En la esfera unitaria la distancia del círculo máximo crece con la cuerda, así que
+    "a menos de N km" es una bola euclídea de radio `chord_for_km(N)` y el árbol resuelve
+    radios, recuadros y vecinos más cercanos sin calcular haversine sobre todo el dataset.
+    Las consultas devuelven máscaras booleanas en el orden de las filas, para combinarlas
+    con los demás filtros; las filas sin coordenadas nunca coinciden.
+    """
+
+    def __init__(self, data):
+        latitude = data["Latitude"].to_numpy(dtype=float)
+        longitude = data["Longitude"].to_numpy(dtype=float)
+        self.n_rows = len(data)
+        self.rows = np.flatnonzero(~(np.isnan(latitude) | np.isnan(longitude)))
+        self.latitude = latitude[self.rows]
+        self.longitude = longitude[self.rows]
+        self.tree = cKDTree(unit_vectors(self.latitude, self.longitude))
+
+    def _mask(self, positions):
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[self.rows[positions]] = True
+        return mask
+
+    def within_radius(self, latitude, longitude, radius_km):
+        """Filas a menos de `radius_km` km del punto."""
+        center = unit_vectors([latitude], [longitude])[0]
+        positions = self.tree.query_ball_point(center, chord_for_km(radius_km), return_sorted=False)
+        return self._mask(np.asarray(positions, dtype=np.int64))
+
+    def within_bbox(self, lat_min, lat_max, lon_min, lon_max):
+        """Filas dentro del recuadro; si `lon_min > lon_max` el recuadro cruza el antimeridiano.
+
+        El árbol devuelve los candidatos dentro de la bola que contiene al recuadro y solo
+        sobre ellos se comprueban las coordenadas exactas.
+        """
+        lat_min, lat_max = sorted((lat_min, lat_max))
+        lon_span = lon_max - lon_min if lon_max >= lon_min else lon_max - lon_min + 360
+        center = unit_vectors([(lat_min + lat_max) / 2], [lon_min + lon_span / 2])[0]
+        if lon_span < 180:
+            # Con menos de media vuelta de ancho, el punto del recuadro más lejano al centro es una esquina
+            corners = unit_vectors([lat_min, lat_min, lat_max, lat_max], [lon_min, lon_max, lon_min, lon_max])
+            radius = np.linalg.norm(corners - center, axis=1).max() * (1 + 1e-9)
+        else:
+            radius = 2.0
+        positions = np.asarray(self.tree.query_ball_point(center, radius, return_sorted=False), dtype=np.int64)
+
+        latitude = self.latitude[positions]
+        offset = (self.longitude[positions] - lon_min) % 360
+        inside = (latitude >= lat_min) & (latitude <= lat_max) & (offset <= lon_span)
+        return self._mask(positions[inside])
+
+    def nearest(self, latitude, longitude, k, mask=None):
+        """Posiciones de fila y distancias (km) de las `k` filas más cercanas al punto que cumplen `mask`.
+
+        Si hay una máscara, se piden al árbol cada vez más vecinos hasta reunir `k` que la cumplan.
+        """
+        center = unit_vectors([latitude], [longitude])[0]
+        allowed = np.ones(len(self.rows), dtype=bool) if mask is None else mask[self.rows]
+        n_allowed = int(allowed.sum())
+        k = min(k, n_allowed)
+        if k == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        n_query = k
+        while True:
+            n_query = min(n_query, len(self.rows))
+            chords, positions = self.tree.query(center, k=n_query)
+            chords, positions = np.atleast_1d(chords), np.atleast_1d(positions)
+            keep = allowed[positions]
+            if keep.sum() >= k or n_query == len(self.rows):
+                chords, positions = chords[keep][:k], positions[keep][:k]
+                return self.rows[positions], km_for_chord(chords)
+            n_query *= 4
+
+    def nearest_mask(self, latitude, longitude, k, mask=None):
+        """Máscara de las `k` filas más cercanas al punto que cumplen `mask`."""
+        rows, _ = self.nearest(latitude, longitude, k, mask)
+        result = np.zeros(self.n_rows, dtype=bool)
+        result[rows] = True
+        return result
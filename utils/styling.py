@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+
+def rank_styles(data, column, top_values, palette):
+    """Matriz de estilos para `Styler.apply(..., axis=None)` calculada en una sola pasada.
+
+    Cada fila recibe el estilo de `palette` en la posición que ocupa su valor de
+    `column` dentro de `top_values` (el primero el más destacado) y las demás quedan sin estilo.
+    """
+    keys = data[column]
+    conditions = [(keys == value).to_numpy(dtype=bool, na_value=False) for value in top_values]
+    if conditions:
+        row_styles = np.select(conditions, list(palette[:len(conditions)]), default="")
+    else:
+        row_styles = np.full(len(data), "")
+    # Repetir el estilo de cada fila en todas sus columnas
+    matrix = np.repeat(row_styles.astype(object)[:, None], data.shape[1], axis=1)
+    return pd.DataFrame(matrix, index=data.index, columns=data.columns)
+
+
+def highlight_values(data, targets, css="background-color: yellow;"):
+    """Matriz de estilos que marca las celdas iguales al valor objetivo de su columna.
+
+    Permite resaltar, por ejemplo, los máximos del conjunto filtrado completo
+    aunque solo se muestre una ventana de la tabla.
+    """
+    styles = pd.DataFrame("", index=data.index, columns=data.columns)
+    for column, value in targets.items():
+        matches = (data[column] == value).to_numpy(dtype=bool, na_value=False)
+        styles[column] = np.where(matches, css, "")
+    return styles
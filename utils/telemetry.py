@@ -0,0 +1,110 @@
+import os
+import time
+from contextlib import contextmanager
+
+import streamlit as st
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, start_http_server
+
+# Puerto del endpoint /metrics para Prometheus (0 lo desactiva)
+METRICS_PORT = int(os.environ.get("DASHBOARD_METRICS_PORT", 9464))
+
+# De 1 ms a 30 s: cubre desde un acierto de caché hasta una carga en frío del CSV
+SECTION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+class Metrics:
+    """Métricas de los dashboards, registradas en un `CollectorRegistry` propio.
+
+    Con un registro propio, volver a importar el módulo (por ejemplo cuando Streamlit
+    recarga el código) no choca con series ya registradas en el registro global de
+    prometheus_client. Se crea una sola instancia por proceso con `get_metrics()`.
+    """
+
+    def __init__(self, registry=None):
+        self.registry = CollectorRegistry() if registry is None else registry
+        self.section_seconds = Histogram(
+            "dashboard_section_seconds", "Duración de cada sección de los dashboards",
+            ["page", "section"], buckets=SECTION_BUCKETS, registry=self.registry
+        )
+        self.filter_rows_in = Counter(
+            "dashboard_filter_rows_in", "Filas que entran a cada etapa de filtrado", ["page", "stage"],
+            registry=self.registry
+        )
+        self.filter_rows_out = Counter(
+            "dashboard_filter_rows_out", "Filas que salen de cada etapa de filtrado", ["page", "stage"],
+            registry=self.registry
+        )
+        # Señal de disponibilidad: 1 cuando el precalentamiento de cachés terminó
+        self.warmup_ready = Gauge(
+            "dashboard_warmup_ready", "1 si las cachés de datos e índices ya están precalentadas",
+            registry=self.registry
+        )
+        # Uso de las cachés con presupuesto de memoria ("figures", "results"), para dimensionar los pods
+        self.cache_hits = Counter("dashboard_cache_hits", "Aciertos de cada caché", ["cache"], registry=self.registry)
+        self.cache_misses = Counter("dashboard_cache_misses", "Fallos de cada caché", ["cache"], registry=self.registry)
+        self.cache_evictions = Counter(
+            "dashboard_cache_evictions", "Entradas expulsadas por falta de presupuesto", ["cache"],
+            registry=self.registry
+        )
+        self.cache_rejections = Counter(
+            "dashboard_cache_rejections", "Entradas no guardadas por ser mayores que el presupuesto", ["cache"],
+            registry=self.registry
+        )
+        self.cache_resident_bytes = Gauge(
+            "dashboard_cache_resident_bytes", "Bytes ocupados por las entradas de cada caché", ["cache"],
+            registry=self.registry
+        )
+        self.cache_entries = Gauge(
+            "dashboard_cache_entries", "Entradas guardadas en cada caché", ["cache"], registry=self.registry
+        )
+        self.cache_budget_bytes = Gauge(
+            "dashboard_cache_budget_bytes", "Presupuesto en bytes de cada caché", ["cache"], registry=self.registry
+        )
+
+
+# Las métricas se crean en el primer uso y se conservan entre ejecuciones y recargas del módulo
+@st.cache_resource
+def get_metrics():
+    return Metrics()
+
+
+class PageTracer:
+    """Spans de tiempo y conteos de filas de una página, exportados como métricas de Prometheus.
+
+    Las secciones siguen la convención `load_data`, `filter`, `aggregate:<nombre>`,
+    `figure:<gráfico>`, `render:<gráfico>` y `table`, de modo que el número de
+    series se mantiene acotado.
+    """
+
+    def __init__(self, page, metrics=None):
+        self.page = page
+        self.metrics = get_metrics() if metrics is None else metrics
+
+    @contextmanager
+    def span(self, section):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.metrics.section_seconds.labels(self.page, section).observe(time.perf_counter() - start)
+
+    def rows(self, stage, rows_in, rows_out):
+        self.metrics.filter_rows_in.labels(self.page, stage).inc(rows_in)
+        self.metrics.filter_rows_out.labels(self.page, stage).inc(rows_out)
+
+    def plotly_chart(self, chart_id, figure, **kwargs):
+        """`st.plotly_chart` medido como la sección `render:<chart_id>`."""
+        with self.span(f"render:{chart_id}"):
+            return st.plotly_chart(figure, **kwargs)
+
+
+# El servidor HTTP se levanta una sola vez por proceso, no en cada ejecución del script
+@st.cache_resource
+def start_metrics_server(port=METRICS_PORT):
+    """Expone /metrics en `port` y devuelve el puerto, o None si está desactivado u ocupado."""
+    if not port:
+        return None
+    try:
+        start_http_server(port, registry=get_metrics().registry)
+    except OSError:
+        return None
+    return port
@@ -0,0 +1,97 @@
+import importlib
+import os
+import threading
+import time
+
+import streamlit as st
+
+from utils import resources, telemetry
+
+# Precalentar las cachés al arrancar el servidor (0 lo desactiva)
+PREWARM_ENABLED = os.environ.get("DASHBOARD_PREWARM", "1") != "0"
+
+# Módulos pesados que solo se necesitan al construir gráficos (plotly.express y statsmodels para trendline="ols")
+HEAVY_MODULES = ["plotly.express", "statsmodels.api"]
+
+
+def _import_heavy_modules():
+    for name in HEAVY_MODULES:
+        importlib.import_module(name)
+
+
+def _warm_sales():
+    # Con el dataset Parquet configurado, la página de ventas no carga el CSV en memoria
+    if resources.load_sales_dataset() is None:
+        resources.load_sales()
+        resources.load_sales_date_index()
+        resources.load_sales_daily_rollup()
+        resources.load_sales_correlation_stats()
+
+
+# Pasos del precalentamiento, en orden: primero los datos y estructuras de cada página, luego las importaciones
+WARMUP_STEPS = [
+    ("unicorns", lambda: (
+        resources.load_unicorns(), resources.load_unicorn_filter_index(),
+        resources.load_unicorn_cube(), resources.load_unicorn_geo_clusters(),
+        resources.load_unicorn_investor_index(), resources.load_unicorn_spatial_index(),
+    )),
+    ("ports", lambda: (
+        resources.load_ports(), resources.load_port_area_index(), resources.load_port_search_index(),
+    )),
+    ("sales", _warm_sales),
+    ("imports", _import_heavy_modules),
+]
+
+
+class Warmup:
+    """Estado del precalentamiento en segundo plano: "pending", "running", "ready" o "failed"."""
+
+    def __init__(self, steps=WARMUP_STEPS):
+        self.steps = steps
+        self.state = "pending"
+        self.completed_steps = []
+        self.error = None
+        self.started_at = None
+        self.finished_at = None
+        self._done = threading.Event()
+
+    def run(self):
+        self.state = "running"
+        self.started_at = time.time()
+        tracer = telemetry.PageTracer("warmup")
+        try:
+            for name, step in self.steps:
+                with tracer.span(name):
+                    step()
+                self.completed_steps.append(name)
+            self.state = "ready"
+        except Exception as error:
+            # Un fallo no impide usar la app: cada página volverá a intentar la carga al visitarse
+            self.state = "failed"
+            self.error = repr(error)
+        finally:
+            self.finished_at = time.time()
+            telemetry.get_metrics().warmup_ready.set(1 if self.state == "ready" else 0)
+            self._done.set()
+
+    def start(self):
+        threading.Thread(target=self.run, name="dashboard-warmup", daemon=True).start()
+        return self
+
+    def is_ready(self):
+        return self.state == "ready"
+
+    def wait(self, timeout=None):
+        """Espera a que termine el precalentamiento; devuelve True si terminó a tiempo."""
+        return self._done.wait(timeout)
+
+
+# Un solo precalentamiento por proceso. Servido con `streamlit run app.py` se lanza al iniciar el
+# servidor (hook `lifespan`); con `streamlit run main.py` no hay código que corra antes de la primera
+# sesión, así que se lanza en la primera ejecución de main.py y esa visita encuentra las cachés en frío
+@st.cache_resource
+def start_warmup():
+    warmup = Warmup()
+    if PREWARM_ENABLED:
+        warmup.start()
+    return warmup